@@ -0,0 +1,123 @@
+"""
+Minimum-cost soil amendments that bring crops up to a target suitability
+
+Climate is fixed; N, P and K can only be raised (fertilizer) and pH raised
+with lime or lowered with sulfur. A feature's rule penalty only changes at
+the crop's breakpoints (see rule_compiler), so the cheapest way into any
+penalty interval is to move exactly to its edge: each feature has at most
+a handful of useful values per crop. Every combination of them is scored
+in one compiled-rules batch per crop and the cheapest one reaching the
+target wins.
+"""
+
+import math
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from rule_compiler import CompiledRules, crop_boundaries
+
+ADJUSTABLE = ("N", "P", "K", "ph")
+# Rough per-hectare rupee cost of one unit of change: soil-test ppm of
+# nutrient (about 2.24 kg/ha in the top 15 cm) via urea, single super
+# phosphate and muriate of potash, and one pH unit via agricultural lime or
+# elemental sulfur. Pass local prices to override.
+DEFAULT_COSTS = {"N": 29.0, "P": 320.0, "K": 152.0, "lime": 10000.0, "sulfur": 20000.0}
+GOOD_SCORE = 80.0  # analyze_desired_crop's "Good" verdict
+
+
+# Edges are rounded outwards to 0.01 so the reported values stay inside the
+# interval (thresholds like 60 * 0.4 carry float noise: 24.000000000000004)
+def _round_up(value: float) -> float:
+    return math.ceil(value * 100) / 100
+
+
+def _round_down(value: float) -> float:
+    return math.floor(value * 100) / 100
+
+
+def _candidate_values(feature: str, current: float, requirements: Mapping,
+                      bounds: Tuple[float, float]) -> np.ndarray:
+    """The current value plus each breakpoint edge reachable from it within ``bounds``"""
+    points = crop_boundaries(requirements, feature)
+    values = [current] + [_round_up(point) for point in points if point > current]
+    if feature == "ph":
+        # Lowering: the largest value still below each breakpoint
+        values += [_round_down(float(np.nextafter(point, -np.inf))) for point in points if point <= current]
+    low, high = bounds
+    return np.unique([value for value in values if low <= value <= high or value == current])
+
+
+def _describe(feature: str, current: float, target: float) -> str:
+    if feature == "ph":
+        agent = "lime" if target > current else "sulfur"
+        verb = "Raise" if target > current else "Lower"
+        return f"{verb} pH by {abs(target - current):.2f} with {agent} (to {target:.2f})"
+    return f"Add {target - current:.2f} ppm {feature} (to {target:.2f})"
+
+
+def optimize_amendments(
+    user_input: Mapping[str, float],
+    compiled: CompiledRules,
+    crop_table: Mapping[str, Mapping],
+    crops: Optional[Sequence[str]] = None,
+    target_score: float = GOOD_SCORE,
+    costs: Optional[Mapping[str, float]] = None,
+    bounds: Optional[Mapping[str, Tuple[float, float]]] = None,
+) -> List[Dict[str, Any]]:
+    """Cheapest amendment per crop reaching ``target_score`` (0-100) under the rule engine
+
+    Results are sorted with reachable crops first, cheapest first. Crops
+    that cannot reach the target (climate penalties alone can rule that
+    out) report the best score amendments can buy, at the lowest cost.
+    """
+    costs = {**DEFAULT_COSTS, **(costs or {})}
+    bounds = bounds or {}
+    crops = list(compiled.crops) if crops is None else list(crops)
+    current = {name: float(user_input[name]) for name in compiled.breakpoints}
+    current_scores = compiled.score({name: np.array([value]) for name, value in current.items()}, crops)[0]
+
+    results = []
+    for crop_name, current_score in zip(crops, current_scores):
+        requirements = crop_table[crop_name]
+        axes = [
+            _candidate_values(feature, current[feature], requirements, bounds.get(feature, (0.0, np.inf)))
+            for feature in ADJUSTABLE
+        ]
+        grid = [axis.ravel() for axis in np.meshgrid(*axes, indexing="ij")]
+        n = grid[0].size
+        features = {name: np.full(n, value) for name, value in current.items()}
+        features.update(zip(ADJUSTABLE, grid))
+        scores = compiled.score(features, [crop_name])[:, 0]
+
+        delta_ph = grid[3] - current["ph"]
+        cost = (
+            costs["N"] * (grid[0] - current["N"])
+            + costs["P"] * (grid[1] - current["P"])
+            + costs["K"] * (grid[2] - current["K"])
+            + np.where(delta_ph > 0, costs["lime"], costs["sulfur"]) * np.abs(delta_ph)
+        )
+        reachable = scores >= target_score
+        if reachable.any():
+            # Cheapest, then highest score
+            pick = np.lexsort((-scores, np.where(reachable, cost, np.inf)))[0]
+        else:
+            pick = np.lexsort((cost, -scores))[0]
+
+        targets = {feature: float(values[pick]) for feature, values in zip(ADJUSTABLE, grid)}
+        changes = [
+            _describe(feature, current[feature], targets[feature])
+            for feature in ADJUSTABLE if targets[feature] != current[feature]
+        ]
+        results.append({
+            "crop": crop_name,
+            "current_score": float(current_score),
+            "score_after": float(scores[pick]),
+            "reaches_target": bool(reachable[pick]),
+            "cost": round(float(cost[pick]), 2),
+            "amended_values": targets,
+            "changes": changes,
+            "candidates_evaluated": int(n),
+        })
+
+    results.sort(key=lambda r: (not r["reaches_target"], r["cost"] if r["reaches_target"] else -r["score_after"], r["cost"]))
+    return results
@@ -1,59 +1,205 @@
 import os
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict, Optional, Tuple
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Query, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from jose import jwt
+from starlette.concurrency import run_in_threadpool
+from jose import JWTError, jwt
 
 try:
     from .db import get_db
     from .models import User
     from .schemas import UserCreate, UserOut, LoginRequest, Token
+    from .passwords import hash_password_async, verify_and_update_async
 except ImportError:
     # Fallback for direct execution
     from db import get_db
     from models import User
     from schemas import UserCreate, UserOut, LoginRequest, Token
+    from passwords import hash_password_async, verify_and_update_async
 
 router = APIRouter(prefix="/auth", tags=["Auth"]) 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 JWT_SECRET = os.getenv("JWT_SECRET", "dev")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRES_MINUTES = int(os.getenv("JWT_EXPIRES_MINUTES", "60"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
 
-def hash_password(password: str) -> str:
-  return pwd_context.hash(password)
-
-def verify_password(plain: str, hashed: str) -> bool:
-  return pwd_context.verify(plain, hashed)
+bearer_scheme = HTTPBearer(auto_error=False)
 
 def create_access_token(sub: str) -> str:
   expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRES_MINUTES)
   payload = {"sub": sub, "exp": expire}
   return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+@dataclass(frozen=True)
+class Principal:
+  """Authenticated user snapshot, detached from any DB session"""
+  id: int
+  username: str
+  email: str
+  full_name: Optional[str]
+  is_admin: bool
+
+  @classmethod
+  def from_user(cls, user: User) -> "Principal":
+    return cls(
+      id=user.id,
+      username=user.username,
+      email=user.email,
+      full_name=user.full_name,
+      is_admin=bool(user.is_admin),
+    )
+
+class PrincipalCache:
+  """Small TTL cache of active principals keyed by user id"""
+
+  def __init__(self, ttl_seconds: float, max_entries: int):
+    self.ttl_seconds = ttl_seconds
+    self.max_entries = max_entries
+    self._entries: Dict[int, Tuple[float, Principal]] = {}
+    self._lock = threading.Lock()
+
+  def get(self, user_id: int) -> Optional[Principal]:
+    with self._lock:
+      entry = self._entries.get(user_id)
+      if entry is None:
+        return None
+      expires_at, principal = entry
+      if expires_at < time.monotonic():
+        del self._entries[user_id]
+        return None
+      return principal
+
+  def put(self, principal: Principal) -> None:
+    with self._lock:
+      if len(self._entries) >= self.max_entries and principal.id not in self._entries:
+        # Dicts keep insertion order, so this evicts the oldest entry
+        self._entries.pop(next(iter(self._entries)))
+      self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+
+  def invalidate(self, user_id: int) -> None:
+    with self._lock:
+      self._entries.pop(user_id, None)
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_ENTRIES)
+
+def decode_access_token(token: str) -> int:
+  """Verify a token from create_access_token and return its user id"""
+  try:
+    payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    return int(payload["sub"])
+  except (JWTError, KeyError, TypeError, ValueError):
+    raise HTTPException(
+      status_code=status.HTTP_401_UNAUTHORIZED,
+      detail="Invalid or expired token",
+      headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _resolve_principal(token: Optional[str], db: Session) -> Principal:
+  if not token:
+    raise HTTPException(
+      status_code=status.HTTP_401_UNAUTHORIZED,
+      detail="Not authenticated",
+      headers={"WWW-Authenticate": "Bearer"},
+    )
+  user_id = decode_access_token(token)
+  principal = principal_cache.get(user_id)
+  if principal is not None:
+    return principal
+  user = db.query(User).filter(User.id == user_id).first()
+  if not user or not user.is_active:
+    raise HTTPException(
+      status_code=status.HTTP_401_UNAUTHORIZED,
+      detail="User not found or inactive",
+      headers={"WWW-Authenticate": "Bearer"},
+    )
+  principal = Principal.from_user(user)
+  principal_cache.put(principal)
+  return principal
+
+def get_current_principal(
+  credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+  db: Session = Depends(get_db),
+) -> Principal:
+  """Resolve the bearer token to an active user, hitting the DB only on cache misses"""
+  return _resolve_principal(credentials.credentials if credentials else None, db)
+
+def get_stream_principal(
+  credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+  access_token: Optional[str] = Query(None, description="Token for clients that can't set headers (EventSource)"),
+  access_token_cookie: Optional[str] = Cookie(None, alias="access_token"),
+  db: Session = Depends(get_db),
+) -> Principal:
+  """get_current_principal for streaming routes: the token may also come from a query param or cookie"""
+  token = credentials.credentials if credentials else access_token or access_token_cookie
+  try:
+    return _resolve_principal(token, db)
+  finally:
+    # The session lives as long as the stream; don't keep its connection checked out
+    db.rollback()
+
+def get_admin_principal(principal: Principal = Depends(get_current_principal)) -> Principal:
+  if not principal.is_admin:
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+  return principal
+
+def get_stream_admin_principal(principal: Principal = Depends(get_stream_principal)) -> Principal:
+  return get_admin_principal(principal)
+
+def _find_user(db: Session, username: str):
+  # End the transaction so no pooled connection is held while bcrypt runs
+  user = db.query(User).filter(User.username == username).first()
+  if user is not None:
+    db.expunge(user)
+  db.rollback()
+  return user
+
+def _update_password_hash(db: Session, user_id: int, new_hash: str) -> None:
+  db.query(User).filter(User.id == user_id).update({User.hashed_password: new_hash})
+  db.commit()
+
+def _save_user(db: Session, user: User) -> User:
+  db.add(user)
+  db.commit()
+  db.refresh(user)
+  return user
+
+# register and login are async so bcrypt waits on the password pool rather
+# than holding a threadpool thread; the DB calls still run in the threadpool
 @router.post("/register")
-def register(data: UserCreate, db: Session = Depends(get_db)):
-  existing = db.query(User).filter(User.username == data.username).first()
+async def register(data: UserCreate, db: Session = Depends(get_db)):
+  existing = await run_in_threadpool(_find_user, db, data.username)
   if existing:
     raise HTTPException(status_code=400, detail="Username already taken")
   user = User(
     username=data.username,
     email=data.email,
-    hashed_password=hash_password(data.password)
+    hashed_password=await hash_password_async(data.password)
   )
-  db.add(user)
-  db.commit()
-  db.refresh(user)
+  user = await run_in_threadpool(_save_user, db, user)
   return {"message": "User registered successfully", "username": user.username}
 
 @router.post("/login")
-def login(data: LoginRequest, db: Session = Depends(get_db)):
-  user = db.query(User).filter(User.username == data.username).first()
-  if not user or not verify_password(data.password, user.hashed_password):
+async def login(data: LoginRequest, db: Session = Depends(get_db)):
+  user = await run_in_threadpool(_find_user, db, data.username)
+  if not user:
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+  valid, new_hash = await verify_and_update_async(data.password, user.hashed_password)
+  if not valid:
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+  if new_hash:
+    # Work factor changed since this hash was created; upgrade it in place
+    await run_in_threadpool(_update_password_hash, db, user.id, new_hash)
   token = create_access_token(sub=str(user.id))
   return {
     "access_token": token,
@@ -64,4 +210,4 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
       "email": user.email,
       "full_name": user.full_name
     }
-  } 
\ No newline at end of file
+  }
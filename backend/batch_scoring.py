@@ -0,0 +1,154 @@
+"""
+Chunked bulk scoring of lab-result spreadsheets
+
+Reads a CSV in fixed-size chunks, runs soil classification and crop
+recommendation on each chunk with KeralaAI.score_batch, and appends the
+results to a CSV or Parquet file as it goes, so memory is bounded by the
+chunk size rather than the file size. Only the summary counts are kept.
+
+    python -m backend.batch_scoring fields.csv scored.parquet
+"""
+
+import argparse
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, Optional, Union
+
+import pandas as pd
+
+FEATURE_COLUMNS = ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"]
+RESULT_COLUMNS = ["soil_type", "soil_confidence", "recommended_crop", "crop_confidence", "alternative_crops", "suitable"]
+DEFAULT_CHUNK_ROWS = 20000
+
+
+@dataclass
+class BatchSummary:
+    rows: int = 0
+    unsuitable: int = 0
+    crop_counts: Counter = field(default_factory=Counter)
+    soil_counts: Counter = field(default_factory=Counter)
+
+    @property
+    def unsuitable_share(self) -> float:
+        return self.unsuitable / self.rows if self.rows else 0.0
+
+    def update(self, scored: pd.DataFrame) -> None:
+        self.rows += len(scored)
+        self.unsuitable += int((~scored["suitable"]).sum())
+        self.crop_counts.update(scored.loc[scored["suitable"], "recommended_crop"].value_counts().to_dict())
+        self.soil_counts.update(scored["soil_type"].value_counts().to_dict())
+
+
+def _column_mapping(columns) -> Dict[str, str]:
+    """Map the file's headers onto FEATURE_COLUMNS, ignoring case (pH, Temperature, ...)"""
+    lookup = {str(column).strip().lower(): column for column in columns}
+    missing = [name for name in FEATURE_COLUMNS if name.lower() not in lookup]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+    return {lookup[name.lower()]: name for name in FEATURE_COLUMNS}
+
+
+def score_frame(engine, frame: pd.DataFrame) -> pd.DataFrame:
+    """The input rows with the score_batch result columns appended"""
+    renamed = frame.rename(columns=_column_mapping(frame.columns))
+    features = {name: pd.to_numeric(renamed[name], errors="raise").to_numpy(dtype=float) for name in FEATURE_COLUMNS}
+    results = engine.score_batch(features)
+    scored = frame.copy()
+    for name in RESULT_COLUMNS:
+        scored[name] = results[name]
+    return scored
+
+
+class _ResultWriter:
+    def __init__(self, path: str, fmt: str) -> None:
+        if fmt not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported output format {fmt!r}")
+        self.path = path
+        self.fmt = fmt
+        self._parquet = None
+        self._wrote_header = False
+
+    def write(self, scored: pd.DataFrame) -> None:
+        if self.fmt == "csv":
+            scored.to_csv(self.path, mode="a" if self._wrote_header else "w", header=not self._wrote_header, index=False)
+            self._wrote_header = True
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(scored, preserve_index=False)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self._parquet.schema)
+        self._parquet.write_table(table)
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def score_csv(
+    engine,
+    source: Union[str, BinaryIO],
+    output_path: str,
+    fmt: str = "csv",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    on_progress: Optional[Callable[[float, BatchSummary], None]] = None,
+) -> BatchSummary:
+    """Score ``source`` chunk by chunk into ``output_path``; returns the summary
+
+    ``source`` is a path or a seekable binary file (e.g. a Streamlit upload).
+    ``on_progress`` is called after each chunk with the fraction of the
+    input bytes consumed and the running summary.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as fh:
+            return score_csv(engine, fh, output_path, fmt, chunk_rows, on_progress)
+
+    source.seek(0, 2)
+    total_bytes = source.tell()
+    source.seek(0)
+
+    summary = BatchSummary()
+    writer = _ResultWriter(output_path, fmt)
+    try:
+        with pd.read_csv(source, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                scored = score_frame(engine, chunk)
+                writer.write(scored)
+                summary.update(scored)
+                if on_progress is not None:
+                    # The parser reads ahead in blocks, so this is approximate
+                    on_progress(min(source.tell() / total_bytes, 1.0) if total_bytes else 1.0, summary)
+    finally:
+        writer.close()
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score a CSV of soil readings in chunks")
+    parser.add_argument("input", help="CSV with N, P, K, temperature, humidity, ph, rainfall columns")
+    parser.add_argument("output", help="Destination .csv or .parquet file")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    try:
+        from .kerala_ai import KeralaAI
+    except ImportError:
+        from kerala_ai import KeralaAI
+
+    fmt = "parquet" if args.output.endswith(".parquet") else "csv"
+    summary = score_csv(
+        KeralaAI(), args.input, args.output, fmt=fmt, chunk_rows=args.chunk_rows,
+        on_progress=lambda fraction, s: print(f"\r{fraction:6.1%}  {s.rows:,} rows", end="", flush=True),
+    )
+    print(f"\nScored {summary.rows:,} rows ({summary.unsuitable_share:.1%} unsuitable) -> {args.output}")
+    for crop, count in summary.crop_counts.most_common(10):
+        print(f"  {crop:<15} {count:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,9 @@ Comprehensive Crop Requirements Database
 Real agricultural data for 22 crops based on scientific research
 """
 
+# Rule or hybrid score above which a crop counts as suitable
+SUITABLE_SCORE = 50.0
+
 CROP_REQUIREMENTS = {
     "apple": {
         "N": (60, 120),      # Moderate N requirement
@@ -0,0 +1,275 @@
+"""
+Columnar crop requirement store for cultivar-level data
+
+Requirements are loaded from a CSV or Parquet file (one row per variety)
+into numpy columns. Category and region have inverted indexes, and the
+three bounds that can rule a variety out on climate or pH alone
+(temperature, pH, rainfall) have interval indexes. A query first keeps
+only the varieties whose fatal-flaw intervals contain the input, then
+scores the survivors in one vectorized pass with the same rules as
+calculate_suitability_score.
+
+File columns: crop, variety, category, region, soil_types ("Loamy|Sandy"),
+description, and <feature>_min / <feature>_max for N, P, K, ph, temp,
+humidity and rainfall. The default file mirrors CROP_REQUIREMENTS.
+
+    python backend/crop_store.py --category pulse N=40 P=60 K=20 ph=6.5 temperature=28 humidity=70 rainfall=700
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from suitability_engine import SUITABLE_SCORE, calculate_suitability_score, calculate_suitability_scores
+
+DEFAULT_STORE_PATH = Path(os.getenv(
+    "CROP_REQUIREMENTS_FILE",
+    Path(__file__).resolve().parent.parent / "ml_model" / "datasets" / "crop_requirements" / "crop_requirements.csv",
+))
+# CROP_REQUIREMENTS key -> column prefix in the file
+REQUIREMENT_COLUMNS = {"N": "N", "P": "P", "K": "K", "pH": "ph", "temp": "temp",
+                       "humidity": "humidity", "rainfall": "rainfall"}
+TEXT_COLUMNS = ("crop", "variety", "category", "region", "soil_types", "description")
+# Keys the API uses for the same ranges in result payloads
+RESULT_KEYS = {"N": "N", "P": "P", "K": "K", "pH": "pH", "temp": "temperature",
+               "humidity": "humidity", "rainfall": "rainfall"}
+
+
+class IntervalIndex:
+    """Finds the rows whose closed interval [low, high] contains a value
+
+    Keeps the rows sorted by each bound, so a lookup is two binary
+    searches and two scatters into a row mask.
+    """
+
+    def __init__(self, low: np.ndarray, high: np.ndarray) -> None:
+        self.size = len(low)
+        self.low_order = np.argsort(low, kind="stable")
+        self.low_sorted = low[self.low_order]
+        self.high_order = np.argsort(high, kind="stable")
+        self.high_sorted = high[self.high_order]
+
+    def containing(self, x: float) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.low_order[:np.searchsorted(self.low_sorted, x, side="right")]] = True  # low <= x
+        mask[self.high_order[:np.searchsorted(self.high_sorted, x, side="left")]] = False  # high < x
+        return mask
+
+
+def _plain(key: str, value: float):
+    # Whole-number bounds print as in CROP_REQUIREMENTS ("needs 60+", not "60.0+")
+    return int(value) if key != "pH" and float(value).is_integer() else float(value)
+
+
+class CropStore:
+    """Varieties as columns, with category/region and fatal-bound indexes"""
+
+    def __init__(self, columns: Mapping[str, Any]) -> None:
+        self.crop = np.asarray(columns["crop"], dtype=object)
+        self.size = len(self.crop)
+        self.variety = np.asarray(columns.get("variety", self.crop), dtype=object)
+        self.category = np.asarray(columns.get("category", [""] * self.size), dtype=object)
+        self.region = np.asarray(columns.get("region", [""] * self.size), dtype=object)
+        self.description = np.asarray(columns.get("description", [""] * self.size), dtype=object)
+        self.soil_types = [tuple(filter(None, str(value).split("|"))) for value in columns.get("soil_types", [""] * self.size)]
+
+        self.bounds: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for key, prefix in REQUIREMENT_COLUMNS.items():
+            low = np.asarray(columns[f"{prefix}_min"], dtype=np.float64)
+            high = np.asarray(columns[f"{prefix}_max"], dtype=np.float64)
+            bad = np.flatnonzero(np.isnan(low) | np.isnan(high) | (low > high))
+            if len(bad):
+                raise ValueError(f"Invalid {prefix} range for variety '{self.variety[bad[0]]}'")
+            self.bounds[key] = (low, high)
+
+        # Each index covers the inputs a variety survives on that feature:
+        # anything outside fails calculate_suitability_score's fatal checks
+        t_min, t_max = self.bounds["temp"]
+        ph_min, ph_max = self.bounds["pH"]
+        r_min, _ = self.bounds["rainfall"]
+        self.indexes = {
+            "temperature": IntervalIndex(t_min - 5, t_max + 5),
+            "ph": IntervalIndex(ph_min - 1.0, ph_max + 1.0),
+            "rainfall": IntervalIndex(r_min * 0.3, np.full(self.size, np.inf)),
+        }
+        self._by_category = self._inverted(self.category)
+        self._by_region = self._inverted(self.region)
+
+    @staticmethod
+    def _inverted(values: np.ndarray) -> Dict[str, np.ndarray]:
+        keys = np.array([str(value).strip().lower() for value in values], dtype=object)
+        return {key: np.flatnonzero(keys == key) for key in dict.fromkeys(keys)}
+
+    @classmethod
+    def from_requirements(cls, requirements: Mapping[str, Mapping], region: str = "", category: str = "") -> "CropStore":
+        """A store over a CROP_REQUIREMENTS-shaped dict, one variety per crop"""
+        names = list(requirements)
+        columns: Dict[str, Any] = {
+            "crop": names,
+            "region": [region] * len(names),
+            "category": [category] * len(names),
+            "soil_types": ["|".join(requirements[name].get("soil_type", [])) for name in names],
+            "description": [requirements[name].get("description", "") for name in names],
+        }
+        for key, prefix in REQUIREMENT_COLUMNS.items():
+            columns[f"{prefix}_min"] = [requirements[name][key][0] for name in names]
+            columns[f"{prefix}_max"] = [requirements[name][key][1] for name in names]
+        return cls(columns)
+
+    # --- Lookups ----------------------------------------------------------------------
+    def categories(self) -> Dict[str, int]:
+        return {key: len(rows) for key, rows in self._by_category.items()}
+
+    def regions(self) -> Dict[str, int]:
+        return {key: len(rows) for key, rows in self._by_region.items()}
+
+    def requirements(self, row: int) -> Dict[str, Any]:
+        """One variety in CROP_REQUIREMENTS form"""
+        req: Dict[str, Any] = {
+            key: (_plain(key, low[row]), _plain(key, high[row])) for key, (low, high) in self.bounds.items()
+        }
+        req["soil_type"] = list(self.soil_types[row])
+        req["description"] = self.description[row]
+        return req
+
+    def to_requirements(self, region: Optional[str] = None, category: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """CROP_REQUIREMENTS-shaped dict keyed by variety, for the dict-based engines"""
+        return {str(self.variety[row]): self.requirements(row) for row in self.select(region=region, category=category)}
+
+    def select(self, category: Optional[str] = None, region: Optional[str] = None) -> np.ndarray:
+        """Row numbers matching the filters (case-insensitive), in file order"""
+        rows: Optional[np.ndarray] = None
+        for index, value in ((self._by_category, category), (self._by_region, region)):
+            if value is None:
+                continue
+            matched = index.get(value.strip().lower(), np.empty(0, dtype=np.intp))
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+        return np.arange(self.size) if rows is None else rows
+
+    # --- Scoring ----------------------------------------------------------------------
+    def candidates(self, user_input: Mapping[str, float], category: Optional[str] = None,
+                   region: Optional[str] = None) -> Tuple[np.ndarray, int]:
+        """Rows that pass the filters and no indexed fatal check, and how many passed the filters"""
+        if category is None and region is None:
+            mask = np.ones(self.size, dtype=bool)
+            matched = self.size
+        else:
+            rows = self.select(category, region)
+            mask = np.zeros(self.size, dtype=bool)
+            mask[rows] = True
+            matched = len(rows)
+        for feature, index in self.indexes.items():
+            mask &= index.containing(float(user_input.get(feature, 0)))
+        return np.flatnonzero(mask), matched
+
+    def score(self, user_input: Mapping[str, float], rows: np.ndarray) -> np.ndarray:
+        """Rule scores (0-100) of the given rows, identical to calculate_suitability_score"""
+        features = {name: np.full(len(rows), float(user_input.get(name, 0)))
+                    for name in ("N", "P", "K", "temperature", "humidity", "ph", "rainfall")}
+        requirements = {key: (low[rows], high[rows]) for key, (low, high) in self.bounds.items()}
+        return calculate_suitability_scores(features, requirements)
+
+    def query(self, user_input: Mapping[str, float], top_n: int = 5, category: Optional[str] = None,
+              region: Optional[str] = None) -> Dict[str, Any]:
+        """Best-scoring varieties for the input, highest first; ties keep file order
+
+        Varieties scoring 0 are never returned.
+        """
+        rows, matched = self.candidates(user_input, category, region)
+        scores = self.score(user_input, rows)
+        order = np.argsort(-scores, kind="stable")[:top_n]
+        order = order[scores[order] > 0]
+
+        recommendations: List[Dict[str, Any]] = []
+        for position in order:
+            row = int(rows[position])
+            req = self.requirements(row)
+            _, reason = calculate_suitability_score(dict(user_input), str(self.variety[row]), req)
+            recommendations.append({
+                "crop": str(self.crop[row]),
+                "variety": str(self.variety[row]),
+                "category": str(self.category[row]),
+                "region": str(self.region[row]),
+                "score": round(float(scores[position]), 1),
+                "reason": reason,
+                "requirements": {RESULT_KEYS[key]: req[key] for key in REQUIREMENT_COLUMNS},
+                "soil_types": req["soil_type"],
+                "description": req["description"],
+            })
+        return {
+            "recommendations": recommendations,
+            "total_varieties": matched,
+            "pruned": matched - len(rows),
+            "scored": len(rows),
+            "suitable_varieties": int((scores > SUITABLE_SCORE).sum()),
+        }
+
+
+def load_crop_store(path) -> CropStore:
+    """Read a requirements file (.csv or .parquet) into a CropStore"""
+    import pandas as pd
+
+    path = Path(path)
+    frame = pd.read_parquet(path) if path.suffix.lower() in (".parquet", ".pq") else pd.read_csv(path)
+    frame.columns = [str(column).strip() for column in frame.columns]
+    required = ["crop"] + [f"{prefix}_{side}" for prefix in REQUIREMENT_COLUMNS.values() for side in ("min", "max")]
+    missing = [column for column in required if column not in frame.columns]
+    if missing:
+        raise ValueError(f"{path} is missing required columns: {', '.join(missing)}")
+    columns: Dict[str, Any] = {}
+    for column in frame.columns:
+        if column in TEXT_COLUMNS:
+            columns[column] = frame[column].fillna("").astype(str).to_numpy(dtype=object)
+        else:
+            columns[column] = frame[column].to_numpy()
+    if "variety" in columns:
+        columns["variety"] = np.where(columns["variety"] == "", columns["crop"], columns["variety"])
+    return CropStore(columns)
+
+
+_stores: Dict[str, Tuple[Tuple[int, int], CropStore]] = {}
+_store_lock = threading.Lock()
+
+
+def get_crop_store(path=None) -> CropStore:
+    """The store for ``path`` (default DEFAULT_STORE_PATH), reloaded when the file changes"""
+    path = str(Path(path or DEFAULT_STORE_PATH).resolve())
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _stores.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with _store_lock:
+        cached = _stores.get(path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, load_crop_store(path))
+            _stores[path] = cached
+        return cached[1]
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rank varieties from a crop requirements file")
+    parser.add_argument("values", nargs="*", help="feature=value pairs, e.g. N=90 ph=6.5")
+    parser.add_argument("--file", default=None, help=f"Requirements file (default {DEFAULT_STORE_PATH})")
+    parser.add_argument("--category")
+    parser.add_argument("--region")
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    store = get_crop_store(args.file)
+    user_input = {name: float(value) for name, value in (pair.split("=", 1) for pair in args.values)}
+    print(f"{store.size:,} varieties; categories {store.categories()}; regions {store.regions()}")
+    result = store.query(user_input, args.top, args.category, args.region)
+    print(f"{result['total_varieties']:,} matched filters, {result['pruned']:,} pruned, {result['scored']:,} scored")
+    for rec in result["recommendations"]:
+        print(f"  {rec['variety']:<20} {rec['score']:5.1f}  {rec['reason']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Streaming preview and column statistics for large CSV datasets
+
+The preview parses only the first rows. Statistics come from a single
+pass over record batches (pyarrow's streaming CSV reader, or pandas
+chunks without pyarrow): count, nulls, min, max, mean and std exactly,
+quantiles from a fixed-size uniform sample (exact for files up to
+QUANTILE_SAMPLE_SIZE rows), and value counts for text columns.
+
+Results are cached in memory and as JSON in ml_model/datasets/.cache/,
+keyed on the file's path, mtime and size, so they are recomputed only
+when the file changes.
+
+    python -m backend.dataset_inspector ml_model/datasets/combined/unified_agricultural_dataset.csv
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "ml_model" / "datasets" / ".cache"
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+QUANTILE_SAMPLE_SIZE = 100_000
+MAX_CATEGORIES = 1_000  # Text columns with more distinct values stop being counted
+BLOCK_BYTES = 4 << 20  # Bounds the streaming reader's read-ahead (~40 blocks)
+STATS_FORMAT = 3  # Bumped when cached statistics change meaning
+_NUMBER = r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$|^(?i:[-+]?(nan|inf|infinity))$"
+
+logger = logging.getLogger(__name__)
+
+_memory_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def file_signature(path) -> Tuple[str, int, int]:
+    stat = os.stat(path)
+    return str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def preview_csv(path, rows: int = 5) -> pd.DataFrame:
+    """First ``rows`` rows; the rest of the file is never parsed"""
+    return pd.read_csv(path, nrows=rows)
+
+
+def _iter_columns(path) -> Iterator[Tuple[int, Dict[str, Tuple[bool, Any]]]]:
+    """Per batch: row count and column name -> (is_numeric, float64 array or (value counts, nulls))"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pacsv
+    except ImportError:
+        with pd.read_csv(path, chunksize=200_000) as reader:
+            for frame in reader:
+                yield len(frame), {name: _pandas_column(frame[name]) for name in frame.columns}
+        return
+
+    # Everything is read as text and parsed per batch: with inferred types a
+    # stray word after the first block would fail the whole read
+    names = list(pd.read_csv(path, nrows=0).columns)
+    convert = pacsv.ConvertOptions(column_types={name: pa.string() for name in names}, strings_can_be_null=True)
+    reader = pacsv.open_csv(path, read_options=pacsv.ReadOptions(block_size=BLOCK_BYTES), convert_options=convert)
+    numeric_columns: Dict[str, bool] = {}
+    for batch in reader:
+        columns = {}
+        for name, array in zip(batch.schema.names, batch.columns):
+            values = pc.utf8_trim_whitespace(array)
+            parses = pc.match_substring_regex(values, _NUMBER)
+            if name not in numeric_columns:
+                # As type inference would: numeric when every value in the first batch parses
+                numeric_columns[name] = pc.all(parses).as_py() is not False
+            if numeric_columns[name]:
+                numbers = pc.if_else(parses, values, pa.scalar(None, pa.string())).cast(pa.float64())
+                columns[name] = (True, numbers.to_numpy(zero_copy_only=False))
+            else:
+                counts = pc.value_counts(array.drop_null())
+                values = counts.field("values").to_pylist()
+                columns[name] = (False, (dict(zip(values, counts.field("counts").to_pylist())), array.null_count))
+        yield batch.num_rows, columns
+
+
+def _pandas_column(values: pd.Series) -> Tuple[bool, Any]:
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return True, values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return False, (values.dropna().astype(str).value_counts().to_dict(), int(values.isna().sum()))
+
+
+class _NumericColumn:
+    def __init__(self, rng: np.random.Generator) -> None:
+        self.rng = rng
+        self.count = 0
+        self.nulls = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.shift: Optional[float] = None  # Shifted sums keep the variance numerically stable
+        self.sample = np.empty(0)
+        self.sample_keys = np.empty(0)
+
+    def update(self, array: np.ndarray) -> None:
+        present = array[~np.isnan(array)]
+        self.nulls += len(array) - len(present)
+        if not len(present):
+            return
+        if self.shift is None:
+            self.shift = float(present[0])
+        shifted = present - self.shift
+        self.count += len(present)
+        self.min = min(self.min, float(present.min()))
+        self.max = max(self.max, float(present.max()))
+        self.total += float(shifted.sum())
+        self.total_sq += float(np.dot(shifted, shifted))
+
+        # Bottom-k random keys: a uniform sample without replacement, vectorized
+        keys = np.concatenate([self.sample_keys, self.rng.random(len(present))])
+        values_all = np.concatenate([self.sample, present])
+        if len(keys) > QUANTILE_SAMPLE_SIZE:
+            keep = np.argpartition(keys, QUANTILE_SAMPLE_SIZE)[:QUANTILE_SAMPLE_SIZE]
+            keys, values_all = keys[keep], values_all[keep]
+        self.sample_keys, self.sample = keys, values_all
+
+    def result(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"count": self.count, "nulls": self.nulls}
+        if not self.count:
+            return stats
+        mean = self.total / self.count
+        variance = max(self.total_sq / self.count - mean ** 2, 0.0) * self.count / max(self.count - 1, 1)
+        stats.update(
+            min=self.min,
+            max=self.max,
+            mean=self.shift + mean,
+            std=float(np.sqrt(variance)),
+            quantiles_exact=self.count <= QUANTILE_SAMPLE_SIZE,
+        )
+        for q, value in zip(QUANTILES, np.quantile(self.sample, QUANTILES)):
+            stats[f"q{int(q * 100):02d}"] = float(value)
+        return stats
+
+
+class _CategoricalColumn:
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+        self.total = 0  # Exact even after the counts are truncated
+        self.nulls = 0
+        self.truncated = False
+
+    def update(self, counts: Dict[str, int], nulls: int) -> None:
+        self.nulls += nulls
+        self.total += sum(counts.values())
+        if not self.truncated:
+            self.counts.update(counts)
+            if len(self.counts) > MAX_CATEGORIES:
+                self.truncated = True
+                self.counts = Counter(dict(self.counts.most_common(MAX_CATEGORIES)))
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "count": self.total,
+            "nulls": self.nulls,
+            "distinct": len(self.counts),
+            "truncated": self.truncated,
+            "counts": dict(self.counts.most_common()),
+        }
+
+
+def compute_statistics(path, seed: int = 0) -> Dict[str, Any]:
+    """One streaming pass over the file; see the module docstring for what is exact"""
+    rng = np.random.default_rng(seed)
+    columns: Dict[str, Any] = {}
+    rows = 0
+    for batch_rows, batch in _iter_columns(path):
+        rows += batch_rows
+        for name, (numeric, data) in batch.items():
+            if name not in columns:
+                columns[name] = _NumericColumn(rng) if numeric else _CategoricalColumn()
+            column = columns[name]
+            # Column kinds are fixed by the first batch: text in a numeric column
+            # counts as null (the whole chunk without pyarrow, whose chunks infer
+            # types independently), numbers in a text column are counted as text
+            if isinstance(column, _NumericColumn):
+                column.update(data if numeric else np.full(batch_rows, np.nan))
+            elif numeric:
+                column.update(*_pandas_column(pd.Series(data).astype(object))[1])
+            else:
+                column.update(*data)
+
+    _, mtime_ns, size = file_signature(path)
+    return {
+        "format": STATS_FORMAT,
+        "path": str(path),
+        "mtime_ns": mtime_ns,
+        "size_bytes": size,
+        "rows": rows,
+        "numeric": {name: col.result() for name, col in columns.items() if isinstance(col, _NumericColumn)},
+        "categorical": {name: col.result() for name, col in columns.items() if isinstance(col, _CategoricalColumn)},
+    }
+
+
+def _cache_file(cache_dir, resolved_path: str) -> Path:
+    digest = hashlib.sha1(resolved_path.encode("utf-8")).hexdigest()[:12]
+    return Path(cache_dir) / f"{Path(resolved_path).stem}-{digest}.stats.json"
+
+
+def dataset_statistics(path, cache_dir=DEFAULT_CACHE_DIR) -> Dict[str, Any]:
+    """Column statistics, reused until the file's mtime or size changes"""
+    signature = file_signature(path)
+    with _cache_lock:
+        cached = _memory_cache.get(signature)
+    if cached is not None:
+        return cached
+
+    cache_path = _cache_file(cache_dir, signature[0])
+    stats = None
+    try:
+        with open(cache_path) as fh:
+            stored = json.load(fh)
+        if (stored.get("format"), stored.get("mtime_ns"), stored.get("size_bytes")) == (STATS_FORMAT, *signature[1:]):
+            stats = stored
+    except (OSError, ValueError):
+        pass
+
+    if stats is None:
+        stats = compute_statistics(path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as fh:
+                json.dump(stats, fh)
+            os.replace(tmp_path, cache_path)
+        except OSError:  # Read-only checkout; the in-memory cache still applies
+            logger.warning("Could not write dataset statistics cache %s", cache_path, exc_info=True)
+
+    with _cache_lock:
+        _memory_cache[signature] = stats
+    return stats
+
+
+def numeric_summary_frame(stats: Dict[str, Any]) -> pd.DataFrame:
+    """Numeric column statistics as a table, one row per column"""
+    frame = pd.DataFrame.from_dict(stats["numeric"], orient="index")
+    return frame.drop(columns=["quantiles_exact"], errors="ignore")
+
+
+def main(argv=None) -> int:
+    import time
+
+    path = (argv or sys.argv[1:] or [None])[0]
+    if path is None:
+        print("usage: python -m backend.dataset_inspector <csv>")
+        return 1
+    start = time.perf_counter()
+    stats = dataset_statistics(path)
+    print(f"{path}: {stats['rows']:,} rows, {stats['size_bytes'] / 1e6:.1f} MB ({time.perf_counter() - start:.2f}s)")
+    with pd.option_context("display.width", 160, "display.max_columns", 20):
+        print(numeric_summary_frame(stats).round(3))
+    for name, column in stats["categorical"].items():
+        top = ", ".join(f"{value} ({count})" for value, count in list(column["counts"].items())[:5])
+        print(f"{name}: {column['distinct']} distinct{'+' if column['truncated'] else ''}; top {top}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
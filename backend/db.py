@@ -1,29 +1,33 @@
+import logging
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Always load .env from this backend folder
-CURRENT_DIR = os.path.dirname(__file__)
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 DOTENV_PATH = os.path.join(CURRENT_DIR, ".env")
-print(f"Loading env from: {DOTENV_PATH} (exists={os.path.exists(DOTENV_PATH)})")
+logger.debug("Loading env from: %s (exists=%s)", DOTENV_PATH, os.path.exists(DOTENV_PATH))
 load_dotenv(dotenv_path=DOTENV_PATH)
 
+# Next to this file, whatever directory the server or trainer runs from
+DEFAULT_DATABASE_URL = f"sqlite:///{os.path.join(CURRENT_DIR, 'agronova_dev.db')}"
 DATABASE_URL = os.getenv("DATABASE_URL")
-print(f"DATABASE_URL loaded: {('None' if not DATABASE_URL else DATABASE_URL.split('://')[0] + '://***')} ")
 
 # Fallback to SQLite if DATABASE_URL is not set yet
 if not DATABASE_URL:
     # Use SQLite for simplicity - no external database required
-    DATABASE_URL = "sqlite:///./agronova_dev.db"
-    print("DATABASE_URL not set; using SQLite database (agronova_dev.db)")
+    DATABASE_URL = DEFAULT_DATABASE_URL
+    logger.info("DATABASE_URL not set; using SQLite database (%s)", DATABASE_URL)
 
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 )
-print(f"DB connected: {'Postgres' if 'postgresql' in DATABASE_URL or 'psycopg' in DATABASE_URL else 'SQLite'} -> {DATABASE_URL}")
+logger.info("DB configured: %s", 'Postgres' if 'postgresql' in DATABASE_URL or 'psycopg' in DATABASE_URL else 'SQLite')
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -32,4 +36,18 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def create_schema():
+    """Create any missing tables. Run explicitly: `python -m backend.db`"""
+    try:
+        from .models import Base as ModelsBase
+    except ImportError:
+        from models import Base as ModelsBase
+    # models.py declares its own Base, so create both metadata sets
+    Base.metadata.create_all(bind=engine)
+    ModelsBase.metadata.create_all(bind=engine)
+
+if __name__ == "__main__":
+    create_schema()
+    print(f"Schema ready on {DATABASE_URL.split('://')[0]}")
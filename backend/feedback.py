@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, status, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List
+
+try:
+    from .db import get_db
+    from .models import FieldSample
+    from .schemas import FieldSampleCreate, FieldSampleOut
+    from .auth import Principal, get_admin_principal, get_current_principal
+except ImportError:
+    from db import get_db
+    from models import FieldSample
+    from schemas import FieldSampleCreate, FieldSampleOut
+    from auth import Principal, get_admin_principal, get_current_principal
+
+
+router = APIRouter(prefix="/feedback", tags=["Field Feedback"])
+
+
+@router.post("/samples", response_model=FieldSampleOut, status_code=status.HTTP_201_CREATED)
+def create_field_sample(
+    sample: FieldSampleCreate,
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    """Record a soil reading with its observed soil type and harvest outcome"""
+    db_sample = FieldSample(user_id=principal.id, **sample.model_dump())
+    db.add(db_sample)
+    db.commit()
+    db.refresh(db_sample)
+    return db_sample
+
+
+@router.get("/samples", response_model=List[FieldSampleOut])
+def list_field_samples(
+    since_id: int = Query(0, ge=0, description="Only samples with a larger id"),
+    limit: int = Query(500, ge=1, le=5000),
+    principal: Principal = Depends(get_admin_principal),
+    db: Session = Depends(get_db),
+):
+    """Field samples in id order (admin only)"""
+    return (
+        db.query(FieldSample)
+        .filter(FieldSample.id > since_id)
+        .order_by(FieldSample.id)
+        .limit(limit)
+        .all()
+    )
+
+
+@router.get("/summary")
+def field_sample_summary(
+    principal: Principal = Depends(get_admin_principal),
+    db: Session = Depends(get_db),
+):
+    """Sample counts per soil type and the newest id (admin only)"""
+    counts = (
+        db.query(FieldSample.soil_type, func.count(FieldSample.id))
+        .group_by(FieldSample.soil_type)
+        .all()
+    )
+    latest_id = db.query(func.max(FieldSample.id)).scalar() or 0
+    return {
+        "total_samples": sum(count for _, count in counts),
+        "latest_id": latest_id,
+        "by_soil_type": {soil_type: count for soil_type, count in counts},
+    }
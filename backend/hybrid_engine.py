@@ -4,37 +4,57 @@ Hybrid ML + Rule-based Engine
 Combines advanced ML models with rule-based logic
 """
 
-import joblib
 import os
+import threading
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 from suitability_engine import calculate_all_suitabilities, get_top_recommendations
-from crop_database import get_all_crops
+from crop_database import CROP_REQUIREMENTS
+from rule_compiler import CompiledRules, compile_rules, get_compiled_rules, requirements_fingerprint
+
+# Column order the ML models were trained on
+ML_FEATURE_COLUMNS = ['N', 'P', 'K', 'ph', 'temperature', 'humidity', 'rainfall']
+# get_hybrid_recommendations only blends ML into the rule engine's top 10
+RULE_CANDIDATES = 10
+
+# Single model predicting every crop at once (ml_model/train_crop_models.py --multi-output)
+MULTI_OUTPUT_MODEL_FILE = 'crop_suitability_multioutput.joblib'
+MULTI_OUTPUT_INFO_FILE = 'crop_suitability_multioutput_info.joblib'
 
 class HybridEngine:
     """Hybrid engine combining ML models with rule-based logic"""
     
-    def __init__(self, model_dir: str = "ml_model/models/advanced"):
-        """Initialize hybrid engine with ML models"""
+    def __init__(self, model_dir: str = "ml_model/models/advanced", crop_table: Optional[Dict] = None):
+        """Initialize hybrid engine with ML models, scoring ``crop_table`` (default CROP_REQUIREMENTS)"""
         self.model_dir = model_dir
+        self.crop_table = CROP_REQUIREMENTS if crop_table is None else crop_table
+        self._compiled: Optional[CompiledRules] = None
         self.ml_models = {}
         self.model_info = {}
         self.available_ml_crops = []
+        self.multi_output_model = None
+        self.multi_output_crops = []
         
         # Load available ML models
         self._load_ml_models()
         
     def _load_ml_models(self):
         """Load all available ML models"""
+        import joblib
+
         if not os.path.exists(self.model_dir):
             print(f"ML model directory not found: {self.model_dir}")
             return
             
         try:
+            self._load_multi_output_model(joblib)
+
             # Find all available models
             for filename in os.listdir(self.model_dir):
                 if filename.endswith('_regressor.joblib'):
                     crop_name = filename.replace('_regressor.joblib', '')
+                    if crop_name in self.multi_output_crops:
+                        continue  # Already covered by the multi-output model
                     
                     # Load model
                     model_path = os.path.join(self.model_dir, filename)
@@ -52,41 +72,113 @@ class HybridEngine:
             
         except Exception as e:
             print(f"Error loading ML models: {e}")
+
+    def _load_multi_output_model(self, joblib):
+        """Load the multi-output model if it has been trained; it takes precedence over per-crop models"""
+        model_path = os.path.join(self.model_dir, MULTI_OUTPUT_MODEL_FILE)
+        info_path = os.path.join(self.model_dir, MULTI_OUTPUT_INFO_FILE)
+        if not (os.path.exists(model_path) and os.path.exists(info_path)):
+            return
+
+        try:
+            model = joblib.load(model_path)
+            info = joblib.load(info_path)
+        except Exception as e:
+            print(f"Error loading multi-output model: {e}")
+            return
+
+        crops = list(info.get('crops', []))
+        if getattr(model, 'n_outputs_', len(crops)) != len(crops):
+            print(f"Multi-output model has {model.n_outputs_} outputs but {len(crops)} crops; ignoring it")
+            return
+
+        self.multi_output_model = model
+        self.multi_output_crops = crops
+        for crop_name in crops:
+            self.model_info[crop_name] = info
+            self.available_ml_crops.append(crop_name)
+        print(f"Loaded multi-output ML model for {len(crops)} crops")
     
+    def rules(self) -> CompiledRules:
+        """Compiled rule tables for this engine's crop table, rebuilt if it changes"""
+        if self.crop_table is CROP_REQUIREMENTS:
+            return get_compiled_rules()
+        compiled = self._compiled
+        if compiled is None or compiled.fingerprint != requirements_fingerprint(self.crop_table):
+            compiled = self._compiled = compile_rules(self.crop_table)
+        return compiled
+
     def predict_ml_suitability(self, user_input: Dict) -> Dict[str, float]:
         """Predict suitability using ML models"""
+        input_array = np.array([[user_input[column] for column in ML_FEATURE_COLUMNS]], dtype=float)
+        return {crop_name: float(values[0]) for crop_name, values in self.predict_ml_suitability_batch(input_array).items()}
+
+    def predict_ml_suitability_batch(self, input_array: np.ndarray) -> Dict[str, np.ndarray]:
+        """ML suitability (0-1) for every row of an (n, 7) array in ML_FEATURE_COLUMNS order"""
         ml_predictions = {}
-        
-        # Prepare input array
-        feature_columns = ['N', 'P', 'K', 'ph', 'temperature', 'humidity', 'rainfall']
-        input_array = np.array([[
-            user_input['N'],
-            user_input['P'], 
-            user_input['K'],
-            user_input['ph'],
-            user_input['temperature'],
-            user_input['humidity'],
-            user_input['rainfall']
-        ]])
-        
-        # Get predictions from available ML models
+        n_rows = input_array.shape[0]
+
+        # One call covers every crop the multi-output model was trained on
+        if self.multi_output_model is not None:
+            try:
+                predictions = np.clip(self.multi_output_model.predict(input_array), 0, 1).reshape(n_rows, -1)
+                ml_predictions.update((crop_name, predictions[:, i]) for i, crop_name in enumerate(self.multi_output_crops))
+            except Exception as e:
+                print(f"Error predicting with multi-output model: {e}")
+                ml_predictions.update((crop_name, np.zeros(n_rows)) for crop_name in self.multi_output_crops)
+
+        # Get predictions from the remaining per-crop models
         for crop_name, model in self.ml_models.items():
             try:
-                prediction = model.predict(input_array)[0]
                 # Ensure prediction is between 0 and 1
-                prediction = max(0, min(1, prediction))
-                ml_predictions[crop_name] = prediction
+                ml_predictions[crop_name] = np.clip(model.predict(input_array), 0, 1)
             except Exception as e:
                 print(f"Error predicting {crop_name}: {e}")
-                ml_predictions[crop_name] = 0.0
-        
+                ml_predictions[crop_name] = np.zeros(n_rows)
+
         return ml_predictions
-    
+
+    def get_hybrid_scores_batch(self, features: Mapping[str, np.ndarray],
+                                crops: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Rule and hybrid suitability (0-1) for arrays of inputs, each shaped (n, len(crops))"""
+        compiled = self.rules()
+        crops = list(compiled.crops) if crops is None else list(crops)
+        rule = compiled.score(features, crops) / 100.0
+
+        hybrid = rule.copy()
+        if any(crop_name in self.available_ml_crops for crop_name in crops):
+            input_array = np.column_stack([np.asarray(features[column], dtype=float) for column in ML_FEATURE_COLUMNS])
+            for crop_name, ml_score in self.predict_ml_suitability_batch(input_array).items():
+                if crop_name in crops:
+                    j = crops.index(crop_name)
+                    hybrid[:, j] = 0.7 * rule[:, j] + 0.3 * ml_score
+        return crops, rule, hybrid
+
+    def get_hybrid_recommendations_batch(self, features: Mapping[str, np.ndarray], top_n: int = 5) -> Dict:
+        """Vectorized get_hybrid_recommendations for arrays of inputs
+
+        Returns the crop names, plus (n, top_n) arrays of crop indexes and
+        hybrid scores (0-100) in the same order the scalar path ranks them.
+        """
+        crops, rule, hybrid = self.get_hybrid_scores_batch(features)
+        ranked, scores = self.rank_hybrid(rule, hybrid, top_n)
+        return {'crops': crops, 'ranked': ranked, 'scores': scores}
+
+    @staticmethod
+    def rank_hybrid(rule: np.ndarray, hybrid: np.ndarray, top_n: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """(n, top_n) crop indexes and hybrid scores (0-100), ranked as get_hybrid_recommendations does"""
+        # Stable sorts reproduce the scalar path's tie order: the rule engine's
+        # top 10, then re-ranked by hybrid score
+        candidates = np.argsort(-rule, axis=1, kind='stable')[:, :RULE_CANDIDATES]
+        candidate_scores = np.take_along_axis(hybrid, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind='stable')[:, :top_n]
+        return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1) * 100
+
     def get_hybrid_recommendations(self, user_input: Dict, top_n: int = 5) -> Dict:
         """Get hybrid recommendations combining ML and rule-based"""
         
         # Get rule-based recommendations
-        rule_results = get_top_recommendations(user_input, top_n=10)
+        rule_results = get_top_recommendations(user_input, top_n=10, crop_table=self.crop_table)
         
         # Get ML predictions for available crops
         ml_predictions = self.predict_ml_suitability(user_input)
@@ -144,10 +236,11 @@ class HybridEngine:
         """Get information about the hybrid engine"""
         return {
             'engine_type': 'Hybrid (Rule-based + ML)',
-            'rule_based_crops': len(get_all_crops()),
+            'ml_model_layout': 'multi-output' if self.multi_output_model is not None else 'per-crop',
+            'rule_based_crops': len(self.crop_table),
             'ml_available_crops': len(self.available_ml_crops),
             'ml_crops': self.available_ml_crops,
-            'total_crops': len(get_all_crops()),
+            'total_crops': len(self.crop_table),
             'ml_model_performance': {
                 crop: {
                     'algorithm': info.get('algorithm', 'Unknown'),
@@ -157,5 +250,21 @@ class HybridEngine:
             }
         }
 
-# Global hybrid engine instance
-hybrid_engine = HybridEngine()
+_shared_engine: Optional[HybridEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_hybrid_engine() -> HybridEngine:
+    """Global hybrid engine instance, built on first use"""
+    global _shared_engine
+    if _shared_engine is None:
+        with _shared_lock:
+            if _shared_engine is None:
+                _shared_engine = HybridEngine()
+    return _shared_engine
+
+
+def __getattr__(name: str):
+    if name == "hybrid_engine":
+        return get_hybrid_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
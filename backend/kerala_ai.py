@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import copy
+import logging
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-import joblib
 import numpy as np
 import sys
 import os
@@ -18,58 +21,149 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.append(current_dir)
 
-# Now import directly (Python now knows to look in this folder)
-from hybrid_engine import HybridEngine
-
 try:  # Package-relative imports when running via `backend.main`
-    from .suitability_engine import calculate_all_suitabilities, get_top_recommendations
-    from .crop_database import (
-        CROP_REQUIREMENTS,
-        get_all_crops,
-        get_crop_descriptions,
-    )
+    from .suitability_engine import SUITABLE_SCORE, calculate_all_suitabilities, get_top_recommendations
+    from .crop_store import get_crop_store
+    from .amendment_optimizer import DEFAULT_COSTS, GOOD_SCORE, optimize_amendments
+    from .rotation_planner import BEAM_WIDTH, plan_rotation
+    from .rule_compiler import compile_rules
+    from .seasonal_suitability import seasonal_suitability
+    from .regions import DEFAULT_REGION, RegionProfile, RegionRegistry, load_region_profile
+    from .soil_model_store import SoilArtifacts, current_version, load_soil_artifacts
+    from .shadow_eval import ShadowEvaluator
 except ImportError:  # Direct execution / Streamlit path
-    from suitability_engine import calculate_all_suitabilities, get_top_recommendations
-    from crop_database import (
-        CROP_REQUIREMENTS,
-        get_all_crops,
-        get_crop_descriptions,
-    )
+    from suitability_engine import SUITABLE_SCORE, calculate_all_suitabilities, get_top_recommendations
+    from crop_store import get_crop_store
+    from amendment_optimizer import DEFAULT_COSTS, GOOD_SCORE, optimize_amendments
+    from rotation_planner import BEAM_WIDTH, plan_rotation
+    from rule_compiler import compile_rules
+    from seasonal_suitability import seasonal_suitability
+    from regions import DEFAULT_REGION, RegionProfile, RegionRegistry, load_region_profile
+    from soil_model_store import SoilArtifacts, current_version, load_soil_artifacts
+    from shadow_eval import ShadowEvaluator
+
+logger = logging.getLogger(__name__)
+
+# How often to look for a newly published soil model version
+SOIL_MODEL_REFRESH_SECONDS = float(os.getenv("SOIL_MODEL_REFRESH_SECONDS", "30"))
+
+# Input ranges the API accepts; the default extent of suitability grids
+FEATURE_BOUNDS = {
+    "N": (0.0, 300.0),
+    "P": (0.0, 300.0),
+    "K": (0.0, 400.0),
+    "ph": (3.5, 10.0),
+    "temperature": (8.0, 55.0),
+    "humidity": (14.0, 100.0),
+    "rainfall": (20.0, 2000.0),
+}
+# Default standard deviation of each reading for uncertainty estimates: a
+# typical field test kit for soil; climate values are taken as exact
+MEASUREMENT_ERRORS = {
+    "N": 15.0,
+    "P": 8.0,
+    "K": 20.0,
+    "ph": 0.3,
+    "temperature": 0.0,
+    "humidity": 0.0,
+    "rainfall": 0.0,
+}
+UNCERTAINTY_PERCENTILES = (5, 25, 50, 75, 95)
+# The soil forest costs far more per row than the crop engine; soil type
+# shares are estimated from the first samples only
+SOIL_UNCERTAINTY_SAMPLES = 2000
 
 
 class KeralaAI:
-    """Loads ML artifacts and exposes reusable Kerala AI helpers."""
+    """Loads ML artifacts and exposes reusable AI helpers for one region (Kerala by default)."""
 
-    def __init__(self, model_dir: Path | None = None) -> None:
-        backend_dir = Path(__file__).resolve().parent
-        default_models = backend_dir.parent / "ml_model" / "models"
-        self.model_dir = Path(model_dir) if model_dir else default_models
+    def __init__(self, model_dir: Path | None = None, region: RegionProfile | None = None) -> None:
+        self.region = region or load_region_profile(DEFAULT_REGION)
+        self.advice = self.region.advice
+        self.model_dir = Path(model_dir) if model_dir else self.region.model_dir
         self._load_soil_models()
 
+        # Deferred so importing this module doesn't pull in joblib/sklearn
+        from hybrid_engine import HybridEngine
+
         advanced_dir = self.model_dir / "advanced"
-        self.hybrid_engine = HybridEngine(model_dir=str(advanced_dir))
-        self.available_crops = get_all_crops()
-        self.crop_descriptions = get_crop_descriptions()
+        self.hybrid_engine = HybridEngine(model_dir=str(advanced_dir), crop_table=self.region.crop_table)
+        # The engine resolves the default table, so both share one CROP_REQUIREMENTS
+        self.crop_table = self.hybrid_engine.crop_table
+        self.available_crops = list(self.crop_table)
+        self.crop_descriptions = {crop: reqs["description"] for crop, reqs in self.crop_table.items()}
+        # Candidate models scored off the request path, if configured
+        self.shadow: Optional[ShadowEvaluator] = (
+            ShadowEvaluator.from_env(self) if self.region.key == DEFAULT_REGION else None
+        )
 
     # --- Model loading helpers -------------------------------------------------
     def _load_soil_models(self) -> None:
         try:
-            self.kerala_soil_classifier = joblib.load(
-                self.model_dir / "unified_soil_model.joblib"
-            )
-            self.kerala_soil_scaler = joblib.load(
-                self.model_dir / "unified_soil_scaler.joblib"
-            )
-            self.kerala_soil_encoder = joblib.load(
-                self.model_dir / "unified_soil_encoder.joblib"
-            )
-            self.kerala_soil_info = joblib.load(
-                self.model_dir / "unified_soil_info.joblib"
-            )
+            self._soil = load_soil_artifacts(self.model_dir)
         except FileNotFoundError as exc:
             raise RuntimeError(f"Missing soil artifact: {exc.filename}") from exc
         except Exception as exc:  # pragma: no cover - defensive logging
             raise RuntimeError(f"Failed to load soil artifacts: {exc}") from exc
+        self._soil_checked_at = time.monotonic()
+        self._soil_reload_lock = threading.Lock()
+
+    def refresh_soil_models(self, force: bool = False, background: bool = False) -> bool:
+        """Swap in a newly published soil model version if there is one
+
+        Checks at most every SOIL_MODEL_REFRESH_SECONDS unless ``force``.
+        With ``background`` the load runs on a daemon thread so callers on
+        the event loop aren't blocked; returns True if a load was started
+        or completed.
+        """
+        now = time.monotonic()
+        if not force and now - self._soil_checked_at < SOIL_MODEL_REFRESH_SECONDS:
+            return False
+        self._soil_checked_at = now
+        if current_version(self.model_dir) == self._soil.version:
+            return False
+        if background:
+            if self._soil_reload_lock.locked():
+                return False
+            threading.Thread(target=self._reload_soil_models, name="soil-model-reload", daemon=True).start()
+            return True
+        return self._reload_soil_models()
+
+    def _reload_soil_models(self) -> bool:
+        with self._soil_reload_lock:
+            if current_version(self.model_dir) == self._soil.version:
+                return False
+            try:
+                artifacts = load_soil_artifacts(self.model_dir)
+            except Exception:
+                logger.warning("Keeping soil model %s; failed to load new version",
+                               self._soil.version or "base", exc_info=True)
+                return False
+            # Requests hold their own reference to the old artifacts, so one
+            # assignment switches versions without mixing them mid-request
+            self._soil = artifacts
+            logger.info("Loaded soil model version %s", artifacts.version or "base")
+            return True
+
+    @property
+    def soil_model_version(self) -> Optional[str]:
+        return self._soil.version
+
+    @property
+    def kerala_soil_classifier(self) -> Any:
+        return self._soil.classifier
+
+    @property
+    def kerala_soil_scaler(self) -> Any:
+        return self._soil.scaler
+
+    @property
+    def kerala_soil_encoder(self) -> Any:
+        return self._soil.encoder
+
+    @property
+    def kerala_soil_info(self) -> Dict[str, Any]:
+        return self._soil.info
 
     # --- Core utilities --------------------------------------------------------
     @staticmethod
@@ -90,12 +184,13 @@ class KeralaAI:
     def _soil_prediction_components(
         self, payload: Dict[str, float]
     ) -> Tuple[str, float, Dict[str, Any]]:
+        soil: SoilArtifacts = self._soil
         features = self._feature_vector(payload)
-        scaled = self.kerala_soil_scaler.transform(features)
-        encoded = self.kerala_soil_classifier.predict(scaled)[0]
-        soil_type = self.kerala_soil_encoder.inverse_transform([encoded])[0]
+        scaled = soil.scaler.transform(features)
+        encoded = soil.classifier.predict(scaled)[0]
+        soil_type = soil.encoder.inverse_transform([encoded])[0]
 
-        raw_proba = self.kerala_soil_classifier.predict_proba(scaled)[0]
+        raw_proba = soil.classifier.predict_proba(scaled)[0]
         max_proba = float(np.max(raw_proba))
         if max_proba > 0.5:
             confidence = min(0.95, max_proba * 1.2)
@@ -106,8 +201,9 @@ class KeralaAI:
         return soil_type, float(confidence), analysis
 
     # --- Analysis helpers (largely shared with previous FastAPI logic) ---------
-    @staticmethod
-    def get_kerala_soil_analysis(payload: Dict[str, float]) -> Dict[str, Any]:
+    def get_kerala_soil_analysis(self, payload: Dict[str, float]) -> Dict[str, Any]:
+        region = self.region.name
+        ph_low, ph_high = self.advice["optimal_ph"]
         N = payload["N"]
         P = payload["P"]
         K = payload["K"]
@@ -122,7 +218,7 @@ class KeralaAI:
                 "phosphorus": "High" if P > 60 else "Medium" if P > 30 else "Low",
                 "potassium": "High" if K > 100 else "Medium" if K > 50 else "Low",
             },
-            "ph_status": "Optimal for Kerala" if 5.5 <= ph <= 7.0 else "Suboptimal for Kerala",
+            "ph_status": f"Optimal for {region}" if ph_low <= ph <= ph_high else f"Suboptimal for {region}",
             "environmental_conditions": {
                 "temperature": "Tropical"
                 if temperature > 28
@@ -136,18 +232,18 @@ class KeralaAI:
                 if rainfall > 1000
                 else "Moderate",
             },
+            # Each check passes when every listed reading exceeds its threshold
             "kerala_suitability": {
-                "coconut_suitable": temperature > 25 and humidity > 70 and rainfall > 1000,
-                "rubber_suitable": temperature > 24 and humidity > 80 and rainfall > 1500,
-                "pepper_suitable": temperature > 20 and humidity > 70 and rainfall > 1500,
-                "rice_suitable": rainfall > 1000 and temperature > 20,
+                check: all(payload[feature] > threshold for feature, threshold in thresholds.items())
+                for check, thresholds in self.advice["suitability_checks"].items()
             },
         }
 
-    @staticmethod
     def get_kerala_farming_recommendations(
-        soil_type: str, payload: Dict[str, float]
+        self, soil_type: str, payload: Dict[str, float]
     ) -> Dict[str, Any]:
+        region = self.region.name
+        ph_low, ph_high = self.advice["optimal_ph"]
         N = payload["N"]
         P = payload["P"]
         K = payload["K"]
@@ -158,59 +254,49 @@ class KeralaAI:
 
         soil_improvement: List[str] = []
         if N < 50:
-            soil_improvement.append("Add organic manure or nitrogen fertilizers for Kerala crops")
+            soil_improvement.append(f"Add organic manure or nitrogen fertilizers for {region} crops")
         if P < 30:
-            soil_improvement.append("Consider rock phosphate or bone meal for Kerala soil")
+            soil_improvement.append(f"Consider rock phosphate or bone meal for {region} soil")
         if K < 60:
-            soil_improvement.append("Add potash fertilizers suitable for Kerala conditions")
-        if ph < 5.5:
-            soil_improvement.append("Add lime to raise pH for Kerala crops")
-        elif ph > 7.0:
+            soil_improvement.append(f"Add potash fertilizers suitable for {region} conditions")
+        if ph < ph_low:
+            soil_improvement.append(f"Add lime to raise pH for {region} crops")
+        elif ph > ph_high:
             soil_improvement.append("Add sulfur or organic matter to lower pH")
         if not soil_improvement:
-            soil_improvement.append("Soil is well-balanced for Kerala agriculture")
+            soil_improvement.append(f"Soil is well-balanced for {region} agriculture")
 
         total_nutrients = N + P + K
         if total_nutrients < 150:
-            fertilizer_needs = "High - Kerala crops need balanced NPK fertilizer"
+            fertilizer_needs = f"High - {region} crops need balanced NPK fertilizer"
         elif total_nutrients < 250:
-            fertilizer_needs = "Moderate - Light feeding beneficial for Kerala crops"
+            fertilizer_needs = f"Moderate - Light feeding beneficial for {region} crops"
         else:
-            fertilizer_needs = "Low - Soil is naturally fertile for Kerala agriculture"
+            fertilizer_needs = f"Low - Soil is naturally fertile for {region} agriculture"
 
         if rainfall > 2000:
-            irrigation_advice = "Natural rainfall sufficient for most Kerala crops"
+            irrigation_advice = f"Natural rainfall sufficient for most {region} crops"
         elif rainfall > 1000:
             irrigation_advice = "Supplemental irrigation needed during dry months"
         else:
-            irrigation_advice = "Regular irrigation essential for Kerala crops"
+            irrigation_advice = f"Regular irrigation essential for {region} crops"
 
+        seasons = self.advice["seasonal_tips"]
         if temperature > 28:
-            seasonal_tips = "Hot season - Plant heat-loving Kerala crops like coconut, rubber"
+            seasonal_tips = seasons["hot"]
         elif temperature > 22:
-            seasonal_tips = "Warm season - Most Kerala crops will thrive"
+            seasonal_tips = seasons["warm"]
         else:
-            seasonal_tips = "Cool season - Plant cool-tolerant Kerala crops"
-
-        kerala_soil_advice = {
-            "Loamy": "Excellent for rice, coconut, and most Kerala crops",
-            "Mixed": "Versatile for Kerala agriculture - suitable for most crops",
-            "Silty": "Good for rubber, pepper, and moisture-loving Kerala crops",
-        }
+            seasonal_tips = seasons["cool"]
 
         return {
             "soil_improvement": soil_improvement,
             "fertilizer_needs": fertilizer_needs,
             "irrigation_advice": irrigation_advice,
             "seasonal_tips": seasonal_tips,
-            "soil_type_advice": kerala_soil_advice.get(soil_type, "General Kerala soil management"),
-            "kerala_specific_tips": [
-                "Consider coconut as primary crop if conditions are suitable",
-                "Rubber plantation recommended for high rainfall areas",
-                "Pepper cultivation ideal for Kerala's climate",
-                "Rice cultivation suitable for high rainfall regions",
-            ],
-            "maintenance_schedule": "Test soil every 6 months for optimal Kerala crop yields",
+            "soil_type_advice": self.advice["soil_type_advice"].get(soil_type, f"General {region} soil management"),
+            "kerala_specific_tips": list(self.advice["tips"]),
+            "maintenance_schedule": f"Test soil every 6 months for optimal {region} crop yields",
         }
 
     # --- Public analysis APIs --------------------------------------------------
@@ -218,7 +304,7 @@ class KeralaAI:
         crop_name = payload["crop_name"]
         user_input = {k: payload[k] for k in ("N", "P", "K", "ph", "temperature", "humidity", "rainfall")}
 
-        all_scores = calculate_all_suitabilities(user_input)
+        all_scores = calculate_all_suitabilities(user_input, self.crop_table)
         target = next(
             (entry for entry in all_scores if entry["crop"].lower() == crop_name.lower()),
             None,
@@ -255,19 +341,36 @@ class KeralaAI:
             "shopping_links": shopping,
         }
 
+    def optimize_amendments(
+        self,
+        payload: Dict[str, Any],
+        crop_name: Optional[str] = None,
+        target_score: float = GOOD_SCORE,
+        costs: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, Any]:
+        """Cheapest N/P/K/lime/sulfur change lifting each crop (or ``crop_name``) to ``target_score``"""
+        crops = None
+        if crop_name:
+            lookup = {name.lower(): name for name in self.crop_table}
+            if crop_name.lower() not in lookup:
+                raise ValueError(f"Crop '{crop_name}' not found in database")
+            crops = [lookup[crop_name.lower()]]
+        user_input = {name: float(payload[name]) for name in FEATURE_BOUNDS}
+        results = optimize_amendments(
+            user_input, self.hybrid_engine.rules(), self.crop_table, crops,
+            target_score=target_score, costs=costs, bounds=FEATURE_BOUNDS,
+        )
+        return {
+            "target_score": target_score,
+            "costs": {**DEFAULT_COSTS, **(costs or {})},
+            "results": results,
+        }
+
     def predict_soil(self, payload: Dict[str, float]) -> Dict[str, Any]:
         soil_type, confidence, _ = self._soil_prediction_components(payload)
-        kerala_advice = {
-            "best_crops": {
-                "Loamy": ["rice", "coconut", "mango", "banana"],
-                "Mixed": ["coffee", "tea", "sugarcane", "potato"],
-                "Silty": ["rubber", "pepper", "cardamom", "jackfruit"],
-            },
-            "seasonal_planting": "Plant during Kerala monsoon season for best results",
-            "soil_management": "Use Kerala-specific organic farming practices",
-        }
+        kerala_advice = copy.deepcopy(self.advice["soil_advice"])
 
-        message = f"Kerala soil analysis: {soil_type} soil type with {confidence:.1%} confidence"
+        message = f"{self.region.name} soil analysis: {soil_type} soil type with {confidence:.1%} confidence"
         return {
             "soil_type": soil_type,
             "confidence": round(confidence, 3),
@@ -278,6 +381,17 @@ class KeralaAI:
 
     def recommend_crops(self, payload: Dict[str, float]) -> Dict[str, Any]:
         recommendations = self.hybrid_engine.get_hybrid_recommendations(payload, top_n=5)
+        return self._crop_recommendation(payload, recommendations)
+
+    def recommend_crops_with_breakdown(
+        self, payload: Dict[str, float], top_n: int = 8
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """recommend_crops result plus the hybrid breakdown, from one scoring pass"""
+        # The API result takes the first three alternatives, so score at least that many
+        breakdown = self.hybrid_engine.get_hybrid_recommendations(payload, top_n=max(top_n, 4))
+        return self._crop_recommendation(payload, breakdown), breakdown
+
+    def _crop_recommendation(self, payload: Dict[str, float], recommendations: Dict[str, Any]) -> Dict[str, Any]:
         primary = recommendations.get("primary_recommendation")
         if not primary or primary.get("score", 0) == 0:
             raise ValueError("No suitable crops found for these conditions")
@@ -287,7 +401,7 @@ class KeralaAI:
 
         soil_analysis = self.get_kerala_soil_analysis(payload)
         farming_advice = self.get_kerala_farming_recommendations("Mixed", payload)
-        message = f"Kerala crop recommendation: {primary['crop']} with {primary['score']:.1f}% suitability"
+        message = f"{self.region.name} crop recommendation: {primary['crop']} with {primary['score']:.1f}% suitability"
 
         return {
             "recommended_crop": str(primary["crop"]),
@@ -301,7 +415,7 @@ class KeralaAI:
     def analyze_unified(self, payload: Dict[str, float]) -> Dict[str, Any]:
         soil_type, soil_confidence, soil_analysis = self._soil_prediction_components(payload)
 
-        recs = get_top_recommendations(payload, top_n=5)
+        recs = get_top_recommendations(payload, top_n=5, crop_table=self.crop_table)
         primary = recs.get("primary_recommendation")
         if not primary or primary.get("score", 0) == 0:
             raise ValueError("No suitable crops found for these conditions")
@@ -317,7 +431,7 @@ class KeralaAI:
         overall_confidence = min(0.95, overall_confidence)
 
         message = (
-            f"Kerala analysis complete! Soil: {soil_type}, "
+            f"{self.region.name} analysis complete! Soil: {soil_type}, "
             f"Recommended crop: {primary['crop']} with {overall_confidence:.1%} confidence"
         )
 
@@ -340,7 +454,7 @@ class KeralaAI:
                 "confidence": round(crop_confidence, 3),
                 "alternative_crops": [str(name) for name in alternative_crops],
                 "kerala_crop_advice": (
-                    f"Best suited for Kerala: {primary['crop']} with alternatives: "
+                    f"Best suited for {self.region.name}: {primary['crop']} with alternatives: "
                     f"{', '.join([str(name) for name in alternative_crops[:2]])}"
                 ),
             },
@@ -349,6 +463,256 @@ class KeralaAI:
             "message": message,
         }
 
+    def recommend_varieties(
+        self,
+        payload: Dict[str, float],
+        top_n: int = 5,
+        category: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Rank varieties from the crop requirements file, optionally filtered by category
+
+        ``region`` defaults to this engine's region.
+        """
+        region = region or self.region.key
+        store = get_crop_store()
+        result = store.query(payload, top_n=top_n, category=category, region=region)
+        if not result["total_varieties"]:
+            raise ValueError(f"No varieties match category={category!r} region={region!r}")
+        result["filters"] = {"category": category, "region": region}
+        return result
+
+    @staticmethod
+    def variety_catalog() -> Dict[str, Any]:
+        store = get_crop_store()
+        return {"varieties": store.size, "categories": store.categories(), "regions": store.regions()}
+
+    def plan_rotation(
+        self,
+        payload: Dict[str, float],
+        seasons: List[Dict[str, Any]],
+        top_n: int = 3,
+        beam_width: int = BEAM_WIDTH,
+        varieties: bool = False,
+        category: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Best crop sequences over ``seasons`` from the starting soil in ``payload``
+
+        Plans over this region's crops, or with ``varieties`` over its rows
+        of the crop requirements file; ``category`` filters either by the
+        file's categories.
+        """
+        crops = families = legumes = None
+        if varieties or category:
+            store = get_crop_store()
+            rows = store.select(category=category, region=self.region.key)
+            if not len(rows):
+                raise ValueError(f"No crops match category={category!r} region={self.region.key!r}")
+        if varieties:
+            crop_table = {str(store.variety[row]): store.requirements(row) for row in rows}
+            families = {str(store.variety[row]): str(store.crop[row]) for row in rows}
+            legumes = [
+                str(store.variety[row]) for row in rows
+                if store.category[row] == "pulse" or "legume" in str(store.description[row]).lower()
+            ]
+            compiled = compile_rules(crop_table)
+        else:
+            crop_table = self.crop_table
+            compiled = self.hybrid_engine.rules()
+            if category:
+                listed = {str(store.crop[row]) for row in rows}
+                crops = [name for name in compiled.crops if name in listed]
+                if not crops:
+                    raise ValueError(f"No {self.region.name} crops in category {category!r}")
+
+        plans = plan_rotation(
+            payload, seasons, compiled, crop_table, crops, families, legumes,
+            top_n=top_n, beam_width=beam_width, bounds=FEATURE_BOUNDS,
+        )
+        return {
+            "region": self.region.key,
+            "candidates": len(compiled.crops) if crops is None else len(crops),
+            "seasons": len(seasons),
+            "plans": plans,
+        }
+
+    def seasonal_suitability(
+        self,
+        payload: Dict[str, float],
+        climate: Dict[str, List[float]],
+        crops: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Best sowing months per crop (or per name in ``crops``) from a monthly or daily climate year"""
+        if crops:
+            lookup = {name.lower(): name for name in self.crop_table}
+            missing = [name for name in crops if name.lower() not in lookup]
+            if missing:
+                raise ValueError(f"Crop '{missing[0]}' not found in database")
+            crops = [lookup[name.lower()] for name in crops]
+        result = seasonal_suitability(payload, climate, self.hybrid_engine.rules(), crops)
+        result["region"] = self.region.key
+        return result
+
+    # --- Batch scoring -------------------------------------------------------
+    def score_batch(self, features: Dict[str, np.ndarray], alternatives: int = 3) -> Dict[str, np.ndarray]:
+        """predict_soil + recommend_crops for arrays of inputs in one vectorized pass
+
+        Unsuitable rows (no crop scores above zero, where recommend_crops
+        would raise) get an empty recommended_crop.
+        """
+        soil: SoilArtifacts = self._soil
+        columns = ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"]
+        X = np.column_stack([np.asarray(features[column], dtype=float) for column in columns])
+
+        proba = soil.classifier.predict_proba(soil.scaler.transform(X))
+        soil_types = soil.encoder.inverse_transform(soil.classifier.classes_[np.argmax(proba, axis=1)])
+        max_proba = proba.max(axis=1)
+        soil_confidence = np.where(max_proba > 0.5, np.minimum(0.95, max_proba * 1.2), np.minimum(0.85, max_proba * 1.1))
+
+        ranked = self.hybrid_engine.get_hybrid_recommendations_batch(features, top_n=alternatives + 1)
+        crops = np.asarray(ranked["crops"], dtype=object)
+        names, scores = crops[ranked["ranked"]], ranked["scores"]
+        suitable = scores[:, 0] > 0
+        alternative_names = [
+            ", ".join(name for name, score in zip(row_names[1:], row_scores[1:]) if score > 0)
+            for row_names, row_scores in zip(names, scores)
+        ]
+        # Python's round, not np.round, so values match the single-row responses exactly
+        _round3 = np.frompyfunc(lambda value: round(value, 3), 1, 1)
+        return {
+            "soil_type": soil_types.astype(str),
+            "soil_confidence": _round3(soil_confidence).astype(float),
+            "recommended_crop": np.where(suitable, names[:, 0], ""),
+            "crop_confidence": _round3(scores[:, 0] / 100.0).astype(float),
+            "alternative_crops": np.asarray(alternative_names, dtype=object),
+            "suitable": suitable,
+        }
+
+    def recommend_with_uncertainty(
+        self,
+        payload: Dict[str, float],
+        errors: Optional[Dict[str, float]] = None,
+        samples: int = 2000,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Crop and soil predictions under measurement error, by Monte Carlo
+
+        Each reading is perturbed with Gaussian noise of the given standard
+        deviation (MEASUREMENT_ERRORS by default), clipped to FEATURE_BOUNDS,
+        and every sample is scored in one batch through the soil classifier
+        and the hybrid crop engine. Returns per-crop hybrid score bands and
+        the probability of each crop being the recommendation or scoring
+        above ``suitable_score`` (SUITABLE_SCORE). Soil type
+        probabilities use at most SOIL_UNCERTAINTY_SAMPLES of the samples.
+        """
+        errors = {**MEASUREMENT_ERRORS, **(errors or {})}
+        rng = np.random.default_rng(seed)
+        features = {}
+        for name, (low, high) in FEATURE_BOUNDS.items():
+            value, sd = float(payload[name]), float(errors.get(name) or 0.0)
+            features[name] = np.clip(rng.normal(value, sd, samples), low, high) if sd > 0 else np.full(samples, value)
+
+        engine = self.hybrid_engine
+        crops, rule, hybrid = engine.get_hybrid_scores_batch(features)
+        ranked, top_scores = engine.rank_hybrid(rule, hybrid, top_n=1)
+        point = engine.get_hybrid_scores_batch({name: np.array([float(payload[name])]) for name in FEATURE_BOUNDS})[2][0] * 100
+        scores = hybrid * 100
+        suitable = top_scores[:, 0] > 0
+        top_share = np.bincount(ranked[suitable, 0], minlength=len(crops)) / samples
+        bands = np.percentile(scores, UNCERTAINTY_PERCENTILES, axis=0)
+        means, stds = scores.mean(axis=0), scores.std(axis=0)
+        good_share = (scores > SUITABLE_SCORE).mean(axis=0)
+
+        soil: SoilArtifacts = self._soil
+        soil_samples = min(samples, SOIL_UNCERTAINTY_SAMPLES)
+        X = np.column_stack([
+            features[column][:soil_samples] for column in ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"]
+        ])
+        proba = soil.classifier.predict_proba(soil.scaler.transform(X))
+        soil_labels = soil.encoder.inverse_transform(soil.classifier.classes_)
+        soil_share = np.bincount(np.argmax(proba, axis=1), minlength=len(soil_labels)) / soil_samples
+
+        results = [
+            {
+                "crop": crop,
+                "score": round(float(point[j]), 2),
+                "mean": round(float(means[j]), 2),
+                "std": round(float(stds[j]), 2),
+                "percentiles": {f"p{q}": round(float(bands[i, j]), 2) for i, q in enumerate(UNCERTAINTY_PERCENTILES)},
+                "top_probability": round(float(top_share[j]), 4),
+                "suitable_probability": round(float(good_share[j]), 4),
+            }
+            for j, crop in enumerate(crops)
+        ]
+        results.sort(key=lambda r: (-r["top_probability"], -r["mean"]))
+        return {
+            "samples": samples,
+            "soil_samples": soil_samples,
+            "errors": errors,
+            "suitable_score": SUITABLE_SCORE,
+            "crops": results,
+            "no_suitable_crop_probability": round(float(1 - suitable.mean()), 4),
+            "soil_type_probability": {
+                str(label): round(float(share), 4)
+                for label, share in sorted(zip(soil_labels, soil_share), key=lambda item: -item[1])
+            },
+        }
+
+    def suitability_grid(
+        self,
+        base: Dict[str, float],
+        x_feature: str,
+        x_values: Any,
+        y_feature: str,
+        y_values: Any,
+        crops: Optional[List[str]] = None,
+        include_hybrid: bool = False,
+    ) -> Dict[str, Any]:
+        """Suitability (0-100) of each crop over a grid of two features, the rest held at ``base``
+
+        Returns the crop names and arrays shaped (crops, len(y_values), len(x_values)):
+        "rule" always, "hybrid" when requested.
+        """
+        for feature in (x_feature, y_feature):
+            if feature not in FEATURE_BOUNDS:
+                raise ValueError(f"Unknown grid feature '{feature}'")
+        if x_feature == y_feature:
+            raise ValueError("Grid axes must use two different features")
+        missing = [name for name in FEATURE_BOUNDS if name not in (x_feature, y_feature) and base.get(name) is None]
+        if missing:
+            raise ValueError(f"Missing fixed soil values: {', '.join(missing)}")
+
+        if crops is None:
+            crop_names = list(self.crop_table)
+        else:
+            lookup = {name.lower(): name for name in self.crop_table}
+            unknown = [name for name in crops if name.lower() not in lookup]
+            if unknown:
+                raise ValueError(f"Crop '{unknown[0]}' not found in database")
+            crop_names = [lookup[name.lower()] for name in crops]
+
+        x_values = np.asarray(x_values, dtype=float)
+        y_values = np.asarray(y_values, dtype=float)
+        grid_x, grid_y = np.meshgrid(x_values, y_values)
+        features = {
+            name: np.full(grid_x.size, float(base[name]))
+            for name in FEATURE_BOUNDS if name not in (x_feature, y_feature)
+        }
+        features[x_feature] = grid_x.ravel()
+        features[y_feature] = grid_y.ravel()
+
+        shape = (len(crop_names), len(y_values), len(x_values))
+        result: Dict[str, Any] = {
+            "crops": crop_names,
+            "x_values": x_values,
+            "y_values": y_values,
+            "rule": self.hybrid_engine.rules().score(features, crop_names).T.reshape(shape),
+        }
+        if include_hybrid:
+            _, _, hybrid = self.hybrid_engine.get_hybrid_scores_batch(features, crop_names)
+            result["hybrid"] = (hybrid.T * 100).reshape(shape)
+        return result
+
     # --- Metadata / diagnostic helpers ----------------------------------------
     def get_model_info(self) -> Dict[str, Any]:
         engine_info = self.hybrid_engine.get_engine_info()
@@ -366,8 +730,10 @@ class KeralaAI:
         soil_types = _to_list(self.kerala_soil_info.get("soil_types"))
 
         return {
+            "region": self.region.key,
             "kerala_soil_classifier": {
                 "type": self.kerala_soil_info["model_type"],
+                "version": self.soil_model_version or "base",
                 "accuracy": self.kerala_soil_info["accuracy"],
                 "features": soil_features,
                 "soil_types": soil_types,
@@ -393,6 +759,7 @@ class KeralaAI:
     def health_snapshot(self) -> Dict[str, Any]:
         return {
             "status": "healthy",
+            "region": self.region.key,
             "models_loaded": {
                 "soil_classifier": self.kerala_soil_classifier is not None,
                 "soil_scaler": self.kerala_soil_scaler is not None,
@@ -432,6 +799,45 @@ class KeralaAI:
         return self.hybrid_engine.get_hybrid_recommendations(payload, top_n=top_n)
 
 
-# Shared instance for FastAPI
-kerala_ai = KeralaAI()
+_shared_instance: Optional[KeralaAI] = None
+_shared_lock = threading.Lock()
+_region_registry: Optional[RegionRegistry] = None
+
+
+def _default_instance() -> KeralaAI:
+    global _shared_instance
+    if _shared_instance is None:
+        with _shared_lock:
+            if _shared_instance is None:
+                _shared_instance = KeralaAI()
+    return _shared_instance
+
+
+def loaded_kerala_ai() -> Optional[KeralaAI]:
+    """The default instance if it has been built; never builds it"""
+    return _shared_instance
+
+
+def get_region_registry() -> RegionRegistry:
+    global _region_registry
+    if _region_registry is None:
+        with _shared_lock:
+            if _region_registry is None:
+                _region_registry = RegionRegistry(lambda profile: KeralaAI(region=profile), _default_instance)
+    return _region_registry
+
+
+def get_kerala_ai(region: Optional[str] = None) -> KeralaAI:
+    """Shared instance for ``region`` (default Kerala), built on first use"""
+    ai = get_region_registry().get(region)
+    ai.refresh_soil_models(background=True)
+    return ai
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from kerala_ai import kerala_ai` working without loading the
+    # models at import time
+    if name == "kerala_ai":
+        return get_kerala_ai()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
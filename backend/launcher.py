@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Production launcher for the AgroNova API
+
+Loads the FastAPI app, the soil models and the hybrid engine's regressors
+once in a parent process, freezes the garbage collector so refcount
+updates don't dirty the shared pages, and then forks worker processes
+that serve from a single listening socket. Workers share the model
+memory copy-on-write instead of each loading their own copy.
+
+    python -m backend.launcher --workers 4 --port 8000
+
+Signals sent to the parent:
+    SIGHUP   rolling restart, one worker at a time
+    SIGUSR1  log per-worker memory (RSS / PSS / private)
+    SIGTERM  graceful shutdown of all workers
+"""
+
+import argparse
+import gc
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+import uvicorn
+
+WORKER_READY_TIMEOUT_SECONDS = 60.0
+WORKER_STOP_TIMEOUT_SECONDS = 30.0
+
+
+def log(message: str) -> None:
+    print(f"[launcher {os.getpid()}] {message}", flush=True)
+
+
+def preload(app_path: str):
+    """Import the app and everything it loads eagerly, then freeze the heap"""
+    start = time.perf_counter()
+    module_name, _, attr = app_path.partition(":")
+    module = __import__(module_name, fromlist=[attr or "app"])
+    app = getattr(module, attr or "app")
+    # backend.main defers model loading to first use; force it here so the
+    # workers inherit loaded models rather than each loading their own
+    load_models = getattr(module, "get_kerala_ai", None)
+    if load_models is not None:
+        load_models()
+
+    # Everything allocated so far (models, rule tables, imported modules)
+    # moves to the permanent generation and is never traversed by the
+    # collector in the workers, so those pages stay shared after fork
+    gc.collect()
+    gc.freeze()
+    log(f"preloaded {app_path} in {time.perf_counter() - start:.2f}s "
+        f"({gc.get_freeze_count():,} objects frozen)")
+    return app
+
+
+def memory_usage(pid: int) -> Dict[str, Optional[int]]:
+    """RSS, PSS and private memory of a process in kB, from /proc"""
+    usage: Dict[str, Optional[int]] = {"rss": None, "pss": None, "private": None}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as fh:
+            fields = {}
+            for line in fh:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return usage
+    usage["rss"] = fields.get("Rss")
+    usage["pss"] = fields.get("Pss")
+    usage["private"] = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return usage
+
+
+class _NotifyingServer(uvicorn.Server):
+    """uvicorn server that tells the launcher once it accepts connections"""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int) -> None:
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            os.write(self.ready_fd, b"1")
+        os.close(self.ready_fd)
+
+
+class Launcher:
+    def __init__(self, app, sock: socket.socket, workers: int, uvicorn_kwargs: dict, rss_interval: float) -> None:
+        self.app = app
+        self.sock = sock
+        self.num_workers = workers
+        self.uvicorn_kwargs = uvicorn_kwargs
+        self.rss_interval = rss_interval
+        self.workers: Dict[int, int] = {}  # pid -> slot
+        self.stopping = False
+        self.pending_restart = False
+        self.pending_report = False
+
+    # --- Worker lifecycle -------------------------------------------------------
+    def spawn(self, slot: int) -> int:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # Worker
+            os.close(read_fd)
+            for sig in (signal.SIGHUP, signal.SIGUSR1, signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+                signal.signal(sig, signal.SIG_DFL)
+            config = uvicorn.Config(self.app, **self.uvicorn_kwargs)
+            server = _NotifyingServer(config, write_fd)
+            try:
+                server.run(sockets=[self.sock])
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        ready = self._wait_ready(read_fd)
+        os.close(read_fd)
+        self.workers[pid] = slot
+        log(f"worker {slot} started (pid {pid}{'' if ready else ', not ready'})")
+        return pid
+
+    @staticmethod
+    def _wait_ready(read_fd: int) -> bool:
+        deadline = time.monotonic() + WORKER_READY_TIMEOUT_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                readable, _, _ = select.select([read_fd], [], [], remaining)
+            except InterruptedError:
+                continue
+            if readable:
+                return os.read(read_fd, 1) == b"1"
+
+    def stop(self, pid: int) -> None:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            self.workers.pop(pid, None)
+            return
+        deadline = time.monotonic() + WORKER_STOP_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            time.sleep(0.1)
+        else:
+            log(f"worker pid {pid} did not exit in time; killing")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.workers.pop(pid, None)
+
+    def rolling_restart(self) -> None:
+        log("rolling restart")
+        for pid, slot in list(self.workers.items()):
+            if self.stopping:
+                return
+            # Bring the replacement up before retiring the old worker so
+            # capacity never drops by more than one process
+            self.spawn(slot)
+            self.stop(pid)
+        log("rolling restart complete")
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot = self.workers.pop(pid, None)
+            if slot is not None and not self.stopping:
+                log(f"worker {slot} (pid {pid}) exited with status {status}; respawning")
+                self.spawn(slot)
+
+    def report_memory(self) -> None:
+        parent = memory_usage(os.getpid())
+        log(f"parent rss={parent['rss']} kB pss={parent['pss']} kB")
+        for pid, slot in sorted(self.workers.items(), key=lambda item: item[1]):
+            usage = memory_usage(pid)
+            log(f"worker {slot} pid={pid} rss={usage['rss']} kB pss={usage['pss']} kB "
+                f"private={usage['private']} kB")
+
+    # --- Supervisor loop --------------------------------------------------------
+    def _on_signal(self, sig, frame) -> None:
+        if sig in (signal.SIGTERM, signal.SIGINT):
+            self.stopping = True
+        elif sig == signal.SIGHUP:
+            self.pending_restart = True
+        elif sig == signal.SIGUSR1:
+            self.pending_report = True
+
+    def run(self) -> None:
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(sig, self._on_signal)
+
+        for slot in range(self.num_workers):
+            self.spawn(slot)
+        self.report_memory()
+
+        next_report = time.monotonic() + self.rss_interval if self.rss_interval > 0 else None
+        while not self.stopping:
+            time.sleep(0.5)
+            self.reap()
+            if self.pending_restart:
+                self.pending_restart = False
+                self.rolling_restart()
+            if self.pending_report or (next_report and time.monotonic() >= next_report):
+                self.pending_report = False
+                self.report_memory()
+                if next_report:
+                    next_report = time.monotonic() + self.rss_interval
+
+        log("shutting down")
+        for pid in list(self.workers):
+            self.stop(pid)
+        self.sock.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Preload AgroNova models and fork uvicorn workers")
+    parser.add_argument("--app", default="backend.main:app", help="ASGI app to preload (module:attr)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--rss-interval", type=float, default=0.0,
+                        help="Seconds between per-worker memory reports (0 = only on SIGUSR1)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        print("The launcher needs os.fork(); use uvicorn directly on this platform", file=sys.stderr)
+        return 1
+
+    app = preload(args.app)
+
+    sock = socket.socket(socket.AF_INET6 if ":" in args.host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    log(f"listening on {args.host}:{args.port} with {args.workers} workers")
+
+    uvicorn_kwargs = {"log_level": args.log_level, "lifespan": "on"}
+    Launcher(app, sock, args.workers, uvicorn_kwargs, args.rss_interval).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
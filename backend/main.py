@@ -1,49 +1,85 @@
 # -*- coding: utf-8 -*-
-from fastapi import FastAPI, HTTPException
+import base64
+import os
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from fastapi import APIRouter, BackgroundTasks, Depends, FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional
 
-try:
-    from .kerala_ai import kerala_ai
-except ImportError:
-    from kerala_ai import kerala_ai
-
-app = FastAPI(
-    title="AgroNova Kerala AI API",
-    description="AI-powered soil classification and crop recommendation system for Kerala, India",
-    version="4.0.0"
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+import numpy as np
 
 # --- Database and Auth setup ---
 try:
-    from .db import Base, engine
     from .auth import router as auth_router
     from .products import router as products_router
     from .users import router as users_router
     from .orders import router as orders_router
+    from .feedback import router as feedback_router
+    from .passwords import shutdown_pool as shutdown_password_pool
+    from .auth import Principal, get_admin_principal
+    from .regions import available_regions, region_key
+    from .suitability_tiles import get_tile_store
 except ImportError:
     # Fallback for direct execution
-    from db import Base, engine
     from auth import router as auth_router
     from products import router as products_router
     from users import router as users_router
     from orders import router as orders_router
+    from feedback import router as feedback_router
+    from passwords import shutdown_pool as shutdown_password_pool
+    from auth import Principal, get_admin_principal
+    from regions import available_regions, region_key
+    from suitability_tiles import get_tile_store
+
+# Set AGRONOVA_PRELOAD_MODELS=0 to load models on the first AI request
+# instead of during startup
+PRELOAD_MODELS = os.getenv("AGRONOVA_PRELOAD_MODELS", "1") != "0"
+
+
+def get_kerala_ai(region: Optional[str] = None):
+    """Shared KeralaAI instance for a region; importing it pulls in sklearn and the models"""
+    try:
+        from .kerala_ai import get_kerala_ai as _get
+    except ImportError:
+        from kerala_ai import get_kerala_ai as _get
+    return _get(region)
+
+
+def loaded_kerala_ai():
+    """The default KeralaAI instance if it is already built; never imports or loads the models"""
+    module = sys.modules.get(f"{__package__}.kerala_ai" if __package__ else "kerala_ai")
+    return module.loaded_kerala_ai() if module is not None else None
+
+
+async def region_ai(
+    region: Optional[str] = Query(None, description="Region whose crops, advice and models to use (default kerala)"),
+):
+    """Dependency: the requested region's engine, loaded off the event loop on first use"""
+    if region is not None and region_key(region) not in available_regions():
+        raise HTTPException(status_code=404, detail=f"Unknown region '{region}'; available: {', '.join(available_regions())}")
+    return await run_in_threadpool(get_kerala_ai, region)
+
 
-Base.metadata.create_all(bind=engine)
-app.include_router(auth_router)
-app.include_router(products_router)
-app.include_router(users_router)
-app.include_router(orders_router)
+def shadow_evaluate(background_tasks: BackgroundTasks, ai, kind: str, payload: dict) -> None:
+    """Hand the input to the shadow evaluator once the response has been sent"""
+    if ai.shadow is not None:
+        background_tasks.add_task(ai.shadow.submit, kind, payload)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if PRELOAD_MODELS:
+        await run_in_threadpool(get_kerala_ai)
+    yield
+    shutdown_password_pool()
+
+
+router = APIRouter()
 
 # Pydantic models for Kerala conditions
 class KeralaSoilRequest(BaseModel):
@@ -119,58 +155,391 @@ class DesiredCropResponse(BaseModel):
     alternatives: List[str]
     shopping_links: List[str]
 
-@app.post("/analyze-desired-crop", response_model=DesiredCropResponse)
-async def analyze_desired_crop(request: DesiredCropRequest):
+class AmendmentCosts(BaseModel):
+    N: Optional[float] = Field(None, ge=0, description="Cost per ppm of nitrogen added")
+    P: Optional[float] = Field(None, ge=0, description="Cost per ppm of phosphorus added")
+    K: Optional[float] = Field(None, ge=0, description="Cost per ppm of potassium added")
+    lime: Optional[float] = Field(None, ge=0, description="Cost per pH unit raised")
+    sulfur: Optional[float] = Field(None, ge=0, description="Cost per pH unit lowered")
+
+class AmendmentRequest(BaseModel):
+    crop_name: Optional[str] = Field(None, description="Crop to optimise for; omit for every crop")
+    N: float = Field(..., ge=0, le=300)
+    P: float = Field(..., ge=0, le=300)
+    K: float = Field(..., ge=0, le=400)
+    ph: float = Field(..., ge=3.5, le=10.0)
+    temperature: float = Field(..., ge=8, le=55)
+    humidity: float = Field(..., ge=14, le=100)
+    rainfall: float = Field(..., ge=20, le=2000)
+    target_score: float = Field(80.0, ge=0, le=100, description="Rule score to reach; 80 is a 'Good' verdict")
+    costs: Optional[AmendmentCosts] = Field(None, description="Unit costs; defaults are rough INR per hectare")
+
+class VarietyRequest(BaseModel):
+    N: float = Field(..., ge=0, le=300, description="Nitrogen content (0-300 ppm)")
+    P: float = Field(..., ge=5, le=300, description="Phosphorus content (5-300 ppm)")
+    K: float = Field(..., ge=5, le=400, description="Potassium content (5-400 ppm)")
+    ph: float = Field(..., ge=3.5, le=10.0, description="Soil pH (3.5-10.0)")
+    temperature: float = Field(..., ge=8, le=55, description="Temperature in Celsius (8-55°C)")
+    humidity: float = Field(..., ge=14, le=100, description="Humidity percentage (14-100%)")
+    rainfall: float = Field(..., ge=20, le=2000, description="Rainfall in mm (20-2000mm)")
+    category: Optional[str] = Field(None, description="Only varieties in this category, e.g. pulse")
+    region: Optional[str] = Field(None, description="Only varieties listed for this region (default: the request's region)")
+    top_n: int = Field(5, ge=1, le=50)
+
+class MeasurementErrors(BaseModel):
+    N: Optional[float] = Field(None, ge=0, description="Standard deviation of the N reading (ppm)")
+    P: Optional[float] = Field(None, ge=0, description="Standard deviation of the P reading (ppm)")
+    K: Optional[float] = Field(None, ge=0, description="Standard deviation of the K reading (ppm)")
+    ph: Optional[float] = Field(None, ge=0, description="Standard deviation of the pH reading")
+    temperature: Optional[float] = Field(None, ge=0)
+    humidity: Optional[float] = Field(None, ge=0)
+    rainfall: Optional[float] = Field(None, ge=0)
+
+class UncertaintyRequest(BaseModel):
+    N: float = Field(..., ge=0, le=300, description="Nitrogen content (0-300 ppm)")
+    P: float = Field(..., ge=5, le=300, description="Phosphorus content (5-300 ppm)")
+    K: float = Field(..., ge=5, le=400, description="Potassium content (5-400 ppm)")
+    ph: float = Field(..., ge=3.5, le=10.0, description="Soil pH (3.5-10.0)")
+    temperature: float = Field(..., ge=8, le=55, description="Temperature in Celsius (8-55°C)")
+    humidity: float = Field(..., ge=14, le=100, description="Humidity percentage (14-100%)")
+    rainfall: float = Field(..., ge=20, le=2000, description="Rainfall in mm (20-2000mm)")
+    errors: Optional[MeasurementErrors] = Field(None, description="Per-reading standard deviations; defaults suit a field test kit")
+    samples: int = Field(2000, ge=100, le=20000)
+    seed: Optional[int] = Field(None, description="Fix for reproducible bands")
+
+class RotationSeason(BaseModel):
+    name: Optional[str] = Field(None, description="Label, e.g. Kharif")
+    temperature: float = Field(..., ge=8, le=55, description="Temperature in Celsius (8-55°C)")
+    humidity: float = Field(..., ge=14, le=100, description="Humidity percentage (14-100%)")
+    rainfall: float = Field(..., ge=20, le=2000, description="Rainfall in mm (20-2000mm)")
+
+class RotationRequest(BaseModel):
+    N: float = Field(..., ge=0, le=300, description="Starting nitrogen content (0-300 ppm)")
+    P: float = Field(..., ge=0, le=300, description="Starting phosphorus content (0-300 ppm)")
+    K: float = Field(..., ge=0, le=400, description="Starting potassium content (0-400 ppm)")
+    ph: float = Field(..., ge=3.5, le=10.0, description="Soil pH (3.5-10.0)")
+    seasons: List[RotationSeason] = Field(..., min_length=1, max_length=12)
+    varieties: bool = Field(False, description="Plan over the region's varieties instead of its crops")
+    category: Optional[str] = Field(None, description="Only crops in this category, e.g. pulse")
+    top_n: int = Field(3, ge=1, le=20)
+    beam_width: int = Field(64, ge=1, le=1024, description="Partial rotations kept per season")
+
+class ClimateSeries(BaseModel):
+    temperature: List[float] = Field(..., min_length=12, max_length=366, description="Celsius, January first")
+    humidity: List[float] = Field(..., min_length=12, max_length=366, description="Relative humidity (%)")
+    rainfall: List[float] = Field(..., min_length=12, max_length=366, description="mm per month or per day")
+
+class SeasonalRequest(BaseModel):
+    N: float = Field(..., ge=0, le=300, description="Nitrogen content (0-300 ppm)")
+    P: float = Field(..., ge=0, le=300, description="Phosphorus content (0-300 ppm)")
+    K: float = Field(..., ge=0, le=400, description="Potassium content (0-400 ppm)")
+    ph: float = Field(..., ge=3.5, le=10.0, description="Soil pH (3.5-10.0)")
+    climate: ClimateSeries = Field(..., description="12 monthly or 365/366 daily values per series")
+    crops: Optional[List[str]] = Field(None, description="Crops to evaluate; omit for every crop")
+
+GridFeature = Literal["N", "P", "K", "ph", "temperature", "humidity", "rainfall"]
+
+class GridAxis(BaseModel):
+    feature: GridFeature
+    min: Optional[float] = Field(None, description="Defaults to the lowest value the API accepts")
+    max: Optional[float] = Field(None, description="Defaults to the highest value the API accepts")
+    steps: int = Field(50, ge=2, le=400)
+
+class SuitabilityGridRequest(BaseModel):
+    crop: Optional[str] = Field(None, description="Crop to map; omit for every crop")
+    N: Optional[float] = Field(None, ge=0, le=300)
+    P: Optional[float] = Field(None, ge=0, le=300)
+    K: Optional[float] = Field(None, ge=0, le=400)
+    ph: Optional[float] = Field(None, ge=3.5, le=10.0)
+    temperature: Optional[float] = Field(None, ge=8, le=55)
+    humidity: Optional[float] = Field(None, ge=14, le=100)
+    rainfall: Optional[float] = Field(None, ge=20, le=2000)
+    x: GridAxis
+    y: GridAxis
+    include_hybrid: bool = False
+    encoding: Literal["base64", "list"] = Field(
+        "base64", description="base64: little-endian integers, multiply by scale; list: nested JSON arrays"
+    )
+
+def _encode_grid(values: np.ndarray, dtype: str, scale: float, encoding: str) -> dict:
+    """Scores as base64 fixed-point integers, far smaller and faster to parse than nested JSON lists"""
+    if encoding == "list":
+        return {"values": np.round(values, 2).tolist()}
+    quantized = np.round(values / scale).astype(dtype)
+    return {"dtype": dtype, "scale": scale, "data": base64.b64encode(quantized.tobytes()).decode("ascii")}
+
+def _tile_store(region: Optional[str]):
+    if region is not None and region_key(region) not in available_regions():
+        raise HTTPException(status_code=404, detail=f"Unknown region '{region}'; available: {', '.join(available_regions())}")
+    try:
+        return get_tile_store(region)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No suitability tiles for region '{region or 'kerala'}'; build them with backend/suitability_tiles.py",
+        )
+
+@router.post("/analyze-desired-crop", response_model=DesiredCropResponse)
+async def analyze_desired_crop(request: DesiredCropRequest, ai=Depends(region_ai)):
     """Analyze suitability of a specific desired crop using rule-based engine"""
     try:
-        result = kerala_ai.analyze_desired_crop(request.model_dump())
+        result = ai.analyze_desired_crop(request.model_dump())
         return DesiredCropResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Desired crop analysis failed: {str(e)}")
 
-@app.post("/predict-kerala-soil", response_model=KeralaSoilResponse)
-async def predict_kerala_soil(request: KeralaSoilRequest):
+@router.post("/optimize-amendments")
+async def optimize_amendments(request: AmendmentRequest, ai=Depends(region_ai)):
+    """Cheapest fertilizer/lime/sulfur amendment bringing crops up to a target suitability, climate held fixed"""
+    costs = request.costs.model_dump(exclude_none=True) if request.costs else None
+    try:
+        return await run_in_threadpool(
+            ai.optimize_amendments, request.model_dump(), request.crop_name, request.target_score, costs,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Amendment optimization failed: {str(e)}")
+
+@router.post("/predict-kerala-soil", response_model=KeralaSoilResponse)
+async def predict_kerala_soil(request: KeralaSoilRequest, background_tasks: BackgroundTasks, ai=Depends(region_ai)):
     """Predict soil type for Kerala conditions"""
     try:
-        result = kerala_ai.predict_soil(request.model_dump())
+        payload = request.model_dump()
+        result = ai.predict_soil(payload)
+        shadow_evaluate(background_tasks, ai, "soil", payload)
         return KeralaSoilResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Kerala soil prediction failed: {str(e)}")
 
-@app.post("/recommend-kerala-crop", response_model=KeralaCropResponse)
-async def recommend_kerala_crop(request: KeralaCropRequest):
+@router.post("/recommend-kerala-crop", response_model=KeralaCropResponse)
+async def recommend_kerala_crop(request: KeralaCropRequest, background_tasks: BackgroundTasks, ai=Depends(region_ai)):
     """Recommend crops for Kerala conditions using hybrid engine"""
     try:
-        result = kerala_ai.recommend_crops(request.model_dump())
+        payload = request.model_dump()
+        result = ai.recommend_crops(payload)
+        shadow_evaluate(background_tasks, ai, "crop", payload)
         return KeralaCropResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Kerala crop recommendation failed: {str(e)}")
 
-@app.post("/analyze-kerala-soil-and-recommend", response_model=KeralaUnifiedResponse)
-async def analyze_kerala_soil_and_recommend(request: KeralaUnifiedRequest):
+@router.post("/analyze-kerala-soil-and-recommend", response_model=KeralaUnifiedResponse)
+async def analyze_kerala_soil_and_recommend(request: KeralaUnifiedRequest, background_tasks: BackgroundTasks, ai=Depends(region_ai)):
     """Unified Kerala analysis: Soil classification and crop recommendation using rule-based engine"""
     try:
-        result = kerala_ai.analyze_unified(request.model_dump())
+        payload = request.model_dump()
+        result = ai.analyze_unified(payload)
+        shadow_evaluate(background_tasks, ai, "soil", payload)
+        shadow_evaluate(background_tasks, ai, "crop", payload)
         return KeralaUnifiedResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Kerala unified analysis failed: {str(e)}")
 
-@app.get("/")
+@router.post("/recommend-varieties")
+async def recommend_varieties(request: VarietyRequest, ai=Depends(region_ai)):
+    """Top varieties from the crop requirements file; fatally unsuited ones are pruned before scoring"""
+    try:
+        payload = request.model_dump(exclude={"category", "region", "top_n"})
+        return ai.recommend_varieties(payload, request.top_n, request.category, request.region)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Variety recommendation failed: {str(e)}")
+
+def _variety_catalog() -> dict:
+    # A static method: needs the module's import path setup, not the models
+    try:
+        from .kerala_ai import KeralaAI
+    except ImportError:
+        from kerala_ai import KeralaAI
+    return KeralaAI.variety_catalog()
+
+@router.get("/crop-varieties")
+async def crop_varieties():
+    """Variety counts per category and region in the crop requirements file"""
+    return await run_in_threadpool(_variety_catalog)
+
+@router.post("/crop-uncertainty")
+async def crop_uncertainty(request: UncertaintyRequest, ai=Depends(region_ai)):
+    """Hybrid score bands and recommendation probabilities under soil test measurement error"""
+    errors = request.errors.model_dump(exclude_none=True) if request.errors else None
+    try:
+        return await run_in_threadpool(
+            ai.recommend_with_uncertainty,
+            request.model_dump(exclude={"errors", "samples", "seed"}),
+            errors, request.samples, request.seed,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Uncertainty estimate failed: {str(e)}")
+
+@router.post("/plan-rotation")
+async def plan_rotation(request: RotationRequest, ai=Depends(region_ai)):
+    """Best multi-season crop sequences, carrying N/P/K depletion and legume fixation between seasons"""
+    try:
+        return await run_in_threadpool(
+            ai.plan_rotation,
+            request.model_dump(include={"N", "P", "K", "ph"}),
+            [season.model_dump() for season in request.seasons],
+            request.top_n, request.beam_width, request.varieties, request.category,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Rotation planning failed: {str(e)}")
+
+@router.post("/seasonal-suitability")
+async def seasonal_suitability(request: SeasonalRequest, ai=Depends(region_ai)):
+    """Best sowing months per crop from a year of monthly or daily climate"""
+    try:
+        return await run_in_threadpool(
+            ai.seasonal_suitability,
+            request.model_dump(include={"N", "P", "K", "ph"}), request.climate.model_dump(), request.crops,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Seasonal suitability failed: {str(e)}")
+
+@router.post("/suitability-grid")
+async def suitability_grid(request: SuitabilityGridRequest, ai=Depends(region_ai)):
+    """Crop suitability over a grid of two features for a fixed soil profile, in one vectorized pass"""
+    try:
+        from .kerala_ai import FEATURE_BOUNDS
+    except ImportError:
+        from kerala_ai import FEATURE_BOUNDS
+
+    axes = []
+    for axis in (request.x, request.y):
+        low, high = FEATURE_BOUNDS[axis.feature]
+        low = low if axis.min is None else axis.min
+        high = high if axis.max is None else axis.max
+        if low >= high:
+            raise HTTPException(status_code=400, detail=f"Grid range for {axis.feature} is empty")
+        axes.append(np.linspace(low, high, axis.steps))
+
+    try:
+        grid = await run_in_threadpool(
+            ai.suitability_grid,
+            request.model_dump(include=set(FEATURE_BOUNDS)),
+            request.x.feature, axes[0],
+            request.y.feature, axes[1],
+            [request.crop] if request.crop else None,
+            request.include_hybrid,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Suitability grid failed: {str(e)}")
+
+    response = {
+        "crops": grid["crops"],
+        "x": {"feature": request.x.feature, "values": grid["x_values"].tolist()},
+        "y": {"feature": request.y.feature, "values": grid["y_values"].tolist()},
+        "shape": list(grid["rule"].shape),
+        "rule": _encode_grid(grid["rule"], "uint8", 1, request.encoding),
+    }
+    if "hybrid" in grid:
+        response["hybrid"] = _encode_grid(grid["hybrid"], "<u2", 0.01, request.encoding)
+    return response
+
+@router.get("/tiles")
+async def tile_index(region: Optional[str] = Query(None, description="Region whose tiles to describe (default kerala)")):
+    """Layers, raster shape, tile grid and districts of the precomputed suitability tiles"""
+    return _tile_store(region).summary()
+
+@router.get("/tiles/{layer}/{row}/{col}")
+async def suitability_tile(
+    layer: str,
+    row: int,
+    col: int,
+    region: Optional[str] = Query(None, description="Region whose tiles to serve (default kerala)"),
+    encoding: Literal["base64", "list"] = "base64",
+):
+    """One precomputed tile of a crop's scores (0-100) or of the best_crop layer; nodata cells hold 255"""
+    store = _tile_store(region)
+    try:
+        tile = store.tile(layer, row, col)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No tile layer '{layer}'")
+    except IndexError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {
+        "layer": layer,
+        "row": row,
+        "col": col,
+        "origin": [row * store.tile_size, col * store.tile_size],
+        "shape": list(tile.shape),
+        "nodata": store.manifest["nodata"],
+        "values": _encode_grid(tile, "uint8", 1, encoding),
+    }
+
+@router.get("/districts/{district}/suitability")
+async def district_suitability(
+    district: str,
+    region: Optional[str] = Query(None, description="Region whose tiles to use (default kerala)"),
+):
+    """Per-crop mean score and suitable share over a district, from the precomputed tile totals"""
+    store = _tile_store(region)
+    try:
+        return store.district_summary(district)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown district '{district}'; available: {', '.join(sorted(store.district_names.values()))}")
+
+@router.get("/")
 async def root():
     """Root endpoint with Kerala API information"""
-    return kerala_ai.root_payload()
+    ai = await run_in_threadpool(get_kerala_ai)
+    return ai.root_payload()
 
-@app.get("/kerala-model-info")
-async def kerala_model_info():
+@router.get("/kerala-model-info")
+async def kerala_model_info(ai=Depends(region_ai)):
     """Get detailed information about Kerala models"""
-    return kerala_ai.get_model_info()
+    return ai.get_model_info()
 
-@app.get("/health")
+@router.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return kerala_ai.health_snapshot()
+    """Health check endpoint; reports the models without loading them"""
+    ai = loaded_kerala_ai()
+    if ai is None:
+        return {"status": "healthy", "models_loaded": False, "timestamp": datetime.now().isoformat()}
+    return ai.health_snapshot()
+
+@router.get("/regions")
+async def regions():
+    """Regions that can be requested, and which are loaded in this worker"""
+    try:
+        from .kerala_ai import get_region_registry
+    except ImportError:
+        from kerala_ai import get_region_registry
+    return get_region_registry().status()
+
+@router.get("/admin/shadow-evaluation")
+async def shadow_evaluation_summary(principal: Principal = Depends(get_admin_principal)):
+    """Agreement, drift and latency of the candidate models (admin only)"""
+    ai = await run_in_threadpool(get_kerala_ai)
+    if ai.shadow is None:
+        return {"enabled_kinds": [], "kinds": {}}
+    return await run_in_threadpool(ai.shadow.summary)
+
+
+def create_app() -> FastAPI:
+    """Build the API. Schema creation is a separate step: `python -m backend.db`"""
+    app = FastAPI(
+        title="AgroNova Kerala AI API",
+        description="AI-powered soil classification and crop recommendation system for Kerala, India",
+        version="4.0.0",
+        lifespan=lifespan,
+    )
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.include_router(auth_router)
+    app.include_router(products_router)
+    app.include_router(users_router)
+    app.include_router(orders_router)
+    app.include_router(feedback_router)
+    app.include_router(router)
+    return app
+
 
-# Admin endpoints removed
+app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,268 @@
+"""
+Single-file soil model bundle
+
+Stores the soil classifier, scaler, label names and metadata as raw numpy
+arrays in one file so serving doesn't unpickle sklearn object graphs:
+
+    header    magic, format version, manifest length, data offset
+    manifest  JSON: model version, metadata, array table, SHA-256 of data
+              and of the joblib files the bundle was built from
+    data      64-byte aligned raw arrays, memory-mapped on load
+
+The forest is flattened into node arrays (children, feature, threshold,
+leaf class probabilities) and evaluated level by level across all trees
+at once, matching RandomForestClassifier.predict_proba.
+
+    python -m backend.model_bundle ml_model/models    # bundle the flat artifacts
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+MAGIC = b"AGNBNDL\0"
+FORMAT_VERSION = 1
+BUNDLE_FILE = "unified_soil_bundle.agnb"
+_HEADER = struct.Struct("<8sIIQQ")  # magic, format version, reserved, manifest length, data offset
+_ALIGN = 64
+_PREDICT_BLOCK_ROWS = 4096
+
+
+class BundleError(RuntimeError):
+    """The bundle is corrupt, from an unknown format or from the wrong model version"""
+
+
+# --- Serving-side objects -----------------------------------------------------------
+class BundledForest:
+    """predict / predict_proba over flattened tree arrays"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]) -> None:
+        self.roots = arrays["forest_roots"]
+        self.left = arrays["forest_left"]
+        self.right = arrays["forest_right"]
+        self.feature = arrays["forest_feature"]
+        self.threshold = arrays["forest_threshold"]
+        self.value = arrays["forest_value"]
+        self.classes_ = arrays["forest_classes"]
+        self.n_estimators = len(self.roots)
+        self.n_features_in_ = int(arrays["scaler_mean"].shape[0])
+
+    def predict_proba(self, X) -> np.ndarray:
+        # sklearn trees compare float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.shape[0] <= _PREDICT_BLOCK_ROWS:
+            return self._predict_proba_block(X)
+        # Blocks bound the (rows x trees x classes) leaf gather for bulk scoring
+        return np.vstack([
+            self._predict_proba_block(X[start:start + _PREDICT_BLOCK_ROWS])
+            for start in range(0, X.shape[0], _PREDICT_BLOCK_ROWS)
+        ])
+
+    def _predict_proba_block(self, X: np.ndarray) -> np.ndarray:
+        n_rows = X.shape[0]
+        nodes = np.broadcast_to(self.roots, (n_rows, self.n_estimators)).ravel().copy()
+        rows = np.repeat(np.arange(n_rows), self.n_estimators)
+        # Only (row, tree) pairs still at an internal node move down a level
+        active = np.flatnonzero(self.left[nodes] >= 0)
+        while active.size:
+            current = nodes[active]
+            go_left = X[rows[active], self.feature[current]] <= self.threshold[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[self.left[current] >= 0]
+        return self.value[nodes.reshape(n_rows, self.n_estimators)].sum(axis=1) / self.n_estimators
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class BundledScaler:
+    def __init__(self, mean: np.ndarray, scale: np.ndarray) -> None:
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+
+class BundledEncoder:
+    def __init__(self, classes: np.ndarray) -> None:
+        self.classes_ = classes
+
+    def inverse_transform(self, y) -> np.ndarray:
+        return self.classes_[np.asarray(y, dtype=np.intp)]
+
+    def transform(self, labels) -> np.ndarray:
+        index = {label: i for i, label in enumerate(self.classes_.tolist())}
+        return np.array([index[label] for label in labels], dtype=np.intp)
+
+
+class SoilModelBundle:
+    def __init__(self, path: str, manifest: Dict[str, Any], arrays: Dict[str, np.ndarray], buffer: mmap.mmap) -> None:
+        self.path = path
+        self.manifest = manifest
+        self.model_version: Optional[str] = manifest.get("model_version")
+        self.info: Dict[str, Any] = manifest.get("metadata", {})
+        self.classifier = BundledForest(arrays)
+        self.scaler = BundledScaler(arrays["scaler_mean"], arrays["scaler_scale"])
+        self.encoder = BundledEncoder(arrays["class_names"])
+        self._buffer = buffer  # keeps the mapping alive for the array views
+
+
+# --- Writing ----------------------------------------------------------------------
+def _flatten_forest(classifier) -> Dict[str, np.ndarray]:
+    roots, left, right, feature, threshold, value = [], [], [], [], [], []
+    offset = 0
+    for estimator in classifier.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left < 0
+        roots.append(offset)
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        proba = tree.value[:, 0, :].astype(np.float64)
+        normalizer = proba.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        value.append(proba / normalizer)
+        offset += n
+    return {
+        "forest_roots": np.asarray(roots, dtype=np.int32),
+        "forest_left": np.concatenate(left).astype(np.int32),
+        "forest_right": np.concatenate(right).astype(np.int32),
+        "forest_feature": np.concatenate(feature).astype(np.int32),
+        "forest_threshold": np.concatenate(threshold).astype(np.float64),
+        "forest_value": np.concatenate(value),
+        "forest_classes": np.asarray(classifier.classes_),
+    }
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def write_bundle(path, classifier, scaler, encoder, info: Dict[str, Any], model_version: Optional[str] = None,
+                 sources: Optional[Dict[str, str]] = None) -> str:
+    """Write a bundle atomically (temp file + rename); returns the data checksum
+
+    ``sources`` maps the joblib files the bundle was built from to their
+    SHA-256, so a loader can tell when they have been replaced since.
+    """
+    arrays = _flatten_forest(classifier)
+    arrays["scaler_mean"] = np.asarray(scaler.mean_, dtype=np.float64)
+    arrays["scaler_scale"] = np.asarray(scaler.scale_, dtype=np.float64)
+    arrays["class_names"] = np.asarray(encoder.classes_).astype(str)
+
+    table = {}
+    chunks = []
+    position = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        padding = -position % _ALIGN
+        chunks.append(b"\0" * padding)
+        position += padding
+        table[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position, "nbytes": array.nbytes}
+        chunks.append(array.tobytes())
+        position += array.nbytes
+    data = b"".join(chunks)
+    checksum = hashlib.sha256(data).hexdigest()
+
+    manifest = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "model_version": model_version,
+        "created_at": datetime.now().isoformat(),
+        "data_sha256": checksum,
+        "sources": sources or {},
+        "arrays": table,
+        "metadata": info,
+    }, default=_json_default).encode("utf-8")
+    data_offset = _HEADER.size + len(manifest)
+    data_offset += -data_offset % _ALIGN
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(manifest), data_offset))
+        fh.write(manifest)
+        fh.write(b"\0" * (data_offset - _HEADER.size - len(manifest)))
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+    return checksum
+
+
+# --- Loading ----------------------------------------------------------------------
+def load_bundle(path, expected_version: Optional[str] = None, verify: bool = True) -> SoilModelBundle:
+    """Memory-map a bundle; raises BundleError on corruption or a version mismatch"""
+    with open(path, "rb") as fh:
+        buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(buffer) < _HEADER.size:
+        raise BundleError(f"{path}: truncated header")
+    magic, format_version, _, manifest_length, data_offset = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise BundleError(f"{path}: not a soil model bundle")
+    if format_version != FORMAT_VERSION:
+        raise BundleError(f"{path}: bundle format {format_version} is not supported (expected {FORMAT_VERSION})")
+    try:
+        manifest = json.loads(buffer[_HEADER.size:_HEADER.size + manifest_length])
+    except ValueError as exc:
+        raise BundleError(f"{path}: unreadable manifest") from exc
+    if expected_version is not None and manifest.get("model_version") != expected_version:
+        raise BundleError(
+            f"{path}: bundle holds model version {manifest.get('model_version')!r}, expected {expected_version!r}"
+        )
+
+    data = memoryview(buffer)[data_offset:]
+    if verify and hashlib.sha256(data).hexdigest() != manifest["data_sha256"]:
+        raise BundleError(f"{path}: checksum mismatch")
+
+    arrays = {}
+    for name, spec in manifest["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        if spec["offset"] + spec["nbytes"] > len(data):
+            raise BundleError(f"{path}: array {name} runs past the end of the file")
+        arrays[name] = np.frombuffer(
+            data, dtype=dtype, count=spec["nbytes"] // dtype.itemsize, offset=spec["offset"]
+        ).reshape(spec["shape"])
+
+    if arrays["forest_value"].shape[1] != len(arrays["class_names"]):
+        raise BundleError(f"{path}: forest and label encoder disagree on the number of classes")
+    return SoilModelBundle(str(path), manifest, arrays, buffer)
+
+
+def main(argv=None) -> int:
+    """Bundle the flat unified_soil_* joblib artifacts in a model directory"""
+    import joblib
+
+    model_dir = (argv or sys.argv[1:] or ["ml_model/models"])[0]
+    try:
+        from .soil_model_store import SOIL_ARTIFACT_FILES, source_signatures
+    except ImportError:
+        from soil_model_store import SOIL_ARTIFACT_FILES, source_signatures
+    artifacts = {name: joblib.load(os.path.join(model_dir, filename)) for name, filename in SOIL_ARTIFACT_FILES.items()}
+    path = os.path.join(model_dir, BUNDLE_FILE)
+    checksum = write_bundle(path, artifacts["classifier"], artifacts["scaler"], artifacts["encoder"],
+                            artifacts["info"], model_version=artifacts["info"].get("version"),
+                            sources=source_signatures(model_dir))
+    print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.2f} MB, sha256 {checksum[:12]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
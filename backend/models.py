@@ -63,3 +63,24 @@ class Order(Base):
         return json.loads(self.items) if self.items else []
 
 
+
+
+class FieldSample(Base):
+    """Soil reading with the soil type and harvest outcome observed in the field"""
+    __tablename__ = "field_samples"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    N = Column(Float, nullable=False)
+    P = Column(Float, nullable=False)
+    K = Column(Float, nullable=False)
+    temperature = Column(Float, nullable=False)
+    humidity = Column(Float, nullable=False)
+    ph = Column(Float, nullable=False)
+    rainfall = Column(Float, nullable=False)
+    soil_type = Column(String, nullable=False, index=True)  # Observed label used for retraining
+    crop = Column(String, nullable=True)
+    harvest_outcome = Column(String, nullable=True)  # e.g. 'good', 'average', 'poor', 'failed'
+    yield_kg_per_ha = Column(Float, nullable=True)
+    district = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,166 @@
+"""
+Order status event channels for AgroNova
+
+Routers publish order status changes here and the SSE endpoints in
+`orders.py` fan them out to subscribed browsers, so the order pages no
+longer need to poll the orders table.
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+ADMIN_CHANNEL = "admin"
+KEEPALIVE_SECONDS = 15.0
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def user_channel(user_id: int) -> str:
+    """Channel name carrying events for a single user's orders"""
+    return f"user:{user_id}"
+
+
+class OrderEventBroker:
+    """Interface for order event pub/sub backends
+
+    `LocalBroker` keeps everything in-process. A multi-worker deployment
+    can swap in a broker backed by Redis or Postgres LISTEN/NOTIFY through
+    `set_broker` without touching the routers.
+    """
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, channel: str) -> AsyncIterator[Dict[str, Any]]:
+        """Start receiving ``channel``'s events; registered before returning, closed with aclose()"""
+        raise NotImplementedError
+
+
+class LocalBroker(OrderEventBroker):
+    """In-process broker delivering events to asyncio queues
+
+    `publish` is called from sync routes running in the threadpool, so
+    events are handed to each subscriber's event loop thread-safely.
+    Slow subscribers drop events rather than block the publisher.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            targets = list(self._subscribers.get(channel, ()))
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # Subscriber's loop already closed; it unregisters on exit
+                pass
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    def subscribe(self, channel: str) -> "_Subscription":
+        """Register a subscriber now, so nothing published after this call is missed"""
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(entry)
+        return _Subscription(self, channel, entry)
+
+    def _unsubscribe(self, channel: str, entry: Tuple[asyncio.AbstractEventLoop, asyncio.Queue]) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(entry)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def subscriber_count(self, channel: Optional[str] = None) -> int:
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(subs) for subs in self._subscribers.values())
+
+
+class _Subscription:
+    """LocalBroker's event iterator; aclose() unregisters it"""
+
+    def __init__(self, broker: LocalBroker, channel: str,
+                 entry: Tuple[asyncio.AbstractEventLoop, asyncio.Queue]) -> None:
+        self._broker = broker
+        self._channel = channel
+        self._entry = entry
+
+    def __aiter__(self) -> "_Subscription":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        return await self._entry[1].get()
+
+    async def aclose(self) -> None:
+        self._broker._unsubscribe(self._channel, self._entry)
+
+
+_broker: OrderEventBroker = LocalBroker()
+
+
+def get_broker() -> OrderEventBroker:
+    return _broker
+
+
+def set_broker(broker: OrderEventBroker) -> None:
+    """Replace the active broker (e.g. with a cross-worker implementation)"""
+    global _broker
+    _broker = broker
+
+
+def publish_order_status(order, event_type: str) -> None:
+    """Publish a status-change event for an order to its user and to admins"""
+    event = {
+        "type": event_type,
+        "order_id": order.id,
+        "user_id": order.user_id,
+        "status": order.status,
+        "total_amount": order.total_amount,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+    }
+    broker = get_broker()
+    broker.publish(user_channel(order.user_id), event)
+    broker.publish(ADMIN_CHANNEL, event)
+
+
+async def sse_stream(channel: str, keepalive: float = KEEPALIVE_SECONDS) -> AsyncIterator[str]:
+    """Format a channel's events as a Server-Sent Events stream"""
+    # Subscribed before the first yield: events published while the
+    # response starts are queued, not lost
+    events = get_broker().subscribe(channel).__aiter__()
+    pending = None
+    try:
+        yield ": connected\n\n"
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(events.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=keepalive)
+            if not done:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            event = pending.result()
+            pending = None
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        if pending is not None:
+            pending.cancel()
+            try:
+                await pending
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+        await events.aclose()
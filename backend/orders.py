@@ -1,28 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import json
 
 try:
     from .db import get_db
     from .models import Order, User
     from .schemas import OrderCreate, OrderOut
+    from .order_events import ADMIN_CHANNEL, publish_order_status, sse_stream, user_channel
+    from .auth import Principal, get_current_principal, get_stream_admin_principal, get_stream_principal
 except ImportError:
     from db import get_db
     from models import Order, User
     from schemas import OrderCreate, OrderOut
+    from order_events import ADMIN_CHANNEL, publish_order_status, sse_stream, user_channel
+    from auth import Principal, get_current_principal, get_stream_admin_principal, get_stream_principal
 
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
 
+def _require_same_user(principal: Principal, user_id: Optional[int]) -> int:
+    """Legacy `user_id` query params must match the authenticated user"""
+    if user_id is not None and user_id != principal.id:
+        raise HTTPException(status_code=403, detail="user_id does not match the authenticated user")
+    return principal.id
+
+
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def create_order(order: OrderCreate, user_id: int = Query(...), db: Session = Depends(get_db)):
-    """Create a new order for a user"""
-    # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+def create_order(
+    order: OrderCreate,
+    user_id: Optional[int] = Query(None),
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    """Create a new order for the authenticated user"""
+    user_id = _require_same_user(principal, user_id)
     
     try:
         # Determine initial status based on payment method
@@ -44,6 +58,7 @@ def create_order(order: OrderCreate, user_id: int = Query(...), db: Session = De
         db.add(db_order)
         db.commit()
         db.refresh(db_order)
+        publish_order_status(db_order, "order_created")
         
         # Return parsed order
         return {
@@ -92,6 +107,35 @@ def get_all_orders(db: Session = Depends(get_db)):
     return orders
 
 
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.get("/stream/user/{user_id}")
+async def stream_user_orders(user_id: int, principal: Principal = Depends(get_stream_principal)):
+    """Server-Sent Events stream of status changes for a user's orders (that user or an admin)
+
+    EventSource can't send headers, so the token may be passed as
+    ?access_token= or an access_token cookie.
+    """
+    if user_id != principal.id and not principal.is_admin:
+        raise HTTPException(status_code=403, detail="Cannot stream another user's orders")
+    return StreamingResponse(
+        sse_stream(user_channel(user_id)),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.get("/stream/admin")
+async def stream_all_orders(principal: Principal = Depends(get_stream_admin_principal)):
+    """Server-Sent Events stream of status changes for all orders (admin only)"""
+    return StreamingResponse(
+        sse_stream(ADMIN_CHANNEL),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
 @router.get("/{order_id}", response_model=OrderOut)
 def get_order(order_id: int, db: Session = Depends(get_db)):
     """Get a specific order by ID"""
@@ -106,8 +150,14 @@ def get_order(order_id: int, db: Session = Depends(get_db)):
 
 
 @router.patch("/{order_id}/cancel")
-def cancel_order(order_id: int, user_id: int = Query(...), db: Session = Depends(get_db)):
-    """Cancel an order"""
+def cancel_order(
+    order_id: int,
+    user_id: Optional[int] = Query(None),
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    """Cancel an order owned by the authenticated user"""
+    user_id = _require_same_user(principal, user_id)
     order = db.query(Order).filter(Order.id == order_id).first()
     
     if not order:
@@ -128,6 +178,7 @@ def cancel_order(order_id: int, user_id: int = Query(...), db: Session = Depends
         # Update order status
         order.status = "cancelled"
         db.commit()
+        publish_order_status(order, "order_status_changed")
         
         # Parse JSON string to dict for response
         order.items = json.loads(order.items) if isinstance(order.items, str) else order.items
@@ -168,8 +219,11 @@ def update_order_status(order_id: int, status_data: dict, db: Session = Depends(
     
     try:
         # Update order status
+        previous_status = order.status
         order.status = new_status
         db.commit()
+        if new_status != previous_status:
+            publish_order_status(order, "order_status_changed")
         
         # Parse JSON string to dict for response
         order.items = json.loads(order.items) if isinstance(order.items, str) else order.items
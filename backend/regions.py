@@ -0,0 +1,137 @@
+"""
+Regional crop databases, loaded on first use
+
+Each region is described by ml_model/regions/<key>.json (display name and
+advice rules). Its crop table is CROP_REQUIREMENTS for the default region
+(kerala) and the region's rows of the crop requirements file otherwise;
+its models come from the manifest's optional "model_dir" (default
+ml_model/models). A region's engine (crop table, compiled rule tables,
+advice and models) is built on the first request for it, and at most
+REGION_CACHE_SIZE regions besides the default stay loaded, least recently
+used first out.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ML_MODEL_DIR = Path(__file__).resolve().parent.parent / "ml_model"
+REGIONS_DIR = Path(os.getenv("REGIONS_DIR", ML_MODEL_DIR / "regions"))
+DEFAULT_REGION = "kerala"
+REGION_CACHE_SIZE = int(os.getenv("REGION_CACHE_SIZE", "2"))
+
+logger = logging.getLogger(__name__)
+
+
+def region_key(name: str) -> str:
+    """Normalised region key: "Tamil Nadu" -> "tamil_nadu\""""
+    return "_".join(str(name).strip().lower().replace("-", " ").split())
+
+
+@dataclass
+class RegionProfile:
+    key: str
+    name: str
+    advice: Dict[str, Any]
+    model_dir: Path
+    # None means CROP_REQUIREMENTS itself, so in-process edits keep applying
+    crop_table: Optional[Dict[str, Dict[str, Any]]] = field(default=None, repr=False)
+
+
+def available_regions(regions_dir=REGIONS_DIR) -> List[str]:
+    return sorted(path.stem for path in Path(regions_dir).glob("*.json"))
+
+
+def load_region_profile(key: str, regions_dir=REGIONS_DIR) -> RegionProfile:
+    """Read a region's manifest and crop table; ValueError if the region is unknown"""
+    key = region_key(key)
+    path = Path(regions_dir) / f"{key}.json"
+    if not path.exists():
+        raise ValueError(f"Unknown region '{key}'; available: {', '.join(available_regions(regions_dir))}")
+    with open(path) as fh:
+        manifest = json.load(fh)
+
+    model_dir = Path(manifest["model_dir"]) if manifest.get("model_dir") else ML_MODEL_DIR / "models"
+    if not model_dir.is_absolute():
+        model_dir = ML_MODEL_DIR / model_dir
+
+    crop_table = None
+    if key != DEFAULT_REGION:
+        try:
+            from .crop_store import get_crop_store
+        except ImportError:
+            from crop_store import get_crop_store
+        crop_table = get_crop_store().to_requirements(region=key)
+        if not crop_table:
+            raise ValueError(f"No crops listed for region '{key}' in the crop requirements file")
+    advice = {name: value for name, value in manifest.items() if name not in ("name", "model_dir")}
+    return RegionProfile(key, manifest.get("name", key.replace("_", " ").title()), advice, model_dir, crop_table)
+
+
+class RegionRegistry:
+    """Region engines built on first use and evicted least-recently-used
+
+    ``factory`` builds an engine from a RegionProfile. The default region's
+    engine comes from ``default`` and is never evicted.
+    """
+
+    def __init__(self, factory: Callable[[RegionProfile], Any], default: Callable[[], Any],
+                 capacity: int = REGION_CACHE_SIZE, regions_dir=REGIONS_DIR) -> None:
+        self.factory = factory
+        self.default = default
+        self.capacity = capacity
+        self.regions_dir = regions_dir
+        self._engines: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, region: Optional[str] = None) -> Any:
+        key = region_key(region) if region else DEFAULT_REGION
+        if key == DEFAULT_REGION:
+            return self.default()
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                return engine
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Loading takes seconds; other regions stay servable meanwhile
+        with load_lock:
+            with self._lock:
+                engine = self._engines.get(key)
+            if engine is None:
+                engine = self.factory(load_region_profile(key, self.regions_dir))
+                with self._lock:
+                    self.loads += 1
+                    self._engines[key] = engine
+                    while len(self._engines) > self.capacity:
+                        evicted, _ = self._engines.popitem(last=False)
+                        self.evictions += 1
+                        logger.info("Evicted region '%s' (cache size %d)", evicted, self.capacity)
+        with self._lock:
+            self._loading.pop(key, None)
+            if key in self._engines:
+                self._engines.move_to_end(key)
+        return engine
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return [DEFAULT_REGION] + list(self._engines)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "default": DEFAULT_REGION,
+            "available": available_regions(self.regions_dir),
+            "loaded": self.loaded(),
+            "capacity": self.capacity,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
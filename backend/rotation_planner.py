@@ -0,0 +1,147 @@
+"""
+Multi-season crop rotation planning
+
+Each season has its own climate; the soil's N, P and K carry over from one
+season to the next. A crop removes part of what it needs (a fraction of
+the midpoint of its optimal range) and legumes (crops whose description
+says "legume") fix nitrogen instead of removing it. pH is left unchanged.
+
+Climate and pH penalties don't depend on earlier choices, so they are
+tabulated once per season and crop from the compiled rule tables. The
+search is a beam over partial rotations: every season, each kept rotation
+is extended with every crop, N/P/K penalties are looked up for the whole
+(rotations x crops) block at once, rotations that reach the same soil with
+the same last crop are merged (only the best can lead to the best plan)
+and the ``beam_width`` highest totals are kept. Growing the same crop in
+consecutive seasons costs REPEAT_PENALTY points.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+from rule_compiler import REQUIREMENT_KEYS, CompiledRules
+
+NUTRIENTS = ("N", "P", "K")
+SEASON_FEATURES = ("temperature", "humidity", "rainfall")
+# Share of the optimal-range midpoint a crop takes out of the soil test
+NUTRIENT_UPTAKE = {"N": 0.3, "P": 0.15, "K": 0.2}
+# Net soil-test N a legume leaves behind (about 55 kg/ha)
+LEGUME_N_FIXATION = 25.0
+# Pest and disease build-up from growing a crop twice in a row
+REPEAT_PENALTY = 10.0
+BEAM_WIDTH = 64
+
+
+def is_legume(requirements: Mapping) -> bool:
+    return "legume" in str(requirements.get("description", "")).lower()
+
+
+def nutrient_changes(crop_table: Mapping[str, Mapping], crops: Sequence[str],
+                     legumes: Optional[Iterable[str]] = None) -> np.ndarray:
+    """(crops, 3) change in soil N, P, K after one season of each crop"""
+    legumes = {name for name in crops if is_legume(crop_table[name])} if legumes is None else set(legumes)
+    changes = np.empty((len(crops), len(NUTRIENTS)))
+    for i, name in enumerate(crops):
+        for j, nutrient in enumerate(NUTRIENTS):
+            low, high = crop_table[name][REQUIREMENT_KEYS[nutrient]]
+            changes[i, j] = -NUTRIENT_UPTAKE[nutrient] * (low + high) / 2
+        if name in legumes:
+            changes[i, 0] = LEGUME_N_FIXATION
+    return changes
+
+
+def _penalties(compiled: CompiledRules, feature: str, x: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """(len(x), crops) rule penalties of ``feature`` at the values ``x``"""
+    rows = np.searchsorted(compiled.breakpoints[feature], x, side="right")
+    return compiled.penalties[feature][:, columns][rows].astype(np.int32)
+
+
+def plan_rotation(
+    soil: Mapping[str, float],
+    seasons: Sequence[Mapping[str, Any]],
+    compiled: CompiledRules,
+    crop_table: Mapping[str, Mapping],
+    crops: Optional[Sequence[str]] = None,
+    families: Optional[Mapping[str, str]] = None,
+    legumes: Optional[Iterable[str]] = None,
+    top_n: int = 3,
+    beam_width: int = BEAM_WIDTH,
+    bounds: Optional[Mapping[str, tuple]] = None,
+) -> List[Dict[str, Any]]:
+    """The ``top_n`` best crop sequences for ``seasons``, highest total rule score first
+
+    ``soil`` holds the starting N, P, K and pH; each season holds
+    temperature, humidity, rainfall and an optional name. ``families``
+    maps a crop (or variety) to the crop it counts as for REPEAT_PENALTY,
+    ``legumes`` overrides the description-based legume check and
+    ``bounds`` clamps the soil N, P and K between seasons.
+    """
+    crops = list(compiled.crops) if crops is None else list(crops)
+    columns = compiled.crop_indices(crops)
+    n_seasons, n_crops = len(seasons), len(crops)
+    changes = nutrient_changes(crop_table, crops, legumes)
+    family_names = [(families or {}).get(name, name) for name in crops]
+    family = np.unique(family_names, return_inverse=True)[1]
+    bounds = bounds or {}
+    low = np.array([bounds.get(nutrient, (0.0, np.inf))[0] for nutrient in NUTRIENTS])
+    high = np.array([bounds.get(nutrient, (0.0, np.inf))[1] for nutrient in NUTRIENTS])
+
+    # (seasons, crops) penalty from everything the rotation can't change
+    fixed = sum(
+        _penalties(compiled, feature, np.array([float(season[feature]) for season in seasons]), columns)
+        for feature in SEASON_FEATURES
+    ) + _penalties(compiled, "ph", np.array([float(soil["ph"])]), columns)
+
+    state = np.array([[float(soil[nutrient]) for nutrient in NUTRIENTS]])
+    totals = np.zeros(1)
+    last = np.full(1, -1)
+    history = np.empty((1, 0), dtype=np.intp)
+    season_scores = np.empty((1, 0))
+    for s in range(n_seasons):
+        penalty = fixed[s] + sum(
+            _penalties(compiled, nutrient, state[:, j], columns) for j, nutrient in enumerate(NUTRIENTS)
+        )
+        scores = np.maximum(100 - penalty, 0).astype(np.float64)
+        repeat = (last[:, None] >= 0) & (family[None, :] == last[:, None])
+        candidates = (totals[:, None] + scores - REPEAT_PENALTY * repeat).ravel()
+
+        order = np.argsort(-candidates, kind="stable")
+        parent, crop = np.divmod(order, n_crops)
+        after = np.clip(state[parent] + changes[crop], low, high)
+        # The same soil and last crop family lead to the same futures: keep the best path there
+        key = family[crop].astype(np.int64)
+        for column in np.round(after, 6).T:
+            values, codes = np.unique(column, return_inverse=True)
+            key = key * len(values) + codes
+        _, first = np.unique(key, return_index=True)
+        keep = order[np.sort(first)[:beam_width]]
+        parent, crop = np.divmod(keep, n_crops)
+
+        state = np.clip(state[parent] + changes[crop], low, high)
+        totals = candidates[keep]
+        last = family[crop]
+        history = np.column_stack([history[parent], crop])
+        season_scores = np.column_stack([season_scores[parent], scores[parent, crop]])
+
+    plans = []
+    for b in range(min(top_n, len(totals))):
+        soil_before = np.array([[float(soil[nutrient]) for nutrient in NUTRIENTS]])
+        steps = []
+        for s, i in enumerate(history[b]):
+            soil_after = np.clip(soil_before + changes[i], low, high)
+            steps.append({
+                "season": seasons[s].get("name") or f"Season {s + 1}",
+                "crop": crops[i],
+                "score": float(season_scores[b, s]),
+                "soil_before": {nutrient: round(float(v), 2) for nutrient, v in zip(NUTRIENTS, soil_before[0])},
+                "soil_after": {nutrient: round(float(v), 2) for nutrient, v in zip(NUTRIENTS, soil_after[0])},
+            })
+            soil_before = soil_after
+        plans.append({
+            "sequence": [step["crop"] for step in steps],
+            "total_score": float(totals[b]),
+            "average_score": round(float(season_scores[b].mean()), 2),
+            "repeats": int(sum(family[a] == family[c] for a, c in zip(history[b], history[b][1:]))),
+            "seasons": steps,
+        })
+    return plans
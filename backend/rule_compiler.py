@@ -0,0 +1,160 @@
+"""
+Compiled form of the rule-based suitability engine
+
+Each feature's contribution to calculate_suitability_score depends only on
+which interval the input falls in, between boundaries derived from
+CROP_REQUIREMENTS (the fatal thresholds and the optimal ranges). The
+compiler merges every crop's boundaries into one sorted breakpoint array
+per feature and tabulates the penalty of each interval for each crop, so
+scoring any number of samples against any number of crops is seven
+searchsorted lookups, seven table gathers and a sum.
+
+Tables are rebuilt automatically when CROP_REQUIREMENTS changes.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from crop_database import CROP_REQUIREMENTS
+
+FEATURES = ("N", "P", "K", "temperature", "humidity", "ph", "rainfall")
+# Column of CROP_REQUIREMENTS holding each feature's optimal range
+REQUIREMENT_KEYS = {"N": "N", "P": "P", "K": "K", "temperature": "temp",
+                    "humidity": "humidity", "ph": "pH", "rainfall": "rainfall"}
+# Any fatal flaw outweighs the largest possible sum of ordinary penalties
+FATAL_PENALTY = 1000
+
+
+def _above(value: float) -> float:
+    """Smallest float greater than value: turns `x > value` into `x >= breakpoint`"""
+    return float(np.nextafter(value, np.inf))
+
+
+def _boundaries(feature: str, low: float, high: float) -> List[float]:
+    """Points where the feature's penalty can change, as `x >= point` thresholds"""
+    if feature in ("N", "P"):
+        return [low * 0.4, low, _above(high)]
+    if feature == "K":
+        return [low * 0.2, low, _above(high)]
+    if feature == "temperature":
+        return [low - 5, low, _above(high), _above(high + 5)]
+    if feature == "humidity":
+        return [low, _above(high)]
+    if feature == "ph":
+        return [low - 1.0, low, _above(high), _above(high + 1.0)]
+    if feature == "rainfall":
+        return [low * 0.3, low, _above(high)]
+    raise KeyError(feature)
+
+
+def crop_boundaries(requirements: Mapping, feature: str) -> List[float]:
+    """One crop's breakpoints for ``feature``: inputs at which its penalty can change"""
+    return _boundaries(feature, *requirements[REQUIREMENT_KEYS[feature]])
+
+
+def _penalty(feature: str, x: np.ndarray, low: float, high: float) -> np.ndarray:
+    """Per-feature penalty with the same comparisons as calculate_suitability_score"""
+    if feature in ("N", "P"):
+        fatal = x < low * 0.4
+        penalty = np.where(x < low, 20, np.where(x > high, 5, 0))
+    elif feature == "K":
+        fatal = x < low * 0.2
+        penalty = np.where(x < low, 30, np.where(x > high, 5, 0))
+    elif feature == "temperature":
+        fatal = (x < low - 5) | (x > high + 5)
+        penalty = 40 * ~((low <= x) & (x <= high))
+    elif feature == "humidity":
+        fatal = np.zeros(x.shape, dtype=bool)
+        penalty = 40 * ~((low <= x) & (x <= high))
+    elif feature == "ph":
+        fatal = (x < low - 1.0) | (x > high + 1.0)
+        penalty = 20 * ~((low <= x) & (x <= high))
+    elif feature == "rainfall":
+        fatal = x < low * 0.3
+        penalty = 30 * ~((low <= x) & (x <= high))
+    else:
+        raise KeyError(feature)
+    return np.where(fatal, FATAL_PENALTY, penalty)
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    crops: Tuple[str, ...]
+    # Per feature: sorted breakpoints (B,) and penalties (B + 1, crops);
+    # row i applies to inputs with exactly i breakpoints <= x
+    breakpoints: Dict[str, np.ndarray]
+    penalties: Dict[str, np.ndarray]
+    fingerprint: tuple
+
+    def crop_indices(self, crops: Optional[Sequence[str]]) -> np.ndarray:
+        if crops is None:
+            return np.arange(len(self.crops))
+        index = {name: i for i, name in enumerate(self.crops)}
+        return np.array([index[name] for name in crops], dtype=np.intp)
+
+    def score(self, features: Mapping[str, np.ndarray], crops: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Scores (0-100), shaped (samples, crops), identical to calculate_suitability_score"""
+        columns = self.crop_indices(crops)
+        total = None
+        for feature in FEATURES:
+            x = np.asarray(features[feature], dtype=np.float64)
+            table = self.penalties[feature] if crops is None else self.penalties[feature][:, columns]
+            rows = np.searchsorted(self.breakpoints[feature], x, side="right")
+            if total is None:
+                total = table[rows].astype(np.int32)
+            else:
+                total += table[rows]
+        np.subtract(100, total, out=total)
+        return np.maximum(total, 0, out=total).astype(np.float64)
+
+
+def requirements_fingerprint(requirements: Mapping[str, Mapping]) -> tuple:
+    return tuple(
+        (name, *(tuple(req[REQUIREMENT_KEYS[feature]]) for feature in FEATURES))
+        for name, req in requirements.items()
+    )
+
+
+def compile_rules(requirements: Mapping[str, Mapping]) -> CompiledRules:
+    crops = tuple(requirements)
+    breakpoints: Dict[str, np.ndarray] = {}
+    penalties: Dict[str, np.ndarray] = {}
+    for feature in FEATURES:
+        key = REQUIREMENT_KEYS[feature]
+        points = np.unique(np.array(
+            [point for name in crops for point in _boundaries(feature, *requirements[name][key])], dtype=np.float64
+        ))
+        # A representative input for every interval: just below the first
+        # breakpoint, then each breakpoint itself
+        probes = np.concatenate([[np.nextafter(points[0], -np.inf)], points])
+        penalties[feature] = np.column_stack([
+            _penalty(feature, probes, *requirements[name][key]) for name in crops
+        ]).astype(np.int16)
+        breakpoints[feature] = points
+    return CompiledRules(crops, breakpoints, penalties, requirements_fingerprint(requirements))
+
+
+_compiled: Optional[CompiledRules] = None
+_compile_lock = threading.Lock()
+
+
+def get_compiled_rules(requirements: Optional[Mapping[str, Mapping]] = None) -> CompiledRules:
+    """Compiled tables for CROP_REQUIREMENTS (or ``requirements``), rebuilt when they change"""
+    global _compiled
+    requirements = CROP_REQUIREMENTS if requirements is None else requirements
+    fingerprint = requirements_fingerprint(requirements)
+    compiled = _compiled
+    if compiled is not None and compiled.fingerprint == fingerprint:
+        return compiled
+    with _compile_lock:
+        if _compiled is None or _compiled.fingerprint != fingerprint:
+            _compiled = compile_rules(requirements)
+        return _compiled
+
+
+def score_crops(features: Mapping[str, np.ndarray], crops: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray]:
+    """Crop names and their rule scores (samples, crops) from the compiled tables"""
+    compiled = get_compiled_rules()
+    return (list(compiled.crops) if crops is None else list(crops)), compiled.score(features, crops)
@@ -2,7 +2,7 @@
 Pydantic Schemas for AgroNova API
 """
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -92,3 +92,26 @@ class OrderOut(BaseModel):
         from_attributes = True
 
 
+
+# Field Feedback Schemas
+class FieldSampleCreate(BaseModel):
+    N: float = Field(..., ge=0, le=300)
+    P: float = Field(..., ge=0, le=300)
+    K: float = Field(..., ge=0, le=400)
+    temperature: float = Field(..., ge=-10, le=60)
+    humidity: float = Field(..., ge=0, le=100)
+    ph: float = Field(..., ge=0, le=14)
+    rainfall: float = Field(..., ge=0, le=10000)
+    soil_type: str
+    crop: Optional[str] = None
+    harvest_outcome: Optional[str] = None
+    yield_kg_per_ha: Optional[float] = Field(None, ge=0)
+    district: Optional[str] = None
+
+class FieldSampleOut(FieldSampleCreate):
+    id: int
+    user_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
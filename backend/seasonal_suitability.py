@@ -0,0 +1,106 @@
+"""
+Crop suitability by sowing date from a year of climate
+
+Takes a location's 12 monthly or 365/366 daily temperature, humidity and
+rainfall values (January first). A crop sown at a given month or day is
+scored on its whole growing window: mean temperature and humidity and
+total rainfall over the window, which wraps into the next year, against
+the rule engine's requirements. Window aggregates for every start come
+from one cumulative sum per series, and all starts of all crops sharing a
+growing length are scored in one compiled-rules batch.
+
+Growing lengths are rough field durations; perennials (12 months) score
+the same whatever the planting month.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+from rule_compiler import CompiledRules
+
+CLIMATE_FEATURES = ("temperature", "humidity", "rainfall")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+# Sowing to harvest, in months
+GROWING_MONTHS = {
+    "blackgram": 3, "kidneybeans": 3, "mothbeans": 3, "mungbean": 3, "muskmelon": 3, "watermelon": 3,
+    "chickpea": 4, "jute": 4, "lentil": 4, "maize": 4, "potato": 4, "rice": 4,
+    "cotton": 6, "pigeonpeas": 6,
+    "apple": 12, "banana": 12, "coconut": 12, "coffee": 12, "grapes": 12,
+    "mango": 12, "orange": 12, "papaya": 12, "pomegranate": 12,
+}
+DEFAULT_GROWING_MONTHS = 4
+# Months within this many points of a crop's best are also reported as good
+BEST_MONTH_TOLERANCE = 5.0
+
+
+def window_aggregates(climate: Mapping[str, np.ndarray], window: int) -> Dict[str, np.ndarray]:
+    """Mean temperature and humidity and total rainfall over ``window`` steps from every start, wrapping"""
+    aggregates = {}
+    for feature in CLIMATE_FEATURES:
+        x = np.asarray(climate[feature], dtype=np.float64)
+        n = len(x)
+        sums = np.concatenate([[0.0], np.cumsum(np.tile(x, window // n + 2))])
+        totals = sums[window:window + n] - sums[:n]
+        aggregates[feature] = totals if feature == "rainfall" else totals / window
+    return aggregates
+
+
+def _start_months(n: int) -> np.ndarray:
+    """Calendar month (0-11) of each step of a year-long series"""
+    if n == 12:
+        return np.arange(12)
+    year = "2024" if n == 366 else "2023"
+    days = np.arange(np.datetime64(f"{year}-01-01"), np.datetime64(f"{year}-01-01") + n)
+    return (days.astype("datetime64[M]") - np.datetime64(f"{year}-01")).astype(int)
+
+
+def seasonal_suitability(
+    soil: Mapping[str, float],
+    climate: Mapping[str, Sequence[float]],
+    compiled: CompiledRules,
+    crops: Optional[Sequence[str]] = None,
+    growing_months: Optional[Mapping[str, int]] = None,
+) -> Dict[str, Any]:
+    """Per-crop rule scores (0-100) by sowing month, best months first
+
+    ``soil`` holds N, P, K and pH. For daily series a month's score is the
+    best of its sowing days, and ``best_start`` gives that day.
+    """
+    lengths = {len(climate[feature]) for feature in CLIMATE_FEATURES}
+    if len(lengths) != 1 or lengths.pop() not in (12, 365, 366):
+        raise ValueError("Climate series must all hold 12 monthly or 365/366 daily values")
+    n = len(climate["temperature"])
+    steps_per_month = n / 12
+    months = _start_months(n)
+    month_starts = np.flatnonzero(np.diff(months, prepend=-1))
+
+    crops = list(compiled.crops) if crops is None else list(crops)
+    durations = {**GROWING_MONTHS, **(growing_months or {})}
+    grow = np.array([durations.get(name, DEFAULT_GROWING_MONTHS) for name in crops])
+
+    scores = np.empty((n, len(crops)))
+    for length in np.unique(grow):
+        columns = np.flatnonzero(grow == length)
+        features = window_aggregates(climate, max(int(round(length * steps_per_month)), 1))
+        features.update({name: np.full(n, float(soil[name])) for name in ("N", "P", "K", "ph")})
+        scores[:, columns] = compiled.score(features, [crops[j] for j in columns])
+    # Best sowing step within each calendar month
+    monthly = np.maximum.reduceat(scores, month_starts, axis=0)
+
+    results: List[Dict[str, Any]] = []
+    for j, crop in enumerate(crops):
+        best = float(monthly[:, j].max())
+        good = np.flatnonzero((monthly[:, j] >= best - BEST_MONTH_TOLERANCE) & (monthly[:, j] > 0))
+        result = {
+            "crop": crop,
+            "growing_months": int(grow[j]),
+            "best_score": best,
+            "best_months": [MONTHS[m] for m in good[np.argsort(-monthly[good, j], kind="stable")]],
+            "monthly_scores": dict(zip(MONTHS, monthly[:, j].tolist())),
+        }
+        if n != 12:
+            day = int(np.argmax(scores[:, j]))
+            result["best_start"] = f"{MONTHS[months[day]]} {day - month_starts[months[day]] + 1}"
+        results.append(result)
+    results.sort(key=lambda r: -r["best_score"])
+    return {"resolution": "monthly" if n == 12 else "daily", "crops": results}
@@ -0,0 +1,281 @@
+"""
+Shadow evaluation of candidate models on live traffic
+
+A sampled fraction of production inputs is queued after the response has
+been sent (the API hands them over through FastAPI background tasks). A
+worker thread then runs the serving model and the candidate side by side
+on each input and records agreement, probability drift and latency to a
+local SQLite table, summarised on GET /admin/shadow-evaluation.
+
+Configured through environment variables; nothing runs unless a
+candidate is set:
+    SHADOW_SOIL_MODEL_DIR   candidate soil artifacts (a models dir or a version dir)
+    SHADOW_CROP_MODEL_DIR   candidate crop regressors (an `advanced` dir)
+    SHADOW_SAMPLE_RATE      fraction of requests to evaluate (default 0.05)
+    SHADOW_EVAL_DB          SQLite file for results (default backend/shadow_eval.db)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", "0.05"))
+SHADOW_EVAL_DB = os.getenv("SHADOW_EVAL_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "shadow_eval.db"))
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "1000"))
+SUMMARY_WINDOW = 10000  # Most recent rows per kind used for the summary
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shadow_evaluations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    primary_version TEXT,
+    candidate_version TEXT,
+    primary_label TEXT,
+    candidate_label TEXT,
+    agree INTEGER NOT NULL,
+    drift REAL NOT NULL,
+    primary_ms REAL NOT NULL,
+    candidate_ms REAL NOT NULL,
+    inputs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_shadow_evaluations_kind_id ON shadow_evaluations (kind, id);
+"""
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+class ShadowEvaluator:
+    """Samples inputs, compares serving and candidate models off the request path"""
+
+    def __init__(self, kerala_ai, candidate_soil=None, candidate_crop_engine=None,
+                 sample_rate: float = SHADOW_SAMPLE_RATE, db_path: str = SHADOW_EVAL_DB,
+                 queue_size: int = SHADOW_QUEUE_SIZE) -> None:
+        self.kerala_ai = kerala_ai
+        self.candidate_soil = candidate_soil
+        self.candidate_crop_engine = candidate_crop_engine
+        self.sample_rate = sample_rate
+        self.db_path = db_path
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, kerala_ai) -> Optional["ShadowEvaluator"]:
+        soil_dir = os.getenv("SHADOW_SOIL_MODEL_DIR")
+        crop_dir = os.getenv("SHADOW_CROP_MODEL_DIR")
+        if not soil_dir and not crop_dir:
+            return None
+        try:
+            from .soil_model_store import load_soil_artifacts
+        except ImportError:
+            from soil_model_store import load_soil_artifacts
+        from hybrid_engine import HybridEngine
+
+        candidate_soil = load_soil_artifacts(soil_dir) if soil_dir else None
+        candidate_crop = HybridEngine(model_dir=crop_dir) if crop_dir else None
+        logger.info("Shadow evaluation enabled at %.1f%% (soil=%s, crop=%s)",
+                    SHADOW_SAMPLE_RATE * 100, soil_dir or "-", crop_dir or "-")
+        evaluator = cls(kerala_ai, candidate_soil, candidate_crop)
+        atexit.register(evaluator.close)
+        return evaluator
+
+    @property
+    def kinds(self):
+        kinds = []
+        if self.candidate_soil is not None:
+            kinds.append("soil")
+        if self.candidate_crop_engine is not None:
+            kinds.append("crop")
+        return kinds
+
+    # --- Request side: must stay O(1) -------------------------------------------------
+    def submit(self, kind: str, payload: Dict[str, Any]) -> bool:
+        """Queue an input for evaluation if sampled; never blocks"""
+        if kind not in self.kinds or random.random() >= self.sample_rate:
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((kind, dict(payload)))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _ensure_worker(self) -> None:
+        # The launcher forks after models load, so a worker started in the
+        # parent doesn't exist in the children; start one per process
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="shadow-eval", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # --- Worker side ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _run(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                batch = [job]
+                # Drain whatever else is waiting so commits are batched
+                while len(batch) < 100:
+                    try:
+                        job = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        self._queue.put(None)
+                        break
+                    batch.append(job)
+                rows = []
+                for kind, payload in batch:
+                    try:
+                        rows.append(self.evaluate(kind, payload))
+                    except Exception:  # A bad candidate must not kill the worker
+                        logger.exception("Shadow evaluation of %s input failed", kind)
+                conn.executemany(
+                    "INSERT INTO shadow_evaluations (created_at, kind, primary_version, candidate_version, "
+                    "primary_label, candidate_label, agree, drift, primary_ms, candidate_ms, inputs) "
+                    "VALUES (:created_at, :kind, :primary_version, :candidate_version, :primary_label, "
+                    ":candidate_label, :agree, :drift, :primary_ms, :candidate_ms, :inputs)",
+                    rows,
+                )
+                conn.commit()
+        finally:
+            conn.close()
+
+    def evaluate(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if kind == "soil":
+            result = self._evaluate_soil(payload)
+        elif kind == "crop":
+            result = self._evaluate_crop(payload)
+        else:
+            raise ValueError(f"Unknown shadow evaluation kind {kind!r}")
+        result.update(kind=kind, created_at=datetime.now().isoformat(), inputs=json.dumps(payload))
+        return result
+
+    def _evaluate_soil(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        features = self.kerala_ai._feature_vector(payload)
+        serving = self.kerala_ai._soil
+        candidate = self.candidate_soil
+
+        def run(artifacts):
+            scaled = artifacts.scaler.transform(features)
+            proba = artifacts.classifier.predict_proba(scaled)[0]
+            return artifacts.encoder.inverse_transform([int(np.argmax(proba))])[0], proba
+
+        (primary_label, primary_proba), primary_ms = _timed(run, serving)
+        (candidate_label, candidate_proba), candidate_ms = _timed(run, candidate)
+
+        # Total variation distance over the class distribution, aligned by name
+        primary_dist = dict(zip(map(str, serving.encoder.classes_), primary_proba))
+        candidate_dist = dict(zip(map(str, candidate.encoder.classes_), candidate_proba))
+        classes = set(primary_dist) | set(candidate_dist)
+        drift = 0.5 * sum(abs(primary_dist.get(c, 0.0) - candidate_dist.get(c, 0.0)) for c in classes)
+        return {
+            "primary_version": serving.version or "base",
+            "candidate_version": candidate.version or candidate.info.get("version") or "candidate",
+            "primary_label": str(primary_label),
+            "candidate_label": str(candidate_label),
+            "agree": int(primary_label == candidate_label),
+            "drift": float(drift),
+            "primary_ms": primary_ms,
+            "candidate_ms": candidate_ms,
+        }
+
+    def _evaluate_crop(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        primary, primary_ms = _timed(self.kerala_ai.hybrid_engine.get_hybrid_recommendations, payload)
+        candidate, candidate_ms = _timed(self.candidate_crop_engine.get_hybrid_recommendations, payload)
+
+        primary_scores = {r["crop"]: r["score"] for r in primary["all_recommendations"]}
+        candidate_scores = {r["crop"]: r["score"] for r in candidate["all_recommendations"]}
+        common = set(primary_scores) & set(candidate_scores)
+        drift = float(np.mean([abs(primary_scores[c] - candidate_scores[c]) for c in common]) / 100) if common else 0.0
+        primary_top = (primary["primary_recommendation"] or {}).get("crop")
+        candidate_top = (candidate["primary_recommendation"] or {}).get("crop")
+        return {
+            "primary_version": self.kerala_ai.hybrid_engine.model_dir,
+            "candidate_version": self.candidate_crop_engine.model_dir,
+            "primary_label": primary_top,
+            "candidate_label": candidate_top,
+            "agree": int(primary_top == candidate_top),
+            "drift": drift,
+            "primary_ms": primary_ms,
+            "candidate_ms": candidate_ms,
+        }
+
+    # --- Reporting --------------------------------------------------------------------
+    def summary(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {
+            "enabled_kinds": self.kinds,
+            "sample_rate": self.sample_rate,
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "kinds": {},
+        }
+        if not os.path.exists(self.db_path):
+            return report
+        conn = self._connect()
+        try:
+            for kind in self.kinds:
+                rows = conn.execute(
+                    "SELECT agree, drift, primary_ms, candidate_ms, primary_version, candidate_version "
+                    "FROM shadow_evaluations WHERE kind = ? ORDER BY id DESC LIMIT ?",
+                    (kind, SUMMARY_WINDOW),
+                ).fetchall()
+                if not rows:
+                    continue
+                agree, drift, primary_ms, candidate_ms = (np.array(col, dtype=float) for col in list(zip(*rows))[:4])
+                report["kinds"][kind] = {
+                    "samples": len(rows),
+                    "agreement_rate": round(float(agree.mean()), 4),
+                    "drift_mean": round(float(drift.mean()), 4),
+                    "drift_p95": round(float(np.percentile(drift, 95)), 4),
+                    "primary_ms": {"p50": round(float(np.percentile(primary_ms, 50)), 3),
+                                   "p95": round(float(np.percentile(primary_ms, 95)), 3)},
+                    "candidate_ms": {"p50": round(float(np.percentile(candidate_ms, 50)), 3),
+                                     "p95": round(float(np.percentile(candidate_ms, 95)), 3)},
+                    "primary_version": rows[0][4],
+                    "candidate_version": rows[0][5],
+                }
+        finally:
+            conn.close()
+        return report
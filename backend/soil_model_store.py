@@ -0,0 +1,146 @@
+"""
+Versioned storage for the soil classification artifacts
+
+Full training writes the four unified_soil_* files into ml_model/models/.
+Published versions live alongside them in models/soil_versions/v<N>/ and
+models/soil_versions/CURRENT names the one to serve. When no version has
+been published, the flat files are used as before.
+
+Each location may also hold a single-file bundle (see model_bundle.py),
+which serving prefers; training keeps using the joblib files because it
+needs the real sklearn estimators. The bundle records the hashes of the
+joblib files it was built from, and a flat-directory bundle that no longer
+matches them is skipped. Bundles are build output, not checked in:
+
+    python -m backend.model_bundle ml_model/models
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from .model_bundle import BUNDLE_FILE, BundleError, load_bundle, write_bundle
+except ImportError:
+    from model_bundle import BUNDLE_FILE, BundleError, load_bundle, write_bundle
+
+SOIL_ARTIFACT_FILES = {
+    "classifier": "unified_soil_model.joblib",
+    "scaler": "unified_soil_scaler.joblib",
+    "encoder": "unified_soil_encoder.joblib",
+    "info": "unified_soil_info.joblib",
+}
+VERSIONS_DIR = "soil_versions"
+CURRENT_POINTER = "CURRENT"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SoilArtifacts:
+    version: Optional[str]
+    classifier: Any
+    scaler: Any
+    encoder: Any
+    info: Dict[str, Any]
+
+
+def current_version(model_dir) -> Optional[str]:
+    """Name of the published version to serve, or None for the flat files"""
+    pointer = Path(model_dir) / VERSIONS_DIR / CURRENT_POINTER
+    try:
+        version = pointer.read_text().strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def list_versions(model_dir) -> List[str]:
+    root = Path(model_dir) / VERSIONS_DIR
+    if not root.is_dir():
+        return []
+    versions = [p.name for p in root.iterdir() if p.is_dir() and p.name[:1] == "v" and p.name[1:].isdigit()]
+    return sorted(versions, key=lambda name: int(name[1:]))
+
+
+def source_signatures(directory) -> Dict[str, str]:
+    """SHA-256 of each soil joblib file present in ``directory``"""
+    signatures = {}
+    for filename in SOIL_ARTIFACT_FILES.values():
+        path = Path(directory) / filename
+        if path.exists():
+            signatures[filename] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return signatures
+
+
+def load_soil_artifacts(model_dir, use_bundle: bool = True) -> SoilArtifacts:
+    """Load the current soil artifacts; raises FileNotFoundError if any are missing
+
+    Refuses (BundleError) artifacts whose recorded version doesn't match
+    the directory they were loaded from, e.g. after a half-copied deploy.
+    """
+    version = current_version(model_dir)
+    source = Path(model_dir) / VERSIONS_DIR / version if version else Path(model_dir)
+
+    if use_bundle and (source / BUNDLE_FILE).exists():
+        bundle = load_bundle(source / BUNDLE_FILE, expected_version=version)
+        # Version directories are written in one piece; the flat files can be
+        # retrained or copied over without rebuilding the bundle next to them
+        signatures = source_signatures(source) if version is None else {}
+        if not signatures or bundle.manifest.get("sources") == signatures:
+            return SoilArtifacts(version=version, classifier=bundle.classifier, scaler=bundle.scaler,
+                                 encoder=bundle.encoder, info=bundle.info)
+        logger.warning("%s does not match the joblib files next to it; loading those instead", source / BUNDLE_FILE)
+
+    import joblib
+
+    loaded = {name: joblib.load(source / filename) for name, filename in SOIL_ARTIFACT_FILES.items()}
+    if version is not None and loaded["info"].get("version") != version:
+        raise BundleError(f"{source}: info file is from version {loaded['info'].get('version')!r}, expected {version!r}")
+    return SoilArtifacts(version=version, **loaded)
+
+
+def publish_soil_version(model_dir, classifier, scaler, encoder, info: Dict[str, Any], keep: int = 5) -> str:
+    """Write a new version directory and point CURRENT at it; returns the version name
+
+    The directory is written under a temporary name and renamed into place,
+    and CURRENT is replaced atomically, so a reader never sees a partial
+    version. Only the newest ``keep`` versions are retained.
+    """
+    import joblib
+
+    root = Path(model_dir) / VERSIONS_DIR
+    root.mkdir(parents=True, exist_ok=True)
+    existing = list_versions(model_dir)
+    version = f"v{int(existing[-1][1:]) + 1 if existing else 1}"
+
+    info = dict(info)
+    info["version"] = version
+    info["parent_version"] = current_version(model_dir)
+    info["published_at"] = datetime.now().isoformat()
+
+    staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=root))
+    try:
+        artifacts = {"classifier": classifier, "scaler": scaler, "encoder": encoder, "info": info}
+        for name, filename in SOIL_ARTIFACT_FILES.items():
+            joblib.dump(artifacts[name], staging / filename)
+        write_bundle(staging / BUNDLE_FILE, classifier, scaler, encoder, info, model_version=version,
+                     sources=source_signatures(staging))
+        os.rename(staging, root / version)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    pointer_tmp = root / f".{CURRENT_POINTER}.tmp"
+    pointer_tmp.write_text(version + "\n")
+    os.replace(pointer_tmp, root / CURRENT_POINTER)
+
+    for old in list_versions(model_dir)[:-keep] if keep > 0 else []:
+        shutil.rmtree(root / old, ignore_errors=True)
+    return version
@@ -3,8 +3,9 @@ Intelligent Crop Suitability Engine
 Rule-based system that calculates suitability scores for all crops
 """
 
-from typing import Dict, List, Tuple
-from crop_database import CROP_REQUIREMENTS, get_all_crops
+from typing import Dict, List, Mapping, Optional, Tuple
+import numpy as np
+from crop_database import CROP_REQUIREMENTS, SUITABLE_SCORE, get_all_crops
 
 def calculate_suitability_score(user_input: Dict, crop_name: str, requirements: Dict) -> Tuple[float, str]:
     """
@@ -151,19 +152,69 @@ def calculate_suitability_score(user_input: Dict, crop_name: str, requirements:
     
     return round(score, 1), reason
 
-def calculate_all_suitabilities(user_input: Dict) -> List[Dict]:
+def calculate_suitability_scores(features: Mapping[str, np.ndarray], requirements: Dict) -> np.ndarray:
+    """
+    Vectorized calculate_suitability_score: the same fatal checks and
+    penalties applied to whole arrays of inputs at once
+
+    Args:
+        features: Mapping of N, P, K, temperature, humidity, ph, rainfall to equal-length arrays
+        requirements: Crop requirements from database
+
+    Returns:
+        float64 array of scores (0-100), identical to the scalar engine's
+    """
+    N = np.asarray(features["N"], dtype=np.float64)
+    P = np.asarray(features["P"], dtype=np.float64)
+    K = np.asarray(features["K"], dtype=np.float64)
+    temp = np.asarray(features["temperature"], dtype=np.float64)
+    humidity = np.asarray(features["humidity"], dtype=np.float64)
+    ph = np.asarray(features["ph"], dtype=np.float64)
+    rainfall = np.asarray(features["rainfall"], dtype=np.float64)
+
+    n_min, n_max = requirements["N"]
+    p_min, p_max = requirements["P"]
+    k_min, k_max = requirements["K"]
+    t_min, t_max = requirements["temp"]
+    h_min, h_max = requirements["humidity"]
+    ph_min, ph_max = requirements["pH"]
+    r_min, r_max = requirements["rainfall"]
+
+    fatal = (
+        (K < k_min * 0.2) | (N < n_min * 0.4) | (P < p_min * 0.4)
+        | (ph < ph_min - 1.0) | (ph > ph_max + 1.0)
+        | (temp < t_min - 5) | (temp > t_max + 5)
+        | (rainfall < r_min * 0.3)
+    )
+
+    score = np.full(N.shape, 100.0)
+    score -= 40 * ~((h_min <= humidity) & (humidity <= h_max))
+    score -= 40 * ~((t_min <= temp) & (temp <= t_max))
+    score -= 30 * ~((r_min <= rainfall) & (rainfall <= r_max))
+    score -= np.where(K < k_min, 30, np.where(K > k_max, 5, 0))
+    score -= np.where(P < p_min, 20, np.where(P > p_max, 5, 0))
+    score -= np.where(N < n_min, 20, np.where(N > n_max, 5, 0))
+    score -= 20 * ~((ph_min <= ph) & (ph <= ph_max))
+
+    score = np.maximum(score, 0.0)
+    score[fatal] = 0.0
+    return score
+
+def calculate_all_suitabilities(user_input: Dict, crop_table: Optional[Dict] = None) -> List[Dict]:
     """
     Calculate suitability scores for all crops
     
     Args:
         user_input: Dictionary with soil and climate parameters
+        crop_table: Crop requirements to score against (default CROP_REQUIREMENTS)
     
     Returns:
         List of dictionaries with crop, score, and reason
     """
     results = []
+    crop_table = CROP_REQUIREMENTS if crop_table is None else crop_table
     
-    for crop_name, requirements in CROP_REQUIREMENTS.items():
+    for crop_name, requirements in crop_table.items():
         score, reason = calculate_suitability_score(user_input, crop_name, requirements)
         
         results.append({
@@ -186,18 +237,19 @@ def calculate_all_suitabilities(user_input: Dict) -> List[Dict]:
     
     return results
 
-def get_top_recommendations(user_input: Dict, top_n: int = 5) -> Dict:
+def get_top_recommendations(user_input: Dict, top_n: int = 5, crop_table: Optional[Dict] = None) -> Dict:
     """
     Get top N crop recommendations with detailed analysis
     
     Args:
         user_input: Dictionary with soil and climate parameters
         top_n: Number of top recommendations to return
+        crop_table: Crop requirements to score against (default CROP_REQUIREMENTS)
     
     Returns:
         Dictionary with primary recommendation and alternatives
     """
-    all_scores = calculate_all_suitabilities(user_input)
+    all_scores = calculate_all_suitabilities(user_input, crop_table)
     
     # Get top recommendations
     top_crops = all_scores[:top_n]
@@ -219,7 +271,7 @@ def get_top_recommendations(user_input: Dict, top_n: int = 5) -> Dict:
         "alternative_recommendations": alternatives,
         "overall_confidence": round(overall_confidence, 1),
         "total_crops_evaluated": len(all_scores),
-        "suitable_crops": len([c for c in all_scores if c["score"] > 50]),
+        "suitable_crops": len([c for c in all_scores if c["score"] > SUITABLE_SCORE]),
         "analysis_timestamp": "2024-01-01T00:00:00Z",  # Will be updated by API
         "model_version": "rule-based-v1.0"
     }
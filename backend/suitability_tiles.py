@@ -0,0 +1,345 @@
+"""
+Precomputed crop suitability tiles for a gridded soil/climate raster
+
+The offline job reads one 2-D layer per feature (N, P, K, ph, temperature,
+humidity, rainfall) from <feature>.npy or <feature>.tif in a raster
+directory, plus an optional integer district.npy / district.tif (0 =
+outside every district) and districts.json naming the labels. Layers are
+memory-mapped and streamed in row blocks through the hybrid engine's batch
+scorer, and each crop's scores (0-100, NODATA where any input is missing)
+are written to a memory-mapped uint8 array of the raster's shape, along
+with the best crop per cell and per-district totals. A region's output
+lives in TILES_DIR/<region>/ and is swapped in whole when a run finishes.
+
+Serving only slices those arrays, so map views never score anything.
+
+    python backend/suitability_tiles.py path/to/raster --region kerala
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .regions import DEFAULT_REGION, ML_MODEL_DIR, load_region_profile, region_key
+    from .crop_database import SUITABLE_SCORE
+except ImportError:
+    from regions import DEFAULT_REGION, ML_MODEL_DIR, load_region_profile, region_key
+    from crop_database import SUITABLE_SCORE
+
+TILES_DIR = Path(os.getenv("TILES_DIR", ML_MODEL_DIR / "tiles"))
+RASTER_FEATURES = ("N", "P", "K", "ph", "temperature", "humidity", "rainfall")
+TILE_SIZE = 256
+NODATA = 255
+BEST_CROP_LAYER = "best_crop"
+# Cells scored per batch: bounds the (cells x crops) score block in memory
+BLOCK_CELLS = 262_144
+MANIFEST = "manifest.json"
+
+
+# --- Reading rasters --------------------------------------------------------------
+def read_layer(path: Path) -> np.ndarray:
+    """A 2-D raster layer, memory-mapped where the format allows"""
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    try:
+        import tifffile
+    except ImportError as exc:
+        raise RuntimeError(f"Reading {path.name} needs tifffile (pip install tifffile)") from exc
+    try:
+        return tifffile.memmap(path, mode="r")
+    except ValueError:  # compressed or tiled: not mappable
+        return tifffile.imread(path)
+
+
+def _find_layer(raster_dir: Path, name: str) -> Optional[Path]:
+    for suffix in (".npy", ".tif", ".tiff"):
+        if (raster_dir / f"{name}{suffix}").exists():
+            return raster_dir / f"{name}{suffix}"
+    return None
+
+
+def open_raster(raster_dir, constants: Optional[Mapping[str, float]] = None
+                ) -> Tuple[Dict[str, Any], Optional[np.ndarray], Dict[int, str]]:
+    """Feature layers (arrays, or floats from ``constants``), district labels and district names"""
+    raster_dir = Path(raster_dir)
+    constants = constants or {}
+    layers: Dict[str, Any] = {}
+    for feature in RASTER_FEATURES:
+        path = _find_layer(raster_dir, feature)
+        if path is not None:
+            layers[feature] = read_layer(path)
+        elif feature in constants:
+            layers[feature] = float(constants[feature])
+        else:
+            raise ValueError(f"No {feature} layer in {raster_dir} and no constant given for it")
+    shapes = {layer.shape for layer in layers.values() if isinstance(layer, np.ndarray)}
+    if len(shapes) != 1 or len(next(iter(shapes))) != 2:
+        raise ValueError(f"Raster layers must be 2-D and share one shape, got {sorted(shapes)}")
+
+    districts = None
+    path = _find_layer(raster_dir, "district")
+    if path is not None:
+        districts = read_layer(path)
+        if districts.shape not in shapes:
+            raise ValueError(f"district layer shape {districts.shape} doesn't match the features {shapes.pop()}")
+    names: Dict[int, str] = {}
+    if (raster_dir / "districts.json").exists():
+        with open(raster_dir / "districts.json") as fh:
+            names = {int(label): str(name) for label, name in json.load(fh).items()}
+    return layers, districts, names
+
+
+# --- Offline job ----------------------------------------------------------------
+def build_tiles(
+    raster_dir,
+    region: str = DEFAULT_REGION,
+    out_dir=None,
+    engine=None,
+    constants: Optional[Mapping[str, float]] = None,
+    tile_size: int = TILE_SIZE,
+    block_cells: int = BLOCK_CELLS,
+    rule_only: bool = False,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> Path:
+    """Score every cell of the raster for every crop and publish the tile arrays; returns the region's tile directory
+
+    ``engine`` defaults to a HybridEngine over the region's crop table and
+    models. With ``rule_only`` the ML half of the hybrid score is skipped.
+    ``on_progress`` is called after each row block with the rows scored so
+    far and the raster height.
+    """
+    region = region_key(region)
+    if engine is None:
+        from hybrid_engine import HybridEngine
+
+        profile = load_region_profile(region)
+        engine = HybridEngine(model_dir=str(profile.model_dir / "advanced"), crop_table=profile.crop_table)
+    layers, districts, names = open_raster(raster_dir, constants)
+    height, width = next(layer.shape for layer in layers.values() if isinstance(layer, np.ndarray))
+    crops = list(engine.rules().crops)
+    if len(crops) >= NODATA:
+        raise ValueError(f"At most {NODATA - 1} crops fit the uint8 best-crop layer")
+
+    root = Path(out_dir or TILES_DIR)
+    root.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{region}-", dir=root))
+    try:
+        scores_out = {
+            crop: np.lib.format.open_memmap(staging / f"{crop}.npy", mode="w+", dtype=np.uint8, shape=(height, width))
+            for crop in crops
+        }
+        best_out = np.lib.format.open_memmap(staging / f"{BEST_CROP_LAYER}.npy", mode="w+", dtype=np.uint8,
+                                             shape=(height, width))
+        n_districts = int(np.max(districts)) + 1 if districts is not None else 1
+        cells = np.zeros(n_districts)
+        sums = np.zeros((n_districts, len(crops)))
+        suitable = np.zeros((n_districts, len(crops)))
+
+        start = time.perf_counter()
+        block_rows = max(1, block_cells // width)
+        for top in range(0, height, block_rows):
+            rows = slice(top, min(top + block_rows, height))
+            n_rows = rows.stop - rows.start
+            block = {
+                feature: (np.asarray(layer[rows], dtype=np.float64).ravel() if isinstance(layer, np.ndarray)
+                          else np.full(n_rows * width, layer))
+                for feature, layer in layers.items()
+            }
+            valid = np.logical_and.reduce([np.isfinite(values) for values in block.values()])
+            features = {feature: values[valid] for feature, values in block.items()}
+
+            tile_scores = np.full((n_rows * width, len(crops)), NODATA, dtype=np.uint8)
+            best = np.full(n_rows * width, NODATA, dtype=np.uint8)
+            if valid.any():
+                if rule_only:
+                    scores = engine.rules().score(features)
+                else:
+                    scores = engine.get_hybrid_scores_batch(features)[2] * 100
+                tile_scores[valid] = np.round(scores).astype(np.uint8)
+                best[valid] = np.argmax(scores, axis=1)
+
+                labels = (np.asarray(districts[rows]).ravel()[valid].astype(np.intp)
+                          if districts is not None else np.zeros(int(valid.sum()), dtype=np.intp))
+                inside = labels > 0 if districts is not None else np.ones(len(labels), dtype=bool)
+                labels, scores = labels[inside], scores[inside]
+                cells += np.bincount(labels, minlength=n_districts)
+                for j in range(len(crops)):
+                    sums[:, j] += np.bincount(labels, weights=scores[:, j], minlength=n_districts)
+                    suitable[:, j] += np.bincount(labels, weights=scores[:, j] > SUITABLE_SCORE, minlength=n_districts)
+
+            for j, crop in enumerate(crops):
+                scores_out[crop][rows] = tile_scores[:, j].reshape(n_rows, width)
+            best_out[rows] = best.reshape(n_rows, width)
+            if on_progress is not None:
+                on_progress(rows.stop, height)
+        for array in (*scores_out.values(), best_out):
+            array.flush()
+        del scores_out, best_out
+
+        np.save(staging / "district_cells.npy", cells)
+        np.save(staging / "district_score_sums.npy", sums)
+        np.save(staging / "district_suitable_cells.npy", suitable)
+        labels = range(1, n_districts) if districts is not None else [0]
+        manifest = {
+            "region": region,
+            "shape": [height, width],
+            "tile_size": tile_size,
+            "crops": crops,
+            "nodata": NODATA,
+            "suitable_score": SUITABLE_SCORE,
+            "scores": "rule" if rule_only else "hybrid",
+            "districts": {str(label): names.get(label, f"District {label}" if label else "All") for label in labels
+                          if cells[label] > 0 or label in names},
+            "source": str(Path(raster_dir).resolve()),
+            "constants": dict(constants or {}),
+            "built_at": datetime.now().isoformat(),
+            "build_seconds": round(time.perf_counter() - start, 2),
+        }
+        with open(staging / MANIFEST, "w") as fh:
+            json.dump(manifest, fh, indent=2)
+
+        # Swap the finished directory in; open memmaps of the old one stay valid
+        target = root / region
+        previous = None
+        if target.exists():
+            previous = Path(tempfile.mkdtemp(prefix=f".{region}-old-", dir=root))
+            os.rename(target, previous / region)
+        os.rename(staging, target)
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+
+# --- Serving --------------------------------------------------------------------
+class TileStore:
+    """Read-only view over one region's published tile arrays"""
+
+    def __init__(self, path) -> None:
+        self.path = Path(path)
+        with open(self.path / MANIFEST) as fh:
+            self.manifest: Dict[str, Any] = json.load(fh)
+        self.crops: List[str] = self.manifest["crops"]
+        self.height, self.width = self.manifest["shape"]
+        self.tile_size = int(self.manifest["tile_size"])
+        self.district_names = {int(label): name for label, name in self.manifest["districts"].items()}
+        self._layers: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self.cells = np.load(self.path / "district_cells.npy", mmap_mode="r")
+        self.score_sums = np.load(self.path / "district_score_sums.npy", mmap_mode="r")
+        self.suitable_cells = np.load(self.path / "district_suitable_cells.npy", mmap_mode="r")
+
+    @property
+    def grid(self) -> Tuple[int, int]:
+        """Tile rows and columns"""
+        return -(-self.height // self.tile_size), -(-self.width // self.tile_size)
+
+    def layer(self, name: str) -> np.ndarray:
+        if name != BEST_CROP_LAYER and name not in self.crops:
+            raise KeyError(name)
+        with self._lock:
+            if name not in self._layers:
+                self._layers[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+            return self._layers[name]
+
+    def tile(self, name: str, row: int, col: int) -> np.ndarray:
+        """One tile of a crop's scores (or the best-crop layer); edge tiles are smaller"""
+        rows, cols = self.grid
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise IndexError(f"Tile ({row}, {col}) is outside the {rows} x {cols} grid")
+        size = self.tile_size
+        return np.array(self.layer(name)[row * size:(row + 1) * size, col * size:(col + 1) * size])
+
+    def district_label(self, district: str) -> int:
+        lookup = {name.lower(): label for label, name in self.district_names.items()}
+        key = str(district).strip().lower()
+        if key in lookup:
+            return lookup[key]
+        if key.isdigit() and int(key) in self.district_names:
+            return int(key)
+        raise KeyError(district)
+
+    def district_summary(self, district: str) -> Dict[str, Any]:
+        """Per-crop mean score and suitable share over a district's scored cells, best first"""
+        label = self.district_label(district)
+        cells = float(self.cells[label])
+        crops = [
+            {
+                "crop": crop,
+                "mean_score": round(float(self.score_sums[label, j]) / cells, 2) if cells else 0.0,
+                "suitable_share": round(float(self.suitable_cells[label, j]) / cells, 4) if cells else 0.0,
+            }
+            for j, crop in enumerate(self.crops)
+        ]
+        crops.sort(key=lambda item: -item["mean_score"])
+        return {"district": self.district_names[label], "cells": int(cells), "crops": crops}
+
+    def summary(self) -> Dict[str, Any]:
+        rows, cols = self.grid
+        return {
+            **{key: self.manifest[key] for key in ("region", "shape", "tile_size", "crops", "nodata", "scores", "built_at")},
+            "grid": [rows, cols],
+            "layers": self.crops + [BEST_CROP_LAYER],
+            "districts": sorted(self.district_names.values()),
+        }
+
+
+_tile_stores: Dict[str, Tuple[int, TileStore]] = {}
+_tile_lock = threading.Lock()
+
+
+def get_tile_store(region: Optional[str] = None, tiles_dir=None) -> TileStore:
+    """A region's published tiles, reopened after a rebuild; FileNotFoundError if none exist"""
+    path = Path(tiles_dir or TILES_DIR) / region_key(region or DEFAULT_REGION)
+    signature = os.stat(path / MANIFEST).st_mtime_ns
+    key = str(path)
+    cached = _tile_stores.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with _tile_lock:
+        cached = _tile_stores.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, TileStore(path))
+            _tile_stores[key] = cached
+        return cached[1]
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute per-crop suitability tiles for a raster")
+    parser.add_argument("raster_dir", help="Directory of <feature>.npy/.tif layers, optional district layer")
+    parser.add_argument("--region", default=DEFAULT_REGION)
+    parser.add_argument("--out", default=None, help=f"Tile root (default {TILES_DIR})")
+    parser.add_argument("--constant", action="append", default=[], metavar="FEATURE=VALUE",
+                        help="Value for a feature with no layer, e.g. humidity=80")
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE)
+    parser.add_argument("--block-cells", type=int, default=BLOCK_CELLS)
+    parser.add_argument("--rule-only", action="store_true", help="Rule-engine scores, no ML")
+    args = parser.parse_args(argv)
+
+    constants = {name: float(value) for name, value in (pair.split("=", 1) for pair in args.constant)}
+    target = build_tiles(args.raster_dir, args.region, args.out, constants=constants, tile_size=args.tile_size,
+                         block_cells=args.block_cells, rule_only=args.rule_only,
+                         on_progress=lambda done, total: print(f"\rScored {done:,} of {total:,} rows", end="", flush=True))
+    print()
+    store = get_tile_store(args.region, args.out)
+    rows, cols = store.grid
+    print(f"Wrote {len(store.crops)} crop layers ({store.height} x {store.width}, {rows} x {cols} tiles) to {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,10 +6,12 @@ try:
     from .db import get_db
     from .models import User
     from .schemas import UserOut, UserUpdate
+    from .auth import principal_cache
 except ImportError:
     from db import get_db
     from models import User
     from schemas import UserOut, UserUpdate
+    from auth import principal_cache
 
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -39,6 +41,7 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(user_id)
     return {"message": "User deleted successfully"}
 
 
@@ -60,6 +63,7 @@ def update_current_user(user_update: UserUpdate, db: Session = Depends(get_db)):
     
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(user.id)
     return user
 
 
@@ -80,6 +84,7 @@ def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get
     
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(user.id)
     return user
 
 
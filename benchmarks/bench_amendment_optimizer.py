@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark the amendment optimizer and check it against random search.
+
+For random soils, times optimize_amendments over every crop, then scores
+--samples random amendments per soil with the compiled rules and fails if
+any of them reaches the target more cheaply (beyond the optimizer's 0.01
+rounding) or reaches a higher score where the optimizer found the target
+unreachable.
+
+    python benchmarks/bench_amendment_optimizer.py --soils 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+BOUNDS = {"N": (0.0, 300.0), "P": (0.0, 300.0), "K": (0.0, 400.0), "ph": (3.5, 10.0)}
+COSTS = {"N": 1.0, "P": 3.0, "K": 2.0, "lime": 30.0, "sulfur": 50.0}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Amendment optimizer vs random search")
+    parser.add_argument("--soils", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=100_000, help="Random amendments tried per soil")
+    args = parser.parse_args()
+
+    import numpy as np
+    from crop_database import CROP_REQUIREMENTS
+    from rule_compiler import get_compiled_rules
+    from amendment_optimizer import GOOD_SCORE, optimize_amendments
+
+    compiled = get_compiled_rules()
+    rng = np.random.default_rng(0)
+    timings, violations, reachable = [], 0, 0
+    for _ in range(args.soils):
+        soil = {
+            "N": float(rng.uniform(0, 120)), "P": float(rng.uniform(5, 80)), "K": float(rng.uniform(5, 150)),
+            "ph": float(np.round(rng.uniform(4, 9), 1)), "temperature": float(rng.uniform(15, 35)),
+            "humidity": float(rng.uniform(40, 95)), "rainfall": float(rng.uniform(200, 2500)),
+        }
+        start = time.perf_counter()
+        results = {r["crop"]: r for r in optimize_amendments(soil, compiled, CROP_REQUIREMENTS, costs=COSTS, bounds=BOUNDS)}
+        timings.append((time.perf_counter() - start) * 1000)
+
+        # Cubed uniforms favour small additions, where the optimum usually is
+        features = {name: np.full(args.samples, value) for name, value in soil.items()}
+        for name in ("N", "P", "K"):
+            features[name] = soil[name] + rng.random(args.samples) ** 3 * (BOUNDS[name][1] - soil[name])
+        features["ph"] = rng.uniform(*BOUNDS["ph"], args.samples)
+        scores = compiled.score(features)
+        delta_ph = features["ph"] - soil["ph"]
+        cost = sum(COSTS[name] * (features[name] - soil[name]) for name in ("N", "P", "K"))
+        cost = cost + np.where(delta_ph > 0, COSTS["lime"], COSTS["sulfur"]) * np.abs(delta_ph)
+
+        for j, crop in enumerate(compiled.crops):
+            result, hits = results[crop], scores[:, j] >= GOOD_SCORE
+            if result["reaches_target"]:
+                reachable += 1
+                violations += bool(hits.any() and cost[hits].min() < result["cost"] - 0.2)
+            else:
+                violations += bool(hits.any() or scores[:, j].max() > result["score_after"])
+
+    print(f"{args.soils} soils x {len(compiled.crops)} crops: p50 {np.percentile(timings, 50):.2f}ms  "
+          f"p95 {np.percentile(timings, 95):.2f}ms per soil (all crops)")
+    print(f"{reachable} crop/soil pairs could reach {GOOD_SCORE:.0f}; violations vs {args.samples:,} random amendments: {violations}")
+    return 0 if violations == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
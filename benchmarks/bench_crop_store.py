@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark CropStore queries over a large synthetic variety table.
+
+Builds --varieties cultivars by jittering the ranges in CROP_REQUIREMENTS,
+writes them to a temporary Parquet file, and times store.query against a
+scalar calculate_suitability_score loop over the same varieties. Fails if
+any variety's score or the returned ranking differs from the scalar one.
+
+    python benchmarks/bench_crop_store.py --varieties 10000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+
+def synthetic_table(n, rng):
+    import pandas as pd
+    from crop_database import CROP_REQUIREMENTS
+    from crop_store import REQUIREMENT_COLUMNS
+
+    names = list(CROP_REQUIREMENTS)
+    base = rng.integers(0, len(names), n)
+    columns = {
+        "crop": [names[i] for i in base],
+        "variety": [f"{names[i]}-{k:05d}" for k, i in enumerate(base)],
+        "category": rng.choice(["cereal", "pulse", "fruit", "vegetable", "plantation"], n),
+        "region": rng.choice(["kerala", "tamil_nadu", "karnataka"], n),
+    }
+    for key, prefix in REQUIREMENT_COLUMNS.items():
+        low = np.array([CROP_REQUIREMENTS[names[i]][key][0] for i in base], dtype=float)
+        high = np.array([CROP_REQUIREMENTS[names[i]][key][1] for i in base], dtype=float)
+        shift = (high - low) * rng.uniform(-0.3, 0.3, n)
+        decimals = 1 if key == "pH" else 0
+        columns[f"{prefix}_min"] = np.round(np.maximum(low + shift, 0), decimals)
+        columns[f"{prefix}_max"] = np.round(high + shift, decimals)
+    columns["soil_types"] = ["Loamy|Clayey"] * n
+    columns["description"] = [""] * n
+    return pd.DataFrame(columns)
+
+
+def random_input(rng):
+    return {
+        "N": float(rng.uniform(0, 150)), "P": float(rng.uniform(5, 150)), "K": float(rng.uniform(5, 250)),
+        "temperature": float(rng.uniform(10, 40)), "humidity": float(rng.uniform(20, 100)),
+        "ph": float(np.round(rng.uniform(4, 9), 1)), "rainfall": float(rng.uniform(50, 2500)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Indexed CropStore vs scalar scan")
+    parser.add_argument("--varieties", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scalar-queries", type=int, default=10, help="Queries checked against the scalar engine")
+    args = parser.parse_args()
+
+    from crop_store import load_crop_store
+    from suitability_engine import calculate_suitability_score
+
+    rng = np.random.default_rng(0)
+    table = synthetic_table(args.varieties, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "varieties.parquet"
+        table.to_parquet(path, index=False)
+        start = time.perf_counter()
+        store = load_crop_store(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+    inputs = [random_input(rng) for _ in range(args.queries)]
+    filters = [(None, None), ("pulse", None), (None, "kerala"), ("fruit", "karnataka")]
+    timings = {f: [] for f in filters}
+    pruned = []
+    for user_input in inputs:
+        for category, region in filters:
+            start = time.perf_counter()
+            result = store.query(user_input, 5, category, region)
+            timings[(category, region)].append((time.perf_counter() - start) * 1000)
+            if category is None and region is None:
+                pruned.append(result["pruned"] / max(result["total_varieties"], 1))
+
+    mismatches = 0
+    scalar_ms = []
+    requirements = [store.requirements(row) for row in range(store.size)]
+    for user_input in inputs[:args.scalar_queries]:
+        start = time.perf_counter()
+        scalar = [calculate_suitability_score(user_input, str(store.variety[row]), requirements[row])[0]
+                  for row in range(store.size)]
+        scalar_ms.append((time.perf_counter() - start) * 1000)
+
+        rows, _ = store.candidates(user_input)
+        full = np.zeros(store.size)
+        full[rows] = store.score(user_input, rows)
+        mismatches += int((full != np.array(scalar)).sum())
+        expected = [str(store.variety[row]) for row in np.argsort(-np.array(scalar), kind="stable")[:5] if scalar[row] > 0]
+        mismatches += [rec["variety"] for rec in store.query(user_input, 5)["recommendations"]] != expected
+
+    print(f"{store.size:,} varieties, loaded in {load_ms:.1f}ms; {np.mean(pruned):.0%} pruned by the interval indexes on average")
+    for (category, region), values in timings.items():
+        label = f"category={category or '*'} region={region or '*'}"
+        print(f"query {label:<32} p50 {np.percentile(values, 50):6.2f}ms  p95 {np.percentile(values, 95):6.2f}ms")
+    print(f"scalar scan                            p50 {np.percentile(scalar_ms, 50):6.2f}ms")
+    print(f"mismatches     {mismatches} ({args.scalar_queries} queries x {store.size:,} varieties)")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
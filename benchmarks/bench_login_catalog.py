@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark mixed login and catalog traffic against the FastAPI app.
+
+Runs the app in-process on a throwaway SQLite database and fires a burst
+of concurrent logins alongside GET /products/ requests, then reports
+latency percentiles for each. Catalog latency should stay flat while
+logins are saturating bcrypt.
+
+    python benchmarks/bench_login_catalog.py --logins 200 --catalog 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def _percentiles(samples):
+    if not samples:
+        return "n/a"
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return (
+        f"p50={pick(0.50) * 1000:7.1f}ms  p95={pick(0.95) * 1000:7.1f}ms  "
+        f"p99={pick(0.99) * 1000:7.1f}ms  mean={statistics.mean(ordered) * 1000:7.1f}ms"
+    )
+
+
+async def _timed(client, method, url, latencies, errors, **kwargs):
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    latencies.append(time.perf_counter() - start)
+    if response.status_code >= 400:
+        errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+
+async def run(args):
+    import httpx
+    from backend.db import SessionLocal, create_schema
+    from backend.models import Product, User
+    from backend.main import app
+    from backend.passwords import hash_password, shutdown_pool
+
+    create_schema()
+    with SessionLocal() as db:
+        hashed = hash_password("benchmark-password")
+        for i in range(args.users):
+            db.add(User(username=f"bench{i}", email=f"bench{i}@example.com", hashed_password=hashed))
+        for i in range(50):
+            db.add(Product(name=f"Seed pack {i}", price=10.0 + i, category="seeds", stock_quantity=100))
+        db.commit()
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    transport = httpx.ASGITransport(app=app)
+    login_latencies, catalog_latencies = [], []
+    login_errors, catalog_errors = {}, {}
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def guarded(coro):
+        async with gate:
+            await coro
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=60) as client:
+        # Warm-up so pool start-up isn't charged to the first requests
+        await client.post("/auth/login", json={"username": "bench0", "password": "benchmark-password"})
+
+        tasks = []
+        for i in range(args.logins):
+            body = {"username": f"bench{i % args.users}", "password": "benchmark-password"}
+            tasks.append(guarded(_timed(client, "POST", "/auth/login", login_latencies, login_errors, json=body)))
+        for _ in range(args.catalog):
+            tasks.append(guarded(_timed(client, "GET", "/products/", catalog_latencies, catalog_errors)))
+        # Shuffle so both kinds of traffic overlap for the whole run
+        random.Random(0).shuffle(tasks)
+
+        start = time.perf_counter()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    shutdown_pool()
+
+    print(f"Total: {args.logins} logins + {args.catalog} catalog requests in {elapsed:.2f}s")
+    print(f"  login   {_percentiles(login_latencies)}  errors={login_errors}")
+    print(f"  catalog {_percentiles(catalog_latencies)}  errors={catalog_errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--catalog", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=20)
+    # Keep below the SQLAlchemy pool size (5 + 10 overflow); more in-flight
+    # sync requests than pooled connections stalls on connection checkout
+    parser.add_argument("--concurrency", type=int, default=12)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
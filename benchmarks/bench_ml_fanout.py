@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark HybridEngine.predict_ml_suitability: per-crop models vs one multi-output model.
+
+Trains small random forests on rule-engine targets for every crop in
+CROP_REQUIREMENTS and for synthetic "varieties" (crop requirement ranges
+jittered by a few percent), writes them to temporary model directories in
+both layouts and times predict_ml_suitability through the real
+HybridEngine loader. Per-crop latency grows with the number of models;
+the multi-output model should stay roughly flat.
+
+    python benchmarks/bench_ml_fanout.py --varieties 200 --queries 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+sys.path.insert(0, str(REPO_ROOT / "ml_model"))
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return (
+        f"p50={pick(0.50) * 1000:7.2f}ms  p95={pick(0.95) * 1000:7.2f}ms  "
+        f"mean={statistics.mean(ordered) * 1000:7.2f}ms"
+    )
+
+
+def make_varieties(count, seed):
+    """Requirement sets jittered from the real crops, named <crop>_v<i>"""
+    from crop_database import CROP_REQUIREMENTS
+
+    rng = random.Random(seed)
+    crops = list(CROP_REQUIREMENTS)
+    varieties = {}
+    for i in range(count):
+        base = crops[i % len(crops)]
+        requirements = dict(CROP_REQUIREMENTS[base])
+        for key in ("N", "P", "K", "pH", "temp", "humidity", "rainfall"):
+            low, high = requirements[key]
+            shift = (high - low) * rng.uniform(-0.1, 0.1)
+            requirements[key] = (low + shift, high + shift)
+        varieties[f"{base}_v{i}"] = (base, requirements)
+    return varieties
+
+
+def score_targets(features, requirement_sets):
+    import numpy as np
+    from suitability_engine import calculate_suitability_scores
+
+    columns = {name: features[name].to_numpy() for name in features.columns}
+    return np.column_stack([
+        calculate_suitability_scores(columns, requirements) / 100.0
+        for _, requirements in requirement_sets.values()
+    ])
+
+
+def write_models(X, Y, names, per_crop_dir, multi_dir, forest_params):
+    import joblib
+    from sklearn.ensemble import RandomForestRegressor
+    from hybrid_engine import MULTI_OUTPUT_INFO_FILE, MULTI_OUTPUT_MODEL_FILE
+
+    start = time.perf_counter()
+    for j, name in enumerate(names):
+        model = RandomForestRegressor(**forest_params).fit(X, Y[:, j])
+        joblib.dump(model, os.path.join(per_crop_dir, f"{name}_regressor.joblib"))
+        joblib.dump({"crop_name": name, "algorithm": "RandomForest"}, os.path.join(per_crop_dir, f"{name}_info.joblib"))
+    per_crop_fit = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model = RandomForestRegressor(**forest_params).fit(X, Y)
+    joblib.dump(model, os.path.join(multi_dir, MULTI_OUTPUT_MODEL_FILE))
+    joblib.dump({"crop_name": "all", "algorithm": "RandomForest", "crops": list(names)},
+                os.path.join(multi_dir, MULTI_OUTPUT_INFO_FILE))
+    return per_crop_fit, time.perf_counter() - start
+
+
+def time_engine(model_dir, queries):
+    import contextlib
+    import io
+    from hybrid_engine import HybridEngine
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = HybridEngine(model_dir=model_dir)
+    latencies = []
+    for user_input in queries:
+        start = time.perf_counter()
+        engine.predict_ml_suitability(user_input)
+        latencies.append(time.perf_counter() - start)
+    return engine, latencies
+
+
+def run_case(label, features, requirement_sets, queries, forest_params):
+    names = list(requirement_sets)
+    Y = score_targets(features, requirement_sets)
+    X = features.to_numpy()
+    with tempfile.TemporaryDirectory() as per_crop_dir, tempfile.TemporaryDirectory() as multi_dir:
+        per_crop_fit, multi_fit = write_models(X, Y, names, per_crop_dir, multi_dir, forest_params)
+        per_crop_engine, per_crop = time_engine(per_crop_dir, queries)
+        multi_engine, multi = time_engine(multi_dir, queries)
+
+        # Both layouts must produce a score for every model
+        sample = queries[0]
+        assert set(per_crop_engine.predict_ml_suitability(sample)) == set(names)
+        assert set(multi_engine.predict_ml_suitability(sample)) == set(names)
+        assert multi_engine.multi_output_model is not None
+
+    print(f"\n{label}: {len(names)} models, {len(queries)} queries")
+    print(f"  fit          per-crop {per_crop_fit:6.1f}s   multi-output {multi_fit:6.1f}s")
+    print(f"  per-crop     {_percentiles(per_crop)}")
+    print(f"  multi-output {_percentiles(multi)}")
+    print(f"  speedup      {statistics.mean(per_crop) / statistics.mean(multi):.1f}x (mean)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-crop vs multi-output ML prediction latency")
+    parser.add_argument("--varieties", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=4000, help="Synthetic training rows")
+    parser.add_argument("--trees", type=int, default=20)
+    parser.add_argument("--max-depth", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from crop_database import CROP_REQUIREMENTS
+    from train_crop_models import FEATURE_COLUMNS, build_training_frame
+
+    features = build_training_frame(dataset_path="", augment_samples=args.rows, seed=args.seed)
+    query_rows = build_training_frame(dataset_path="", augment_samples=args.queries * 2, seed=args.seed + 1)
+    queries = query_rows.sample(n=args.queries, random_state=args.seed)[FEATURE_COLUMNS].to_dict("records")
+    forest_params = dict(n_estimators=args.trees, max_depth=args.max_depth, min_samples_leaf=2,
+                         random_state=42, n_jobs=1)
+
+    crops = {name: (name, requirements) for name, requirements in CROP_REQUIREMENTS.items()}
+    run_case("Crops", features, crops, queries, forest_params)
+    if args.varieties:
+        run_case("Varieties", features, make_varieties(args.varieties, args.seed), queries, forest_params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark the rotation planner on synthetic variety tables.
+
+Builds --varieties cultivars by jittering the ranges in CROP_REQUIREMENTS
+and times plan_rotation over random starting soils and season climates.
+On a smaller table (--exact-varieties) it also enumerates every rotation
+with the compiled rule tables and fails if the beam misses the best total.
+
+    python benchmarks/bench_rotation_planner.py --varieties 200 --seasons 3
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+
+def synthetic_table(n, rng):
+    from crop_database import CROP_REQUIREMENTS
+
+    names = list(CROP_REQUIREMENTS)
+    table, families = {}, {}
+    for k, i in enumerate(rng.integers(0, len(names), n)):
+        base = CROP_REQUIREMENTS[names[i]]
+        variety = dict(base)
+        for key in ("N", "P", "K", "pH", "temp", "humidity", "rainfall"):
+            low, high = base[key]
+            shift = (high - low) * rng.uniform(-0.3, 0.3)
+            decimals = 1 if key == "pH" else 0
+            variety[key] = (round(max(low + shift, 0), decimals), round(high + shift, decimals))
+        table[f"{names[i]}-{k:04d}"] = variety
+        families[f"{names[i]}-{k:04d}"] = names[i]
+    return table, families
+
+
+def random_case(rng, seasons):
+    soil = {"N": rng.uniform(20, 140), "P": rng.uniform(15, 90), "K": rng.uniform(30, 250), "ph": rng.uniform(5.0, 7.5)}
+    climate = [
+        {"temperature": rng.uniform(16, 34), "humidity": rng.uniform(45, 92), "rainfall": rng.uniform(100, 2000)}
+        for _ in range(seasons)
+    ]
+    return soil, climate
+
+
+def exhaustive_best(soil, seasons, compiled, table, families):
+    """Best total over every rotation, scoring each season as a block of sequences"""
+    from rotation_planner import NUTRIENTS, REPEAT_PENALTY, nutrient_changes
+
+    crops = list(compiled.crops)
+    changes = nutrient_changes(table, crops)
+    family = np.unique([families[name] for name in crops], return_inverse=True)[1]
+    sequences = np.array(list(itertools.product(range(len(crops)), repeat=len(seasons))))
+    state = np.tile([soil[nutrient] for nutrient in NUTRIENTS], (len(sequences), 1)).astype(float)
+    totals = np.zeros(len(sequences))
+    for s, season in enumerate(seasons):
+        crop = sequences[:, s]
+        features = {nutrient: state[:, j] for j, nutrient in enumerate(NUTRIENTS)}
+        features.update({name: np.full(len(sequences), value) for name, value in season.items()})
+        features["ph"] = np.full(len(sequences), soil["ph"])
+        totals += np.take_along_axis(compiled.score(features), crop[:, None], axis=1)[:, 0]
+        if s:
+            totals -= REPEAT_PENALTY * (family[crop] == family[sequences[:, s - 1]])
+        state = np.maximum(state + changes[crop], 0)
+    return totals.max()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rotation planner latency and optimality")
+    parser.add_argument("--varieties", type=int, default=200)
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--beam-width", type=int, default=64)
+    parser.add_argument("--cases", type=int, default=50)
+    parser.add_argument("--exact-varieties", type=int, default=30, help="Table size checked against full enumeration")
+    parser.add_argument("--exact-cases", type=int, default=20)
+    args = parser.parse_args()
+
+    from rotation_planner import plan_rotation
+    from rule_compiler import compile_rules
+
+    rng = np.random.default_rng(0)
+    table, families = synthetic_table(args.varieties, rng)
+    start = time.perf_counter()
+    compiled = compile_rules(table)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for _ in range(args.cases):
+        soil, seasons = random_case(rng, args.seasons)
+        start = time.perf_counter()
+        plan_rotation(soil, seasons, compiled, table, families=families, beam_width=args.beam_width)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    small, small_families = synthetic_table(args.exact_varieties, rng)
+    small_compiled = compile_rules(small)
+    misses = 0
+    for _ in range(args.exact_cases):
+        soil, seasons = random_case(rng, 3)
+        plan = plan_rotation(soil, seasons, small_compiled, small, families=small_families,
+                             top_n=1, beam_width=args.beam_width)[0]
+        misses += plan["total_score"] != exhaustive_best(soil, seasons, small_compiled, small, small_families)
+
+    print(f"{args.varieties} varieties x {args.seasons} seasons, beam {args.beam_width}; rules compiled in {compile_ms:.1f}ms")
+    print(f"plan_rotation  p50 {np.percentile(timings, 50):6.2f}ms  p95 {np.percentile(timings, 95):6.2f}ms")
+    print(f"optimality     {misses} misses in {args.exact_cases} cases ({args.exact_varieties} varieties x 3 seasons, exhaustive)")
+    return 0 if misses == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
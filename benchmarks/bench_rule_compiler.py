@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled rule engine against the scalar and per-crop vectorized engines.
+
+Scores random inputs, half of them placed on or one ulp either side of a
+rule boundary, for every crop, and fails if any score differs from
+calculate_suitability_score.
+
+    python benchmarks/bench_rule_compiler.py --rows 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compiled vs scalar vs vectorized rule engine")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--scalar-rows", type=int, default=2_000, help="Rows checked against the scalar engine")
+    args = parser.parse_args()
+
+    import numpy as np
+    from crop_database import CROP_REQUIREMENTS
+    from rule_compiler import FEATURES, compile_rules, get_compiled_rules
+    from suitability_engine import calculate_suitability_score, calculate_suitability_scores
+
+    start = time.perf_counter()
+    compile_rules(CROP_REQUIREMENTS)
+    compile_ms = (time.perf_counter() - start) * 1000
+    compiled = get_compiled_rules()
+    crops = list(compiled.crops)
+
+    rng = np.random.default_rng(0)
+    features = {}
+    for feature in FEATURES:
+        points = compiled.breakpoints[feature]
+        edges = np.concatenate([points, np.nextafter(points, -np.inf), np.nextafter(points, np.inf), np.round(points)])
+        uniform = rng.uniform(0, points.max() * 1.2, args.rows)
+        features[feature] = np.where(rng.random(args.rows) < 0.5, rng.choice(edges, args.rows), uniform)
+
+    start = time.perf_counter()
+    compiled_scores = compiled.score(features)
+    compiled_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vector_scores = np.column_stack([calculate_suitability_scores(features, CROP_REQUIREMENTS[name]) for name in crops])
+    vector_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mismatches = 0
+    for i in range(args.scalar_rows):
+        row = {feature: float(values[i]) for feature, values in features.items()}
+        for j, name in enumerate(crops):
+            mismatches += calculate_suitability_score(row, name, CROP_REQUIREMENTS[name])[0] != compiled_scores[i, j]
+    scalar_s = (time.perf_counter() - start) * args.rows / args.scalar_rows
+
+    cells = args.rows * len(crops)
+    print(f"compile        {compile_ms:8.2f}ms  ({sum(len(p) for p in compiled.breakpoints.values())} breakpoints, {len(crops)} crops)")
+    print(f"compiled       {compiled_s * 1000:8.1f}ms  {cells / compiled_s / 1e6:7.1f}M scores/s")
+    print(f"vectorized     {vector_s * 1000:8.1f}ms  {cells / vector_s / 1e6:7.1f}M scores/s")
+    print(f"scalar (est.)  {scalar_s * 1000:8.1f}ms  {cells / scalar_s / 1e6:7.3f}M scores/s")
+    vector_mismatches = int((vector_scores != compiled_scores).sum())
+    print(f"mismatches     scalar {mismatches} ({args.scalar_rows:,} rows)  vectorized {vector_mismatches} ({args.rows:,} rows)")
+    return 0 if mismatches == 0 and vector_mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark seasonal suitability over a year of daily climate.
+
+Times seasonal_suitability for every crop on synthetic daily series, and
+checks every sowing day of every crop against calculate_suitability_score
+on the same window aggregates computed with a plain per-window loop.
+
+    python benchmarks/bench_seasonal_suitability.py --runs 200
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+
+def synthetic_year(rng, days=365):
+    """Monsoon-shaped daily temperature, humidity and rainfall"""
+    phase = 2 * np.pi * (np.arange(days) - 160) / days
+    return {
+        "temperature": 27 + 2 * np.cos(phase + np.pi / 2) + rng.normal(0, 1, days),
+        "humidity": np.clip(78 + 12 * np.cos(phase) + rng.normal(0, 4, days), 20, 100),
+        "rainfall": np.maximum(0, 8 + 12 * np.cos(phase)) * rng.exponential(1, days),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Vectorized sowing-window scoring vs per-window rule calls")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365, choices=(365, 366))
+    args = parser.parse_args()
+
+    from crop_database import CROP_REQUIREMENTS
+    from rule_compiler import get_compiled_rules
+    from seasonal_suitability import DEFAULT_GROWING_MONTHS, GROWING_MONTHS, _start_months, seasonal_suitability
+    from suitability_engine import calculate_suitability_score
+
+    rng = np.random.default_rng(0)
+    climate = synthetic_year(rng, args.days)
+    soil = {"N": 80.0, "P": 45.0, "K": 120.0, "ph": 6.2}
+    compiled = get_compiled_rules()
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        result = seasonal_suitability(soil, climate, compiled)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    months = _start_months(args.days)
+    mismatches = 0
+    start = time.perf_counter()
+    for crop in result["crops"]:
+        name = crop["crop"]
+        window = int(round(GROWING_MONTHS.get(name, DEFAULT_GROWING_MONTHS) * args.days / 12))
+        best = np.zeros(12)
+        for day in range(args.days):
+            idx = np.arange(day, day + window) % args.days
+            user_input = {**soil, "temperature": climate["temperature"][idx].mean(),
+                          "humidity": climate["humidity"][idx].mean(), "rainfall": climate["rainfall"][idx].sum()}
+            score = calculate_suitability_score(user_input, name, CROP_REQUIREMENTS[name])[0]
+            best[months[day]] = max(best[months[day]], score)
+        mismatches += int((best != np.array(list(crop["monthly_scores"].values()))).sum())
+    loop_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{args.days} days x {len(result['crops'])} crops")
+    print(f"seasonal_suitability  p50 {np.percentile(timings, 50):6.2f}ms  p95 {np.percentile(timings, 95):6.2f}ms")
+    print(f"per-window loop       {loop_ms:8.1f}ms")
+    print(f"mismatches     {mismatches} (crop-months)")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
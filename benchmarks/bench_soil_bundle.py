@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Compare the joblib soil artifacts with the single-file bundle.
+
+Reports load time and single-row predict + predict_proba latency for
+both, and fails if the bundle's probabilities or labels differ from the
+sklearn model on the soil dataset plus random out-of-range rows.
+
+    python benchmarks/bench_soil_bundle.py --model-dir ml_model/models
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+FEATURES = ["N", "P", "K", "temperature", "humidity", "ph", "rainfall"]
+
+
+def _median_ms(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="joblib vs bundle soil model load and inference")
+    parser.add_argument("--model-dir", default=str(REPO_ROOT / "ml_model" / "models"))
+    parser.add_argument("--dataset", default=str(REPO_ROOT / "ml_model" / "datasets" / "soil_classification" / "synthetic_soil_dataset.csv"))
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from backend.model_bundle import BUNDLE_FILE, load_bundle
+
+    bundle_path = os.path.join(args.model_dir, BUNDLE_FILE)
+    if not os.path.exists(bundle_path):
+        print(f"{bundle_path} missing; run `python -m backend.model_bundle {args.model_dir}` first")
+        return 1
+
+    start = time.perf_counter()
+    classifier = joblib.load(os.path.join(args.model_dir, "unified_soil_model.joblib"))
+    scaler = joblib.load(os.path.join(args.model_dir, "unified_soil_scaler.joblib"))
+    joblib_load_ms = (time.perf_counter() - start) * 1000
+    bundle_load_ms = _median_ms(lambda: load_bundle(bundle_path), 20)
+    bundle = load_bundle(bundle_path)
+
+    X = pd.read_csv(args.dataset, usecols=FEATURES)[FEATURES].to_numpy(dtype=np.float64)
+    X = np.vstack([X, np.random.default_rng(0).uniform(0, 300, (2000, len(FEATURES)))])
+    expected = classifier.predict_proba(scaler.transform(X))
+    actual = bundle.classifier.predict_proba(bundle.scaler.transform(X))
+    max_diff = float(np.abs(expected - actual).max())
+    labels_match = bool((expected.argmax(axis=1) == actual.argmax(axis=1)).all())
+
+    # KeralaAI scores one row per request with predict + predict_proba
+    row = X[:1]
+    classifier.set_params(n_jobs=1)
+    sklearn_ms = _median_ms(lambda: (classifier.predict(scaler.transform(row)),
+                                     classifier.predict_proba(scaler.transform(row))), args.repeats)
+    bundle_ms = _median_ms(lambda: (bundle.classifier.predict(bundle.scaler.transform(row)),
+                                    bundle.classifier.predict_proba(bundle.scaler.transform(row))), args.repeats)
+
+    print(f"load       joblib {joblib_load_ms:8.1f}ms   bundle {bundle_load_ms:8.2f}ms")
+    print(f"1-row      sklearn {sklearn_ms:7.2f}ms   bundle {bundle_ms:8.2f}ms")
+    print(f"agreement  max |dp|={max_diff:.2e}  labels match: {labels_match} ({len(X):,} rows)")
+    return 0 if labels_match and max_diff < 1e-9 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
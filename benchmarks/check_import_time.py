@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Fail if importing backend.main gets slow or starts loading ML stacks.
+
+Runs `python -X importtime -c "import backend.main"` in a fresh
+interpreter, reads the cumulative import time of backend.main and checks
+that none of the heavy modules below were imported. Exits non-zero on a
+regression so it can gate CI or a pre-push hook.
+
+    python benchmarks/check_import_time.py --budget-ms 2000
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that belong in the lifespan / first request, never at import
+FORBIDDEN_MODULES = ("sklearn", "joblib", "pandas", "scipy", "backend.kerala_ai", "hybrid_engine")
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str, runs: int):
+    """Best-of-N cumulative import time (us) and the set of imported modules"""
+    best = None
+    imported = set()
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr)
+            raise SystemExit(f"import {module} failed")
+        total = None
+        for line in proc.stderr.splitlines():
+            match = _LINE.match(line)
+            if not match:
+                continue
+            imported.add(match.group(4))
+            if match.group(4) == module:
+                total = int(match.group(2))
+        if total is not None and (best is None or total < best):
+            best = total
+    return best, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget check for backend.main")
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--budget-ms", type=float, default=2000.0)
+    parser.add_argument("--runs", type=int, default=3, help="Take the best of N runs to reduce noise")
+    args = parser.parse_args()
+
+    total_us, imported = measure(args.module, args.runs)
+    failures = []
+
+    heavy = sorted(
+        name for name in imported
+        if any(name == forbidden or name.startswith(forbidden + ".") for forbidden in FORBIDDEN_MODULES)
+    )
+    if heavy:
+        failures.append(f"heavy modules imported eagerly: {', '.join(heavy[:10])}")
+
+    total_ms = total_us / 1000.0 if total_us is not None else float("nan")
+    print(f"import {args.module}: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if total_us is None or total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,24 @@ export default function OrdersPage() {
     }
   }, [user]);
 
+  // Live status updates pushed by the server instead of polling
+  useEffect(() => {
+    if (!user?.id) return;
+    const source = new EventSource(
+      `${API_BASE}/orders/stream/user/${user.id}?access_token=${encodeURIComponent(localStorage.getItem('agronova_user_token') || '')}`
+    );
+    source.addEventListener('order_status_changed', (e) => {
+      const event = JSON.parse(e.data);
+      setOrders((prev) => prev.map((order) =>
+        order.id === event.order_id ? { ...order, status: event.status } : order
+      ));
+    });
+    source.addEventListener('order_created', () => {
+      fetchOrders();
+    });
+    return () => source.close();
+  }, [user]);
+
   const fetchOrders = async () => {
     try {
       const response = await fetch(`${API_BASE}/orders/user/${user.id}`);
@@ -96,16 +114,19 @@ export default function OrdersPage() {
     setCancellingOrderId(orderId);
     
     try {
-      const response = await fetch(`${API_BASE}/orders/${orderId}/cancel?user_id=${user.id}`, {
+      const response = await fetch(`${API_BASE}/orders/${orderId}/cancel`, {
         method: 'PATCH',
         headers: {
-          'Content-Type': 'application/json'
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('agronova_user_token')}`
         }
       });
 
       if (response.ok) {
-        // Refresh orders list
-        await fetchOrders();
+        const updated = await response.json();
+        setOrders((prev) => prev.map((order) =>
+          order.id === updated.id ? { ...order, status: updated.status } : order
+        ));
         showSuccessNotification("Order Cancelled", "Your order has been cancelled successfully");
       } else {
         const errorData = await response.json().catch(() => ({ detail: 'Failed to cancel order' }));
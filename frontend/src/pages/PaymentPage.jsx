@@ -339,10 +339,11 @@ export default function PaymentPage() {
       }
 
       // Save order to database
-      const response = await fetch(`${API_BASE}/orders/?user_id=${user?.id}`, {
+      const response = await fetch(`${API_BASE}/orders/`, {
         method: 'POST',
         headers: {
-          'Content-Type': 'application/json'
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${localStorage.getItem('agronova_user_token')}`
         },
         body: JSON.stringify(orderData)
       });
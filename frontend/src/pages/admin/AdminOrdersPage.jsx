@@ -16,6 +16,23 @@ export default function AdminOrdersPage() {
     fetchAllOrders();
   }, []);
 
+  // Live status updates pushed by the server instead of polling
+  useEffect(() => {
+    const source = new EventSource(
+      `${API_BASE}/orders/stream/admin?access_token=${encodeURIComponent(localStorage.getItem('agronova_user_token') || '')}`
+    );
+    source.addEventListener('order_status_changed', (e) => {
+      const event = JSON.parse(e.data);
+      setOrders((prev) => prev.map((order) =>
+        order.id === event.order_id ? { ...order, status: event.status } : order
+      ));
+    });
+    source.addEventListener('order_created', () => {
+      fetchAllOrders();
+    });
+    return () => source.close();
+  }, []);
+
   const fetchAllOrders = async () => {
     try {
       const response = await fetch(`${API_BASE}/orders/admin/all`);
@@ -90,8 +107,10 @@ export default function AdminOrdersPage() {
       });
 
       if (response.ok) {
-        // Refresh orders list
-        await fetchAllOrders();
+        const updated = await response.json();
+        setOrders((prev) => prev.map((order) =>
+          order.id === updated.id ? { ...order, status: updated.status } : order
+        ));
         alert(`Order status updated to ${newStatus}`);
       } else {
         const errorData = await response.json().catch(() => ({ detail: 'Failed to update order status' }));
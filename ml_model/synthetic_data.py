@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Synthetic Soil Dataset Generator
+Samples soil/climate rows from the ranges in CROP_REQUIREMENTS and labels
+them with the rule engine's suitability scores, in NumPy chunks
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# The backend modules use flat imports, so put backend/ itself on the path
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, os.path.abspath(BACKEND_DIR))
+
+from crop_database import CROP_REQUIREMENTS  # noqa: E402
+from suitability_engine import calculate_suitability_scores  # noqa: E402
+
+# Same column order as the soil datasets in datasets/
+FEATURE_COLUMNS = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
+# CROP_REQUIREMENTS key for each feature column
+REQUIREMENT_KEYS = {
+    'N': 'N', 'P': 'P', 'K': 'K', 'ph': 'pH',
+    'temperature': 'temp', 'humidity': 'humidity', 'rainfall': 'rainfall',
+}
+# Physically possible values; samples are clipped to these
+PHYSICAL_BOUNDS = {
+    'N': (0.0, np.inf), 'P': (0.0, np.inf), 'K': (0.0, np.inf), 'ph': (0.0, 14.0),
+    'temperature': (-np.inf, np.inf), 'humidity': (0.0, 100.0), 'rainfall': (0.0, np.inf),
+}
+DEFAULT_CHUNK_SIZE = 250_000
+
+class SyntheticSoilGenerator:
+    """Generates labelled rows in chunks from crop requirement ranges
+
+    Each row picks a source crop, then draws every feature uniformly inside
+    that crop's range plus Gaussian noise (``noise`` x range width). With
+    probability ``tail_fraction`` a feature is instead pushed outside the
+    range by up to ``tail_width`` x range width, so the data also covers
+    marginal and failing soils. Rows are labelled with the rule engine's
+    score for the source crop (``suitability``) and, with
+    ``label_all_crops``, with a ``score_<crop>`` column for every crop.
+
+    Chunk ``i`` is drawn from its own child of ``SeedSequence(seed)``, so a
+    given seed and chunk size always produce the same rows.
+    """
+
+    def __init__(self, requirements=None, crops=None, noise=0.05, tail_fraction=0.1,
+                 tail_width=1.0, seed=42, label_all_crops=False):
+        requirements = requirements or CROP_REQUIREMENTS
+        self.crops = list(crops or requirements.keys())
+        self.requirements = {crop: requirements[crop] for crop in self.crops}
+        self.noise = noise
+        self.tail_fraction = tail_fraction
+        self.tail_width = tail_width
+        self.seed = seed
+        self.label_all_crops = label_all_crops
+
+        # (crops, features) tables of range bounds for fancy indexing
+        self._low = np.array([[self.requirements[c][REQUIREMENT_KEYS[f]][0] for f in FEATURE_COLUMNS]
+                              for c in self.crops], dtype=np.float64)
+        self._high = np.array([[self.requirements[c][REQUIREMENT_KEYS[f]][1] for f in FEATURE_COLUMNS]
+                               for c in self.crops], dtype=np.float64)
+        self._clip_low = np.array([PHYSICAL_BOUNDS[f][0] for f in FEATURE_COLUMNS])
+        self._clip_high = np.array([PHYSICAL_BOUNDS[f][1] for f in FEATURE_COLUMNS])
+
+    @property
+    def columns(self):
+        columns = ['crop', *FEATURE_COLUMNS, 'suitability']
+        if self.label_all_crops:
+            columns += [f'score_{crop}' for crop in self.crops]
+        return columns
+
+    def generate_chunk(self, rows, chunk_index=0):
+        """One chunk as a dict of column -> array; ``crop`` holds indices into ``self.crops``"""
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(chunk_index,)))
+        crop_idx = rng.integers(0, len(self.crops), rows)
+        low, high = self._low[crop_idx], self._high[crop_idx]
+        width = high - low
+
+        values = low + rng.random((rows, len(FEATURE_COLUMNS))) * width
+        if self.noise:
+            values += rng.standard_normal(values.shape) * (self.noise * width)
+        if self.tail_fraction:
+            in_tail = rng.random(values.shape) < self.tail_fraction
+            below = rng.random(values.shape) < 0.5
+            offset = rng.random(values.shape) * (self.tail_width * width)
+            tails = np.where(below, low - offset, high + offset)
+            values = np.where(in_tail, tails, values)
+        np.clip(values, self._clip_low, self._clip_high, out=values)
+
+        features = {name: values[:, j] for j, name in enumerate(FEATURE_COLUMNS)}
+        chunk = {'crop': crop_idx.astype(np.int16)}
+        chunk.update({name: column.astype(np.float32) for name, column in features.items()})
+
+        # Label with float32-rounded inputs so labels match what gets written.
+        # The rule engine broadcasts, so per-row bounds score every row
+        # against its own source crop in a single call
+        labelled = {name: chunk[name] for name in FEATURE_COLUMNS}
+        row_requirements = {REQUIREMENT_KEYS[name]: (low[:, j], high[:, j]) for j, name in enumerate(FEATURE_COLUMNS)}
+        suitability = calculate_suitability_scores(labelled, row_requirements).astype(np.float32)
+        all_scores = {}
+        if self.label_all_crops:
+            for crop in self.crops:
+                all_scores[f'score_{crop}'] = calculate_suitability_scores(
+                    labelled, self.requirements[crop]).astype(np.float32)
+        chunk['suitability'] = suitability
+        chunk.update(all_scores)
+        return chunk
+
+    def iter_chunks(self, total_rows, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield chunks until ``total_rows`` rows have been produced"""
+        produced = 0
+        chunk_index = 0
+        while produced < total_rows:
+            rows = min(chunk_size, total_rows - produced)
+            yield self.generate_chunk(rows, chunk_index)
+            produced += rows
+            chunk_index += 1
+
+    def generate_frame(self, total_rows, chunk_size=DEFAULT_CHUNK_SIZE):
+        """All rows as one DataFrame with crop names; for in-memory sizes"""
+        import pandas as pd
+
+        chunks = [self._to_frame(chunk) for chunk in self.iter_chunks(total_rows, chunk_size)]
+        if not chunks:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _to_frame(self, chunk):
+        import pandas as pd
+
+        frame = pd.DataFrame(chunk, columns=self.columns)
+        frame['crop'] = pd.Categorical.from_codes(chunk['crop'], categories=self.crops)
+        return frame
+
+    def write(self, path, total_rows, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Stream rows to .parquet or .csv one chunk at a time; returns rows written"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        fmt = os.path.splitext(path)[1].lower()
+        if fmt not in ('.parquet', '.csv'):
+            raise ValueError(f"Unsupported output format {fmt!r}; use .parquet or .csv")
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            if fmt == '.parquet':
+                raise
+            return self._write_csv_pandas(path, total_rows, chunk_size)
+        return self._write_arrow(path, fmt, total_rows, chunk_size)
+
+    def _write_arrow(self, path, fmt, total_rows, chunk_size):
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+
+        crop_names = pa.array(self.crops, type=pa.string())
+        writer = None
+        written = 0
+        try:
+            for chunk in self.iter_chunks(total_rows, chunk_size):
+                crop = pa.DictionaryArray.from_arrays(pa.array(chunk['crop']), crop_names)
+                if fmt == '.csv':
+                    crop = crop.cast(pa.string())
+                arrays = [crop] + [pa.array(chunk[name]) for name in self.columns[1:]]
+                table = pa.Table.from_arrays(arrays, names=self.columns)
+                if writer is None and fmt == '.parquet':
+                    # Dictionary-encoding random floats costs more than it saves
+                    writer = pq.ParquetWriter(path, table.schema, use_dictionary=['crop'])
+                elif writer is None:
+                    writer = pa_csv.CSVWriter(path, table.schema)
+                writer.write_table(table)
+                written += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return written
+
+    def _write_csv_pandas(self, path, total_rows, chunk_size):
+        written = 0
+        for i, chunk in enumerate(self.iter_chunks(total_rows, chunk_size)):
+            frame = self._to_frame(chunk)
+            frame.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            written += len(frame)
+        return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a labelled synthetic soil dataset')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--output', default='datasets/synthetic/synthetic_soil.parquet',
+                        help='Output path (.parquet or .csv)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--crops', nargs='*', help='Subset of crops (default: all in CROP_REQUIREMENTS)')
+    parser.add_argument('--noise', type=float, default=0.05, help='Gaussian noise as a fraction of range width')
+    parser.add_argument('--tail-fraction', type=float, default=0.1,
+                        help='Probability of pushing a feature outside its crop range')
+    parser.add_argument('--tail-width', type=float, default=1.0, help='Max tail distance in range widths')
+    parser.add_argument('--all-crops', action='store_true', help='Add a score_<crop> column for every crop')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    unknown = [crop for crop in args.crops or [] if crop not in CROP_REQUIREMENTS]
+    if unknown:
+        parser.error(f"Unknown crops: {', '.join(unknown)}")
+
+    generator = SyntheticSoilGenerator(crops=args.crops, noise=args.noise, tail_fraction=args.tail_fraction,
+                                       tail_width=args.tail_width, seed=args.seed,
+                                       label_all_crops=args.all_crops)
+    print(f"Generating {args.rows:,} rows for {len(generator.crops)} crops -> {args.output}")
+    start = time.perf_counter()
+    written = generator.write(args.output, args.rows, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {written:,} rows in {elapsed:.2f}s ({written / elapsed:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Train Per-Crop Suitability Regressors
+Produces the models/advanced/*_regressor.joblib and *_info.joblib
+artifacts that backend/hybrid_engine.py loads
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import r2_score
+from sklearn.model_selection import cross_val_score, train_test_split
+import warnings
+warnings.filterwarnings('ignore')
+
+# The backend modules use flat imports, so put backend/ itself on the path
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, os.path.abspath(BACKEND_DIR))
+
+from crop_database import CROP_REQUIREMENTS  # noqa: E402
+from hybrid_engine import MULTI_OUTPUT_INFO_FILE, MULTI_OUTPUT_MODEL_FILE  # noqa: E402
+from rule_compiler import score_crops  # noqa: E402
+from synthetic_data import SyntheticSoilGenerator  # noqa: E402
+
+UNIFIED_DATASET_PATH = 'datasets/combined/unified_agricultural_dataset.csv'
+OUTPUT_DIR = 'models/advanced'
+# Column order HybridEngine.predict_ml_suitability feeds to the models
+FEATURE_COLUMNS = ['N', 'P', 'K', 'ph', 'temperature', 'humidity', 'rainfall']
+# Input bounds accepted by the API (KeralaCropRequest), used for augmentation
+FEATURE_BOUNDS = {
+    'N': (0, 300), 'P': (5, 300), 'K': (5, 400), 'ph': (3.5, 10.0),
+    'temperature': (8, 55), 'humidity': (14, 100), 'rainfall': (20, 2000),
+}
+
+FOREST_PARAMS = dict(
+    n_estimators=200,
+    max_depth=15,
+    min_samples_split=5,
+    min_samples_leaf=2,
+    random_state=42,
+)
+
+def build_training_frame(dataset_path=UNIFIED_DATASET_PATH, augment_samples=20000, seed=42):
+    """Feature rows from the unified dataset plus synthetic samples
+
+    The unified dataset only covers 20-300mm rainfall, where most crops in
+    CROP_REQUIREMENTS fail outright, so synthetic rows are added: a quarter
+    uniform over the API input ranges and the rest from SyntheticSoilGenerator
+    around each crop's requirement ranges, so every crop sees suitable,
+    marginal and failing soils.
+    """
+    frames = []
+    if os.path.exists(dataset_path):
+        frames.append(pd.read_csv(dataset_path, usecols=FEATURE_COLUMNS)[FEATURE_COLUMNS])
+    if augment_samples > 0:
+        rng = np.random.default_rng(seed)
+        n_uniform = augment_samples // 4
+        frames.append(pd.DataFrame({
+            col: rng.uniform(low, high, n_uniform) for col, (low, high) in FEATURE_BOUNDS.items()
+        })[FEATURE_COLUMNS])
+        generator = SyntheticSoilGenerator(noise=0.1, tail_fraction=0.15, tail_width=0.5, seed=seed)
+        synthetic = generator.generate_frame(augment_samples - n_uniform)[FEATURE_COLUMNS]
+        frames.append(synthetic.clip(lower={c: b[0] for c, b in FEATURE_BOUNDS.items()},
+                                     upper={c: b[1] for c, b in FEATURE_BOUNDS.items()}, axis=1))
+    if not frames:
+        raise FileNotFoundError(f"No training data: {dataset_path} is missing and augmentation is disabled")
+    return pd.concat(frames, ignore_index=True).astype(np.float64)
+
+def rule_targets(features, crops):
+    """Rule-engine suitability (0-1) for every row and crop, shape (rows, crops)"""
+    columns = {col: features[col].to_numpy() for col in FEATURE_COLUMNS}
+    return score_crops(columns, crops)[1] / 100.0
+
+# --- Worker side -------------------------------------------------------------
+_X = None
+_Y = None
+
+def _init_worker(X, Y):
+    global _X, _Y
+    _X, _Y = X, Y
+
+def _fit_and_score(y, n_jobs=1):
+    X_train, X_test, y_train, y_test = train_test_split(_X, y, test_size=0.2, random_state=42)
+    model = RandomForestRegressor(**FOREST_PARAMS, n_jobs=n_jobs)
+    model.fit(X_train, y_train)
+    r2 = float(r2_score(y_test, model.predict(X_test)))
+    cv_scores = cross_val_score(RandomForestRegressor(**FOREST_PARAMS, n_jobs=n_jobs), X_train, y_train, cv=5, scoring='r2')
+    # Refit on everything that's going to production
+    model.fit(_X, y)
+    return model, r2, float(cv_scores.mean()), float(cv_scores.std())
+
+def train_crop(crop, column):
+    """Train one crop's regressor inside a pool worker"""
+    start = time.perf_counter()
+    model, r2, cv_mean, cv_std = _fit_and_score(_Y[:, column])
+    return crop, model, r2, cv_mean, cv_std, time.perf_counter() - start
+
+# --- Artifact writers ----------------------------------------------------------
+def _info(crop_name, model, r2, cv_mean, cv_std, model_path, description):
+    return {
+        'crop_name': crop_name,
+        'algorithm': 'RandomForest',
+        'r2_score': r2,
+        'cv_mean': cv_mean,
+        'cv_std': cv_std,
+        'performance': {'r2': r2, 'cv_mean': cv_mean, 'cv_std': cv_std},
+        'feature_importance': dict(zip(FEATURE_COLUMNS, model.feature_importances_.tolist())),
+        'feature_columns': FEATURE_COLUMNS,
+        'model_path': model_path,
+        'description': description,
+        'trained_at': datetime.now().isoformat(),
+    }
+
+def train_per_crop_models(X, Y, crops, output_dir, workers):
+    print(f"\nTraining {len(crops)} per-crop regressors with {workers} workers...")
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X, Y)) as pool:
+        futures = [pool.submit(train_crop, crop, j) for j, crop in enumerate(crops)]
+        for future in as_completed(futures):
+            crop, model, r2, cv_mean, cv_std, seconds = future.result()
+            model_path = os.path.join(output_dir, f'{crop}_regressor.joblib')
+            joblib.dump(model, model_path)
+            info = _info(crop, model, r2, cv_mean, cv_std, model_path,
+                         f'Advanced regressor for {crop} suitability prediction')
+            joblib.dump(info, os.path.join(output_dir, f'{crop}_info.joblib'))
+            results[crop] = {k: info[k] for k in ('crop_name', 'algorithm', 'r2_score', 'cv_mean', 'cv_std',
+                                                  'feature_importance', 'feature_columns', 'model_path')}
+            print(f"  {crop:<14} R2={r2:.4f}  CV={cv_mean:.4f} (+/- {cv_std * 2:.4f})  {seconds:.1f}s")
+    return results
+
+def train_multi_output_model(X, Y, crops, output_dir, n_jobs):
+    """One forest predicting every crop's suitability in a single call"""
+    print(f"\nTraining multi-output regressor for {len(crops)} crops...")
+    _init_worker(X, Y)
+    model, r2, cv_mean, cv_std = _fit_and_score(Y, n_jobs=n_jobs)
+    # HybridEngine predicts one row per request; a saved worker count would
+    # fan every call out over a pool
+    model.set_params(n_jobs=1)
+    model_path = os.path.join(output_dir, MULTI_OUTPUT_MODEL_FILE)
+    joblib.dump(model, model_path)
+    info = _info('all', model, r2, cv_mean, cv_std, model_path,
+                 'Multi-output regressor predicting suitability for every crop at once')
+    info['crops'] = list(crops)
+    joblib.dump(info, os.path.join(output_dir, MULTI_OUTPUT_INFO_FILE))
+    print(f"  multi-output   R2={r2:.4f}  CV={cv_mean:.4f} (+/- {cv_std * 2:.4f})")
+    return info
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train HybridEngine's per-crop suitability regressors")
+    parser.add_argument('--crops', nargs='*', help='Subset of crops to train (default: all in CROP_REQUIREMENTS)')
+    parser.add_argument('--dataset', default=UNIFIED_DATASET_PATH)
+    parser.add_argument('--augment-samples', type=int, default=20000,
+                        help='Synthetic rows added to the dataset (uniform and from SyntheticSoilGenerator)')
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--multi-output', action='store_true',
+                        help='Also train a single multi-output model covering every crop')
+    parser.add_argument('--multi-output-only', action='store_true',
+                        help='Train only the multi-output model')
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("TRAINING PER-CROP SUITABILITY REGRESSORS")
+    print("=" * 60)
+    start = time.time()
+
+    crops = args.crops or list(CROP_REQUIREMENTS.keys())
+    unknown = [crop for crop in crops if crop not in CROP_REQUIREMENTS]
+    if unknown:
+        parser.error(f"Unknown crops: {', '.join(unknown)}")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    features = build_training_frame(args.dataset, args.augment_samples)
+    print(f"Training rows: {len(features):,}")
+    Y = rule_targets(features, crops)
+    X = features.to_numpy()
+    print(f"Derived rule-engine targets for {len(crops)} crops "
+          f"(mean suitability {Y.mean():.3f}, {(Y > 0).mean():.1%} non-zero)")
+
+    results = {}
+    if not args.multi_output_only:
+        results = train_per_crop_models(X, Y, crops, args.output_dir, args.workers)
+        summary = {
+            'total_models': len(crops),
+            'successful_models': len(results),
+            'model_results': results,
+            'training_time': time.time() - start,
+            'training_timestamp': datetime.now().isoformat(),
+        }
+        joblib.dump(summary, os.path.join(args.output_dir, 'key_models_info.joblib'))
+    if args.multi_output or args.multi_output_only:
+        train_multi_output_model(X, Y, crops, args.output_dir, n_jobs=args.workers)
+
+    print(f"\nTraining complete in {time.time() - start:.1f}s; artifacts in {args.output_dir}/")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,20 @@ Train Unified Soil Classification Model
 Creates the missing soil classification models for AgroNova
 """
 
+import argparse
+import hashlib
+import io
+import itertools
+import json
 import pandas as pd
 import numpy as np
 import joblib
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import StandardScaler, LabelEncoder
@@ -15,40 +25,112 @@ from sklearn.metrics import accuracy_score, classification_report
 import warnings
 warnings.filterwarnings('ignore')
 
-def train_unified_soil_model():
-    """Train unified soil classification model"""
-    print("=" * 60)
-    print("TRAINING UNIFIED SOIL CLASSIFICATION MODEL")
-    print("=" * 60)
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from backend.db import DEFAULT_DATABASE_URL  # noqa: E402
+from backend.model_bundle import BUNDLE_FILE, write_bundle  # noqa: E402
+from backend.soil_model_store import load_soil_artifacts, publish_soil_version, source_signatures  # noqa: E402
+
+SOIL_DATASET_PATH = 'datasets/soil_classification/synthetic_soil_dataset.csv'
+DATASET_CACHE_DIR = 'datasets/.cache'
+FEATURE_COLUMNS = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
+# Weight of the one-row-per-class anchors added to incremental batches
+ANCHOR_WEIGHT = 1e-6
+SEARCH_REPORT_PATH = 'models/soil_model_search.json'
+
+class StageTimer:
+    """Collects wall-clock timings for each training stage"""
+
+    def __init__(self):
+        self.timings = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.perf_counter() - start))
+
+    def report(self):
+        total = sum(seconds for _, seconds in self.timings)
+        print("\nStage timings:")
+        for name, seconds in self.timings:
+            share = seconds / total if total else 0.0
+            print(f"  {name:<24} {seconds:8.3f}s  {share:6.1%}")
+        print(f"  {'total':<24} {total:8.3f}s")
+
+def file_digest(path, chunk_size=1 << 20):
+    """Short content hash used to key the dataset cache"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def load_soil_dataset(path=SOIL_DATASET_PATH, cache_dir=DATASET_CACHE_DIR):
+    """Load the soil dataset with float32 features, via a Parquet cache
+
+    The cache file name embeds the source file's hash, so editing the CSV
+    invalidates it automatically. Falls back to plain CSV parsing when
+    pyarrow isn't installed.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, f"{stem}-{file_digest(path)}.parquet")
+    if os.path.exists(cache_path):
+        print(f"Using cached dataset: {cache_path}")
+        return pd.read_parquet(cache_path)
+
+    df = pd.read_csv(
+        path,
+        usecols=FEATURE_COLUMNS + ['soil_type'],
+        dtype={**{col: np.float32 for col in FEATURE_COLUMNS}, 'soil_type': 'category'},
+    )
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(cache_path, index=False)
+        print(f"Cached dataset as Parquet: {cache_path}")
+    except ImportError:
+        print("pyarrow not installed; skipping Parquet cache")
+    return df
+
+FOREST_PARAMS = dict(
+    n_estimators=200,
+    max_depth=15,
+    min_samples_split=5,
+    min_samples_leaf=2,
+    random_state=42,
+)
+
+def prepare_soil_data(timer):
+    """Load, split, scale and encode the soil dataset"""
+    # Load soil dataset
+    print("Loading soil classification dataset...")
+    with timer.stage("load dataset"):
+        df = load_soil_dataset()
+    print(f"Loaded {len(df):,} soil samples")
     
-    # Create model directory
-    model_dir = 'models'
-    os.makedirs(model_dir, exist_ok=True)
+    # Prepare features and target
+    X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    y = df['soil_type'].astype(str).to_numpy()
     
-    try:
-        # Load soil dataset
-        print("Loading soil classification dataset...")
-        df = pd.read_csv('datasets/soil_classification/synthetic_soil_dataset.csv')
-        print(f"Loaded {len(df):,} soil samples")
-        
-        # Prepare features and target
-        feature_columns = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
-        X = df[feature_columns].values
-        y = df['soil_type'].values
-        
-        print(f"Features: {feature_columns}")
-        print(f"Soil types: {np.unique(y)}")
-        
-        # Split data
+    print(f"Features: {FEATURE_COLUMNS}")
+    print(f"Soil types: {np.unique(y)}")
+    
+    # Split data
+    with timer.stage("split"):
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
         )
-        
-        print(f"Training samples: {len(X_train):,}")
-        print(f"Test samples: {len(X_test):,}")
-        
-        # Create and fit scaler
-        print("\nFitting feature scaler...")
+    
+    print(f"Training samples: {len(X_train):,}")
+    print(f"Test samples: {len(X_test):,}")
+    
+    # Create and fit scaler
+    print("\nFitting feature scaler...")
+    with timer.stage("scale + encode"):
         scaler = StandardScaler()
         X_train_scaled = scaler.fit_transform(X_train)
         X_test_scaled = scaler.transform(X_test)
@@ -58,72 +140,123 @@ def train_unified_soil_model():
         encoder = LabelEncoder()
         y_train_encoded = encoder.fit_transform(y_train)
         y_test_encoded = encoder.transform(y_test)
+    
+    return X_train_scaled, X_test_scaled, y_train_encoded, y_test_encoded, scaler, encoder
+
+def cross_validate_forest(classifier, X_train_scaled, y_train_encoded, n_jobs):
+    # Folds run in parallel, so each fold's forest is single-threaded to
+    # avoid oversubscribing the cores
+    return cross_val_score(
+        clone(classifier).set_params(n_jobs=1),
+        X_train_scaled, y_train_encoded, cv=5, n_jobs=n_jobs
+    )
+
+def build_model_info(classifier, encoder, accuracy, cv_scores, training_samples, test_samples):
+    feature_importance = dict(zip(FEATURE_COLUMNS, classifier.feature_importances_))
+    return {
+        'model_type': 'RandomForestClassifier',
+        'accuracy': accuracy,
+        'cv_mean': cv_scores.mean(),
+        'cv_std': cv_scores.std(),
+        'feature_columns': FEATURE_COLUMNS,
+        'soil_types': encoder.classes_.tolist(),
+        'feature_importance': feature_importance,
+        'description': 'Unified soil classification model for Kerala agriculture',
+        'training_samples': training_samples,
+        'test_samples': test_samples
+    }
+
+def save_soil_artifacts(model_dir, classifier, scaler, encoder, model_info, timer):
+    """Write the four unified_soil_* files and publish them as a new version"""
+    print(f"\nSaving models to {model_dir}/...")
+    
+    with timer.stage("save artifacts"):
+        # Save classifier
+        classifier_path = os.path.join(model_dir, 'unified_soil_model.joblib')
+        joblib.dump(classifier, classifier_path)
+        print(f"  Classifier: {classifier_path}")
+    
+        # Save scaler
+        scaler_path = os.path.join(model_dir, 'unified_soil_scaler.joblib')
+        joblib.dump(scaler, scaler_path)
+        print(f"  Scaler: {scaler_path}")
+    
+        # Save encoder
+        encoder_path = os.path.join(model_dir, 'unified_soil_encoder.joblib')
+        joblib.dump(encoder, encoder_path)
+        print(f"  Encoder: {encoder_path}")
+    
+        # Save model info
+        info_path = os.path.join(model_dir, 'unified_soil_info.joblib')
+        joblib.dump(model_info, info_path)
+        print(f"  Info: {info_path}")
+
+        # Single-file bundle the API serves from
+        bundle_path = os.path.join(model_dir, BUNDLE_FILE)
+        write_bundle(bundle_path, classifier, scaler, encoder, model_info, sources=source_signatures(model_dir))
+        print(f"  Bundle: {bundle_path}")
+
+        # A fresh model hasn't seen any field feedback yet
+        version = publish_soil_version(model_dir, classifier, scaler, encoder,
+                                       {**model_info, 'feedback_high_water': 0})
+        print(f"  Published as soil model version {version}")
+    
+    return {
+        'classifier': classifier_path,
+        'scaler': scaler_path,
+        'encoder': encoder_path,
+        'info': info_path,
+        'bundle': bundle_path
+    }
+
+def train_unified_soil_model(n_jobs=-1, timer=None):
+    """Train unified soil classification model"""
+    print("=" * 60)
+    print("TRAINING UNIFIED SOIL CLASSIFICATION MODEL")
+    print("=" * 60)
+    timer = timer or StageTimer()
+    
+    # Create model directory
+    model_dir = 'models'
+    os.makedirs(model_dir, exist_ok=True)
+    
+    try:
+        X_train_scaled, X_test_scaled, y_train_encoded, y_test_encoded, scaler, encoder = prepare_soil_data(timer)
         
         # Train RandomForest classifier
         print("\nTraining RandomForest classifier...")
-        classifier = RandomForestClassifier(
-            n_estimators=200,
-            max_depth=15,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42
-        )
+        classifier = RandomForestClassifier(**FOREST_PARAMS, n_jobs=n_jobs)
         
-        classifier.fit(X_train_scaled, y_train_encoded)
+        with timer.stage("fit forest"):
+            classifier.fit(X_train_scaled, y_train_encoded)
         
         # Evaluate model
         print("\nEvaluating model...")
-        y_pred = classifier.predict(X_test_scaled)
-        accuracy = accuracy_score(y_test_encoded, y_pred)
+        with timer.stage("evaluate"):
+            y_pred = classifier.predict(X_test_scaled)
+            accuracy = accuracy_score(y_test_encoded, y_pred)
         
-        # Cross-validation
-        cv_scores = cross_val_score(classifier, X_train_scaled, y_train_encoded, cv=5)
+        with timer.stage("cross-validation"):
+            cv_scores = cross_validate_forest(classifier, X_train_scaled, y_train_encoded, n_jobs)
         
         print(f"Test Accuracy: {accuracy:.4f}")
         print(f"CV Accuracy: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
         
+        # Create model info
+        model_info = build_model_info(classifier, encoder, accuracy, cv_scores,
+                                      len(X_train_scaled), len(X_test_scaled))
+        
         # Feature importance
-        feature_importance = dict(zip(feature_columns, classifier.feature_importances_))
         print(f"\nFeature Importance:")
-        for feature, importance in sorted(feature_importance.items(), key=lambda x: x[1], reverse=True):
+        for feature, importance in sorted(model_info['feature_importance'].items(), key=lambda x: x[1], reverse=True):
             print(f"  {feature}: {importance:.4f}")
         
-        # Create model info
-        model_info = {
-            'model_type': 'RandomForestClassifier',
-            'accuracy': accuracy,
-            'cv_mean': cv_scores.mean(),
-            'cv_std': cv_scores.std(),
-            'feature_columns': feature_columns,
-            'soil_types': encoder.classes_.tolist(),
-            'feature_importance': feature_importance,
-            'description': 'Unified soil classification model for Kerala agriculture',
-            'training_samples': len(X_train),
-            'test_samples': len(X_test)
-        }
-        
+        # The API predicts one row at a time; a saved n_jobs=-1 would fan
+        # every call out over a worker pool
+        classifier.set_params(n_jobs=1)
+
         # Save models
-        print(f"\nSaving models to {model_dir}/...")
-        
-        # Save classifier
-        classifier_path = os.path.join(model_dir, 'unified_soil_model.joblib')
-        joblib.dump(classifier, classifier_path)
-        print(f"  Classifier: {classifier_path}")
-        
-        # Save scaler
-        scaler_path = os.path.join(model_dir, 'unified_soil_scaler.joblib')
-        joblib.dump(scaler, scaler_path)
-        print(f"  Scaler: {scaler_path}")
-        
-        # Save encoder
-        encoder_path = os.path.join(model_dir, 'unified_soil_encoder.joblib')
-        joblib.dump(encoder, encoder_path)
-        print(f"  Encoder: {encoder_path}")
-        
-        # Save model info
-        info_path = os.path.join(model_dir, 'unified_soil_info.joblib')
-        joblib.dump(model_info, info_path)
-        print(f"  Info: {info_path}")
+        model_paths = save_soil_artifacts(model_dir, classifier, scaler, encoder, model_info, timer)
         
         print(f"\nSoil classification model training complete!")
         print(f"Model accuracy: {accuracy:.1%}")
@@ -134,18 +267,283 @@ def train_unified_soil_model():
             'accuracy': accuracy,
             'cv_mean': cv_scores.mean(),
             'soil_types': encoder.classes_.tolist(),
-            'model_paths': {
-                'classifier': classifier_path,
-                'scaler': scaler_path,
-                'encoder': encoder_path,
-                'info': info_path
-            }
+            'model_paths': model_paths
         }
         
     except Exception as e:
         print(f"ERROR: {e}")
         return {'status': 'error', 'error': str(e)}
 
+# --- Latency-aware model search -------------------------------------------------
+_SEARCH_DATA = None
+
+def _init_search_worker(X_train, y_train):
+    global _SEARCH_DATA
+    _SEARCH_DATA = (X_train, y_train)
+
+def _fit_candidate(n_estimators, max_depth):
+    X_train, y_train = _SEARCH_DATA
+    params = {**FOREST_PARAMS, 'n_estimators': n_estimators, 'max_depth': max_depth}
+    start = time.perf_counter()
+    classifier = RandomForestClassifier(**params, n_jobs=1).fit(X_train, y_train)
+    return classifier, time.perf_counter() - start
+
+def measure_inference(classifier, X_test, single_row_calls=200, batch_size=1000, repeats=5):
+    """Median single-row and per-row batch latency (ms) plus serialized size (MB)
+
+    Single-row timing runs predict + predict_proba on one row, which is what
+    KeralaAI does per request.
+    """
+    rows = X_test[:single_row_calls]
+    single = []
+    for row in rows:
+        row = row.reshape(1, -1)
+        start = time.perf_counter()
+        classifier.predict(row)
+        classifier.predict_proba(row)
+        single.append(time.perf_counter() - start)
+
+    batch = X_test[:batch_size]
+    batch_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        classifier.predict_proba(batch)
+        batch_times.append(time.perf_counter() - start)
+
+    buffer = io.BytesIO()
+    joblib.dump(classifier, buffer)
+    return {
+        'single_row_ms': float(np.median(single)) * 1000,
+        'batch_row_us': float(np.median(batch_times)) / len(batch) * 1e6,
+        'size_mb': buffer.tell() / 1e6,
+        'node_count': int(sum(tree.tree_.node_count for tree in classifier.estimators_)),
+    }
+
+def pareto_front(results):
+    """Mark candidates no other candidate beats on accuracy, latency and size at once"""
+    for candidate in results:
+        candidate['pareto'] = not any(
+            other['accuracy'] >= candidate['accuracy']
+            and other['single_row_ms'] <= candidate['single_row_ms']
+            and other['size_mb'] <= candidate['size_mb']
+            and (other['accuracy'] > candidate['accuracy']
+                 or other['single_row_ms'] < candidate['single_row_ms']
+                 or other['size_mb'] < candidate['size_mb'])
+            for other in results
+        )
+    return [candidate for candidate in results if candidate['pareto']]
+
+def select_candidate(results, accuracy_tolerance=0.005, max_latency_ms=None, max_size_mb=None):
+    """Fastest Pareto point within ``accuracy_tolerance`` of the best one inside the budgets"""
+    eligible = [
+        c for c in results
+        if c['pareto']
+        and (max_latency_ms is None or c['single_row_ms'] <= max_latency_ms)
+        and (max_size_mb is None or c['size_mb'] <= max_size_mb)
+    ]
+    if not eligible:
+        return None
+    best_accuracy = max(c['accuracy'] for c in eligible)
+    close = [c for c in eligible if c['accuracy'] >= best_accuracy - accuracy_tolerance]
+    return min(close, key=lambda c: (c['single_row_ms'], c['size_mb']))
+
+def search_soil_models(trees_grid, depth_grid, n_jobs=-1, accuracy_tolerance=0.005, max_latency_ms=None,
+                       max_size_mb=None, export=False, report_path=SEARCH_REPORT_PATH, timer=None):
+    """Train a grid of forests in parallel and report accuracy against latency and size
+
+    Candidates are fit concurrently (one core each) but measured one at a
+    time so the timings aren't skewed by other fits. Exported models are
+    saved with n_jobs=1, which is what the single-row numbers assume.
+    """
+    print("=" * 60)
+    print("LATENCY-AWARE SOIL MODEL SEARCH")
+    print("=" * 60)
+    timer = timer or StageTimer()
+    model_dir = 'models'
+    os.makedirs(model_dir, exist_ok=True)
+
+    try:
+        X_train_scaled, X_test_scaled, y_train_encoded, y_test_encoded, scaler, encoder = prepare_soil_data(timer)
+
+        grid = list(itertools.product(trees_grid, depth_grid))
+        workers = os.cpu_count() if n_jobs in (None, -1) else max(1, n_jobs)
+        print(f"\nFitting {len(grid)} candidates on {workers} workers...")
+        with timer.stage("fit candidates"):
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                                     initargs=(X_train_scaled, y_train_encoded)) as pool:
+                fitted = list(pool.map(_fit_candidate, *zip(*grid)))
+
+        results = []
+        models = {}
+        with timer.stage("measure candidates"):
+            for (n_estimators, max_depth), (classifier, fit_seconds) in zip(grid, fitted):
+                key = f"trees={n_estimators},depth={max_depth}"
+                models[key] = classifier
+                accuracy = accuracy_score(y_test_encoded, classifier.predict(X_test_scaled))
+                results.append({
+                    'key': key,
+                    'n_estimators': n_estimators,
+                    'max_depth': max_depth,
+                    'accuracy': float(accuracy),
+                    'fit_seconds': fit_seconds,
+                    **measure_inference(classifier, X_test_scaled),
+                })
+
+        front = pareto_front(results)
+        chosen = select_candidate(results, accuracy_tolerance, max_latency_ms, max_size_mb)
+
+        print(f"\n{'candidate':<24} {'accuracy':>8} {'1-row ms':>9} {'batch us/row':>13} {'size MB':>8}  pareto")
+        for c in sorted(results, key=lambda c: c['single_row_ms']):
+            marker = '*' if c['pareto'] else ''
+            if chosen and c['key'] == chosen['key']:
+                marker += ' <- chosen'
+            print(f"{c['key']:<24} {c['accuracy']:>8.4f} {c['single_row_ms']:>9.2f} "
+                  f"{c['batch_row_us']:>13.2f} {c['size_mb']:>8.2f}  {marker}")
+        for c in results:
+            c['accuracy_per_ms'] = c['accuracy'] / c['single_row_ms']
+            c['accuracy_per_mb'] = c['accuracy'] / c['size_mb']
+
+        report = {
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'selection': {
+                'accuracy_tolerance': accuracy_tolerance,
+                'max_latency_ms': max_latency_ms,
+                'max_size_mb': max_size_mb,
+                'chosen': chosen['key'] if chosen else None,
+            },
+            'pareto_front': [c['key'] for c in front],
+            'candidates': results,
+        }
+        with open(report_path, 'w') as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nPareto report: {report_path}")
+
+        if chosen is None:
+            print("No candidate fits the latency/size budget")
+            return {'status': 'no_candidate', 'report': report_path}
+
+        result = {'status': 'success', 'chosen': chosen, 'report': report_path}
+        if export:
+            classifier = models[chosen['key']]
+            with timer.stage("cross-validation"):
+                cv_scores = cross_validate_forest(classifier, X_train_scaled, y_train_encoded, n_jobs)
+            model_info = build_model_info(classifier, encoder, chosen['accuracy'], cv_scores,
+                                          len(X_train_scaled), len(X_test_scaled))
+            model_info['inference'] = {k: chosen[k] for k in ('single_row_ms', 'batch_row_us', 'size_mb')}
+            result['model_paths'] = save_soil_artifacts(model_dir, classifier, scaler, encoder, model_info, timer)
+            print(f"Exported {chosen['key']} as the production soil model")
+        return result
+
+    except Exception as e:
+        print(f"ERROR: {e}")
+        return {'status': 'error', 'error': str(e)}
+
+def load_field_samples(database_url, since_id):
+    """Field samples with id > since_id from the feedback table, in id order"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from backend.models import FieldSample
+
+    engine = create_engine(database_url)
+    try:
+        with Session(engine) as session:
+            rows = (
+                session.query(FieldSample.id, FieldSample.soil_type,
+                              *[getattr(FieldSample, col) for col in FEATURE_COLUMNS])
+                .filter(FieldSample.id > since_id)
+                .order_by(FieldSample.id)
+                .all()
+            )
+    finally:
+        engine.dispose()
+    return pd.DataFrame(rows, columns=['id', 'soil_type', *FEATURE_COLUMNS])
+
+def train_incremental_soil_model(database_url=DEFAULT_DATABASE_URL, add_trees=25, min_samples=20,
+                                 n_jobs=-1, timer=None):
+    """Grow the current soil forest with trees fit only on new field samples
+
+    Reads the feedback table past the current version's high-water mark,
+    fits ``add_trees`` extra trees on those rows with warm_start and
+    publishes the result as a new version. The scaler and encoder are kept
+    as-is, so cost scales with the number of new samples, not the history.
+    Samples labelled with soil types the encoder doesn't know are skipped
+    and need a full retrain.
+    """
+    print("=" * 60)
+    print("INCREMENTAL SOIL MODEL UPDATE FROM FIELD FEEDBACK")
+    print("=" * 60)
+    timer = timer or StageTimer()
+    model_dir = 'models'
+
+    try:
+        with timer.stage("load current model"):
+            # warm_start needs the sklearn estimator, not the serving bundle
+            current = load_soil_artifacts(model_dir, use_bundle=False)
+        classifier, scaler, encoder = current.classifier, current.scaler, current.encoder
+        high_water = int(current.info.get('feedback_high_water', 0))
+        print(f"Current version: {current.version or 'base'} "
+              f"({classifier.n_estimators} trees, feedback up to id {high_water})")
+
+        with timer.stage("load field samples"):
+            samples = load_field_samples(database_url, high_water)
+        if samples.empty:
+            print("No new field samples; nothing to do")
+            return {'status': 'skipped', 'reason': 'no new samples'}
+
+        known = samples['soil_type'].isin(encoder.classes_)
+        if not known.all():
+            unknown = sorted(samples.loc[~known, 'soil_type'].unique())
+            print(f"Skipping {int((~known).sum())} samples with unknown soil types {unknown}; "
+                  "run a full retrain to add them")
+        batch = samples[known]
+        if len(batch) < min_samples:
+            print(f"Only {len(batch)} usable new samples (need {min_samples}); waiting for more")
+            return {'status': 'skipped', 'reason': 'not enough samples', 'samples': len(batch)}
+        print(f"New field samples: {len(batch):,} (ids {int(batch['id'].min())}-{int(batch['id'].max())})")
+
+        with timer.stage("scale + encode"):
+            X_new = scaler.transform(batch[FEATURE_COLUMNS].to_numpy(dtype=np.float32))
+            y_new = encoder.transform(batch['soil_type'])
+
+        # Accuracy of the current model on data it has never seen
+        feedback_accuracy = accuracy_score(y_new, classifier.predict(X_new))
+        print(f"Current model accuracy on new samples: {feedback_accuracy:.4f}")
+
+        # warm_start re-derives classes_ from y, so a batch missing some soil
+        # types would give the new trees fewer outputs than the old ones.
+        # One negligible-weight row per class keeps the class set intact.
+        n_classes = len(encoder.classes_)
+        X_fit = np.vstack([X_new, np.zeros((n_classes, X_new.shape[1]))])
+        y_fit = np.concatenate([y_new, np.arange(n_classes)])
+        weights = np.concatenate([np.ones(len(y_new)), np.full(n_classes, ANCHOR_WEIGHT)])
+
+        print(f"\nAdding {add_trees} trees fit on the new samples...")
+        with timer.stage("fit new trees"):
+            classifier.set_params(warm_start=True, n_estimators=classifier.n_estimators + add_trees, n_jobs=n_jobs)
+            classifier.fit(X_fit, y_fit, sample_weight=weights)
+            classifier.set_params(warm_start=False, n_jobs=1)
+
+        info = dict(current.info)
+        # Unknown-label samples are passed over too; only a full retrain can use them
+        info['feedback_high_water'] = int(samples['id'].max())
+        info['training_samples'] = info.get('training_samples', 0) + len(batch)
+        info['incremental_updates'] = list(info.get('incremental_updates', [])) + [{
+            'parent_version': current.version,
+            'samples': len(batch),
+            'trees_added': add_trees,
+            'feedback_accuracy_before': feedback_accuracy,
+        }]
+
+        with timer.stage("publish"):
+            version = publish_soil_version(model_dir, classifier, scaler, encoder, info)
+        print(f"\nPublished soil model version {version} ({classifier.n_estimators} trees)")
+        return {'status': 'success', 'version': version, 'samples': len(batch),
+                'feedback_accuracy_before': feedback_accuracy}
+
+    except Exception as e:
+        print(f"ERROR: {e}")
+        return {'status': 'error', 'error': str(e)}
+
 def test_soil_model():
     """Test the trained soil model"""
     print("\n" + "=" * 60)
@@ -192,13 +590,57 @@ def test_soil_model():
     except Exception as e:
         print(f"ERROR testing model: {e}")
 
-def main():
+def main(argv=None):
     """Main training function"""
+    parser = argparse.ArgumentParser(description="Train the unified soil classification model")
+    parser.add_argument('--profile', action='store_true', help='Print wall-clock timings for each stage')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Cores for forest fitting and CV (-1 = all)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Add trees fit on new field samples instead of retraining from scratch')
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL', DEFAULT_DATABASE_URL),
+                        help='Database holding the field_samples feedback table')
+    parser.add_argument('--add-trees', type=int, default=25, help='Trees to add per incremental update')
+    parser.add_argument('--min-samples', type=int, default=20,
+                        help='Minimum new samples before an incremental update runs')
+    parser.add_argument('--search', action='store_true',
+                        help='Grid-search forest sizes/depths and write a Pareto report of accuracy vs latency/size')
+    parser.add_argument('--grid-trees', type=int, nargs='+', default=[25, 50, 100, 200])
+    parser.add_argument('--grid-depths', type=int, nargs='+', default=[8, 12, 15, 0],
+                        help='Max depths to try (0 = unlimited)')
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.005,
+                        help='Pick the fastest Pareto point within this much of the best accuracy')
+    parser.add_argument('--max-latency-ms', type=float, help='Single-row latency budget')
+    parser.add_argument('--max-size-mb', type=float, help='Serialized model size budget')
+    parser.add_argument('--export', action='store_true', help='Save the chosen search candidate as the production model')
+    args = parser.parse_args(argv)
+
+    if args.search:
+        timer = StageTimer()
+        result = search_soil_models(
+            args.grid_trees, [depth or None for depth in args.grid_depths], n_jobs=args.n_jobs,
+            accuracy_tolerance=args.accuracy_tolerance, max_latency_ms=args.max_latency_ms,
+            max_size_mb=args.max_size_mb, export=args.export, timer=timer,
+        )
+        if args.profile:
+            timer.report()
+        return result
+
+    if args.incremental:
+        timer = StageTimer()
+        result = train_incremental_soil_model(args.database_url, args.add_trees, args.min_samples,
+                                              n_jobs=args.n_jobs, timer=timer)
+        if args.profile:
+            timer.report()
+        return result
+
     print("AGRONOVA SOIL CLASSIFICATION TRAINING")
     print("Training unified soil classification model...")
     
     # Train soil model
-    result = train_unified_soil_model()
+    timer = StageTimer()
+    result = train_unified_soil_model(n_jobs=args.n_jobs, timer=timer)
+    if args.profile:
+        timer.report()
     
     if result['status'] == 'success':
         # Test model
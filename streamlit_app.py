@@ -7,13 +7,19 @@ models and rule-based engines power both the FastAPI service and Streamlit UI.
 
 from __future__ import annotations
 
+import os
+import tempfile
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Tuple
 
+import altair as alt
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from backend.kerala_ai import KeralaAI
+from backend.batch_scoring import DEFAULT_CHUNK_ROWS, score_csv
+from backend.dataset_inspector import dataset_statistics, file_signature, numeric_summary_frame, preview_csv
+from backend.kerala_ai import FEATURE_BOUNDS, KeralaAI
 
 st.set_page_config(
     page_title="Agronova · Kerala AI Assistant",
@@ -28,15 +34,52 @@ def load_engine() -> KeralaAI:
     return KeralaAI()
 
 
+DATASET_PATH = Path(__file__).resolve().parent / "ml_model" / "datasets" / "combined" / "unified_agricultural_dataset.csv"
+
+
+# mtime and size are part of the cache key so an edited dataset is re-read
 @st.cache_data(show_spinner=False)
-def load_dataset_preview(rows: int = 5) -> pd.DataFrame | None:
-    dataset_path = Path(__file__).resolve().parent / "ml_model" / "datasets" / "combined" / "unified_agricultural_dataset.csv"
-    if not dataset_path.exists():
-        return None
-    return pd.read_csv(dataset_path).head(rows)
+def load_dataset_preview(path: str, mtime_ns: int, size: int, rows: int = 5) -> pd.DataFrame:
+    return preview_csv(path, rows)
+
+
+@st.cache_data(show_spinner="Computing dataset statistics...")
+def load_dataset_statistics(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    return dataset_statistics(path)
 
 
 engine = load_engine()
+engine.refresh_soil_models()
+
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def run_analysis(kind: str, inputs: Tuple[Tuple[str, Any], ...], model_version: str | None) -> Any:
+    """Engine results memoised on the input vector and the serving soil model version."""
+    payload = dict(inputs)
+    if kind == "soil":
+        return engine.predict_soil(payload)
+    if kind == "crop":
+        return engine.recommend_crops_with_breakdown(payload, top_n=8)
+    if kind == "unified":
+        return engine.analyze_unified(payload)
+    if kind == "desired":
+        return engine.analyze_desired_crop(payload)
+    raise ValueError(f"Unknown analysis {kind!r}")
+
+
+def analyse(kind: str, payload: Dict[str, Any]) -> Any:
+    return run_analysis(kind, tuple(sorted(payload.items())), engine.soil_model_version)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_suitability_grid(
+    inputs: Tuple[Tuple[str, float], ...], x_feature: str, y_feature: str, steps: int, crop: str | None, hybrid: bool
+) -> Dict[str, Any]:
+    x_values = np.linspace(*FEATURE_BOUNDS[x_feature], steps)
+    y_values = np.linspace(*FEATURE_BOUNDS[y_feature], steps)
+    return engine.suitability_grid(
+        dict(inputs), x_feature, x_values, y_feature, y_values, crops=[crop] if crop else None, include_hybrid=hybrid
+    )
 
 
 def sidebar_inputs() -> Dict[str, float]:
@@ -75,6 +118,8 @@ tabs = st.tabs(
         "Hybrid Crop Recommender",
         "Unified Advisor",
         "Desired Crop Check",
+        "Bulk Scoring",
+        "Suitability Heatmap",
         "Model & Data Insights",
     ]
 )
@@ -85,7 +130,7 @@ with tabs[0]:
 
     if st.button("Run Soil Analysis", type="primary", key="soil_run", use_container_width=True):
         try:
-            result = engine.predict_soil(user_input)
+            result = analyse("soil", user_input)
             st.success(result["message"])
             cols = st.columns(2)
             cols[0].metric("Detected Soil Type", result["soil_type"])
@@ -101,7 +146,7 @@ with tabs[1]:
 
     if st.button("Recommend Crops", type="primary", key="crop_run", use_container_width=True):
         try:
-            result = engine.recommend_crops(user_input)
+            result, breakdown = analyse("crop", user_input)
             st.success(result["message"])
             cols = st.columns(2)
             cols[0].metric("Primary Crop", result["recommended_crop"])
@@ -113,7 +158,6 @@ with tabs[1]:
             st.write("**Soil Snapshot**")
             st.json(result["soil_analysis"])
 
-            breakdown = engine.get_hybrid_breakdown(user_input, top_n=8)
             hybrid_table = pd.DataFrame(breakdown.get("all_recommendations", []))
             if not hybrid_table.empty:
                 hybrid_table = hybrid_table[["crop", "score", "rule_score", "ml_score", "confidence_source", "reason"]]
@@ -138,7 +182,7 @@ with tabs[2]:
 
     if st.button("Run Unified Analysis", type="primary", key="unified_run", use_container_width=True):
         try:
-            result = engine.analyze_unified(user_input)
+            result = analyse("unified", user_input)
             st.success(result["message"])
 
             cols = st.columns(3)
@@ -162,7 +206,7 @@ with tabs[3]:
     if st.button("Check Suitability", type="primary", key="desired_run", use_container_width=True):
         try:
             payload = {"crop_name": crop_name, **user_input}
-            result = engine.analyze_desired_crop(payload)
+            result = analyse("desired", payload)
             st.success(f"{result['crop_name'].title()} suitability: {result['verdict']}")
             cols = st.columns(2)
             cols[0].metric("Suitability", f"{result['suitability'] * 100:.1f}%")
@@ -176,6 +220,113 @@ with tabs[3]:
             st.error(f"Desired crop check failed: {exc}")
 
 with tabs[4]:
+    st.subheader("Bulk Field Scoring")
+    st.caption(
+        "Upload a CSV of lab results with N, P, K, temperature, humidity, ph and rainfall columns. "
+        "Rows are classified and scored in chunks, so large files never sit in memory all at once."
+    )
+
+    upload = st.file_uploader("Lab results CSV", type=["csv"], key="bulk_upload")
+    cols = st.columns(2)
+    output_format = cols[0].radio("Download format", ["csv", "parquet"], horizontal=True, key="bulk_format")
+    chunk_rows = int(cols[1].number_input("Rows per chunk", min_value=1000, max_value=200000, value=DEFAULT_CHUNK_ROWS, step=5000))
+
+    if upload is not None and st.button("Score File", type="primary", key="bulk_run", use_container_width=True):
+        output = tempfile.NamedTemporaryFile(prefix="agronova-scored-", suffix=f".{output_format}", delete=False)
+        output.close()
+        progress = st.progress(0.0, text="Scoring...")
+        try:
+            summary = score_csv(
+                engine, upload, output.name, fmt=output_format, chunk_rows=chunk_rows,
+                on_progress=lambda fraction, s: progress.progress(fraction, text=f"Scored {s.rows:,} rows"),
+            )
+            progress.progress(1.0, text=f"Scored {summary.rows:,} rows")
+            previous = st.session_state.get("bulk_result")
+            if previous and os.path.exists(previous["path"]):
+                os.remove(previous["path"])
+            st.session_state["bulk_result"] = {
+                "path": output.name, "format": output_format, "name": upload.name, "summary": summary,
+            }
+        except Exception as exc:
+            os.remove(output.name)
+            st.error(f"Bulk scoring failed: {exc}")
+
+    bulk_result = st.session_state.get("bulk_result")
+    if bulk_result and os.path.exists(bulk_result["path"]):
+        summary = bulk_result["summary"]
+        cols = st.columns(3)
+        cols[0].metric("Fields Scored", f"{summary.rows:,}")
+        cols[1].metric("Unsuitable Fields", f"{summary.unsuitable_share * 100:.1f}%")
+        cols[2].metric("Distinct Crops", len(summary.crop_counts))
+
+        chart_cols = st.columns(2)
+        chart_cols[0].write("**Recommended Crop Distribution**")
+        chart_cols[0].bar_chart(pd.Series(dict(summary.crop_counts.most_common()), name="fields"))
+        chart_cols[1].write("**Soil Type Distribution**")
+        chart_cols[1].bar_chart(pd.Series(dict(summary.soil_counts.most_common()), name="fields"))
+
+        with open(bulk_result["path"], "rb") as fh:
+            st.download_button(
+                f"Download results ({bulk_result['format'].upper()})",
+                data=fh,
+                file_name=f"{Path(bulk_result['name']).stem}_scored.{bulk_result['format']}",
+                mime="text/csv" if bulk_result["format"] == "csv" else "application/octet-stream",
+                use_container_width=True,
+            )
+
+with tabs[5]:
+    st.subheader("Suitability Heatmap")
+    st.caption("How suitability changes across two conditions, holding the other sidebar values fixed.")
+
+    feature_labels = {
+        "rainfall": "Rainfall (mm)",
+        "temperature": "Temperature (°C)",
+        "humidity": "Humidity (%)",
+        "ph": "Soil pH",
+        "N": "Nitrogen (ppm)",
+        "P": "Phosphorus (ppm)",
+        "K": "Potassium (ppm)",
+    }
+    features = list(feature_labels)
+    cols = st.columns(4)
+    heatmap_crop = cols[0].selectbox("Crop", ["Best of all crops"] + engine.available_crops, key="heatmap_crop")
+    x_feature = cols[1].selectbox("X axis", features, index=0, format_func=feature_labels.get, key="heatmap_x")
+    y_feature = cols[2].selectbox(
+        "Y axis", [f for f in features if f != x_feature], index=0, format_func=feature_labels.get, key="heatmap_y"
+    )
+    steps = cols[3].slider("Resolution", min_value=20, max_value=200, value=100, step=10, key="heatmap_steps")
+    use_hybrid = st.checkbox("Blend in ML scores (hybrid)", value=False, key="heatmap_hybrid")
+
+    grid = load_suitability_grid(
+        tuple(sorted(user_input.items())), x_feature, y_feature, steps,
+        None if heatmap_crop == "Best of all crops" else heatmap_crop, use_hybrid,
+    )
+    scores = grid["hybrid" if use_hybrid else "rule"]
+    grid_x, grid_y = np.meshgrid(grid["x_values"], grid["y_values"])
+    heatmap = pd.DataFrame({
+        x_feature: grid_x.ravel().round(2),
+        y_feature: grid_y.ravel().round(2),
+        "suitability": scores.max(axis=0).ravel().round(1),
+        "crop": np.asarray(grid["crops"])[scores.argmax(axis=0)].ravel(),
+    })
+    x_step = float(grid["x_values"][1] - grid["x_values"][0])
+    y_step = float(grid["y_values"][1] - grid["y_values"][0])
+    heatmap["x2"], heatmap["y2"] = heatmap[x_feature] + x_step, heatmap[y_feature] + y_step
+    chart = alt.Chart(heatmap).mark_rect().encode(
+        x=alt.X(f"{x_feature}:Q", title=feature_labels[x_feature]),
+        x2="x2:Q",
+        y=alt.Y(f"{y_feature}:Q", title=feature_labels[y_feature]),
+        y2="y2:Q",
+        color=alt.Color("suitability:Q", scale=alt.Scale(scheme="yellowgreenblue", domain=[0, 100]), title="Suitability %"),
+        tooltip=["crop", x_feature, y_feature, "suitability"],
+    )
+    marker = alt.Chart(pd.DataFrame({x_feature: [user_input[x_feature]], y_feature: [user_input[y_feature]]})).mark_point(
+        color="red", size=120, shape="cross", filled=True
+    ).encode(x=f"{x_feature}:Q", y=f"{y_feature}:Q")
+    st.altair_chart(chart + marker, use_container_width=True)
+    st.caption("The red cross marks the current sidebar conditions.")
+
+with tabs[6]:
     st.subheader("Model & Dataset Insights")
     metrics = engine.root_payload()
     info = engine.get_model_info()
@@ -191,10 +342,23 @@ with tabs[4]:
     st.write("**Hybrid Crop Engine**")
     st.json(info["kerala_crop_recommender"])
 
-    dataset_preview = load_dataset_preview()
-    if dataset_preview is not None:
+    if DATASET_PATH.exists():
+        signature = file_signature(DATASET_PATH)
         st.write("**Dataset Preview (first 5 rows)**")
-        st.dataframe(dataset_preview, use_container_width=True)
+        st.dataframe(load_dataset_preview(*signature), use_container_width=True)
+
+        stats = load_dataset_statistics(*signature)
+        cols = st.columns(3)
+        cols[0].metric("Dataset Rows", f"{stats['rows']:,}")
+        cols[1].metric("File Size", f"{stats['size_bytes'] / 1e6:.1f} MB")
+        cols[2].metric("Columns", len(stats["numeric"]) + len(stats["categorical"]))
+        st.write("**Numeric Column Statistics**")
+        st.dataframe(numeric_summary_frame(stats).round(3), use_container_width=True)
+
+        class_columns = [name for name in ("crop", "soil_type") if name in stats["categorical"]]
+        chart_cols = st.columns(max(len(class_columns), 1))
+        for chart_col, name in zip(chart_cols, class_columns):
+            chart_col.write(f"**{name.replace('_', ' ').title()} Counts**")
+            chart_col.bar_chart(pd.Series(stats["categorical"][name]["counts"], name="rows"))
     else:
-        st.info("Dataset preview unavailable because the CSV is missing from `ml_model/datasets/combined`.") 
-
+        st.info("Dataset preview unavailable because the CSV is missing from `ml_model/datasets/combined`.")